@@ -0,0 +1,1212 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the pack/normalize scripts.
+
+Usage:
+    python bench.py adf [--scale 100] [--repeat 5]
+    python bench.py paths [--rows 100000] [--repeat 5]
+    python bench.py startup [--repeat 10]
+    python bench.py daemon [--repeat 20]
+    python bench.py cache [--issues 2000] [--repeat 5]
+    python bench.py normalize [--issues 2000]
+    python bench.py forecast [--repeat 5]
+    python bench.py portfolio [--projects 100] [--jobs 0]
+    python bench.py deps [--issues 100000] [--links 500000]
+    python bench.py html [--items 50000] [--repeat 3]
+    python bench.py json [--issues 2000] [--items 50000] [--repeat 3]
+    python bench.py commits [--commits 50000] [--sample 20]
+    python bench.py scale [--issues 5000] [--projects 50] [--save-baseline | --check [--threshold 0.25]]
+
+Each subcommand times the current implementation (and, where one is kept
+for comparison, the previous one) and prints a small markdown table.
+
+`scale` runs pack_issue, pack_search, normalize_fields, jira_metrics and
+pack_dashboard over seeded synthetic data (jira_synth.py), each in a fresh
+interpreter, and reports issues/s, MB/s, p50/p99 per-item latency and peak
+RSS.
+Baselines are machine-specific, so they live outside the repo
+(~/.cache/jira-pack/scale_baseline.json by default); --check exits 1 when
+a metric is more than --threshold worse than the saved run.
+
+`json` times each installed JSON backend and exits 1 if any of them
+changes a byte of the markdown, JSON or HTML the scripts write.
+"""
+
+import argparse
+import copy
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+EXAMPLE_ISSUE = SCRIPT_DIR.parent / "assets" / "examples" / "example_issue_raw.json"
+EXAMPLE_METRICS = SCRIPT_DIR.parent / "assets" / "examples" / "example_metrics.json"
+
+
+def load_example_issue() -> Dict[str, Any]:
+    """Load the bundled example issue."""
+    with open(EXAMPLE_ISSUE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def best_of(fn: Callable[[], Any], repeat: int) -> float:
+    """Best wall time in seconds over `repeat` runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def print_table(headers: List[str], rows: List[List[Any]]) -> None:
+    """Print rows as a markdown table."""
+    print("| " + " | ".join(headers) + " |")
+    print("|" + "---|" * len(headers))
+    for row in rows:
+        print("| " + " | ".join(str(c) for c in row) + " |")
+
+
+# ---------------------------------------------------------------------------
+# ADF rendering
+# ---------------------------------------------------------------------------
+
+
+def legacy_extract_adf_text(adf: Dict[str, Any], depth: int = 0) -> str:
+    """Previous recursive ADF extractor, kept as the benchmark baseline."""
+    if depth > 10:
+        return ""
+
+    result = []
+
+    if adf.get("type") == "text":
+        return adf.get("text", "")
+
+    content = adf.get("content", [])
+    for node in content:
+        if isinstance(node, dict):
+            node_type = node.get("type", "")
+
+            if node_type == "text":
+                result.append(node.get("text", ""))
+            elif node_type == "paragraph":
+                result.append(legacy_extract_adf_text(node, depth + 1))
+                result.append("\n")
+            elif node_type == "bulletList":
+                for item in node.get("content", []):
+                    result.append("• " + legacy_extract_adf_text(item, depth + 1).strip())
+                    result.append("\n")
+            elif node_type == "orderedList":
+                for i, item in enumerate(node.get("content", []), 1):
+                    result.append(f"{i}. " + legacy_extract_adf_text(item, depth + 1).strip())
+                    result.append("\n")
+            elif node_type == "heading":
+                level = node.get("attrs", {}).get("level", 1)
+                result.append("#" * level + " " + legacy_extract_adf_text(node, depth + 1).strip())
+                result.append("\n")
+            elif node_type == "codeBlock":
+                result.append("```\n")
+                result.append(legacy_extract_adf_text(node, depth + 1))
+                result.append("\n```\n")
+            else:
+                result.append(legacy_extract_adf_text(node, depth + 1))
+
+    return "".join(result)
+
+
+def scaled_adf(scale: int) -> Dict[str, Any]:
+    """The example description repeated `scale` times as one document."""
+    desc = load_example_issue()["fields"]["description"]
+    content = []
+    for _ in range(scale):
+        content.extend(copy.deepcopy(desc.get("content", [])))
+    return {"type": "doc", "version": 1, "content": content}
+
+
+def nested_adf(depth: int, copies: int = 1) -> Dict[str, Any]:
+    """`copies` bullet lists, each nested `depth` levels deep with text at every level."""
+    content = []
+    for _ in range(copies):
+        node: Dict[str, Any] = {"type": "paragraph", "content": [{"type": "text", "text": "leaf"}]}
+        for level in range(depth):
+            para = {"type": "paragraph", "content": [{"type": "text", "text": f"level {level} " * 8}]}
+            node = {"type": "bulletList", "content": [{"type": "listItem", "content": [para, node]}]}
+        content.append(node)
+    return {"type": "doc", "version": 1, "content": content}
+
+
+def bench_adf(args) -> int:
+    from pack_issue import render_adf
+
+    rows = []
+    for label, doc in [
+        (f"example x{args.scale}", scaled_adf(args.scale)),
+        (f"example x{args.scale * 10}", scaled_adf(args.scale * 10)),
+        (f"nested lists x{args.scale * 10} (depth 8)", nested_adf(8, args.scale * 10)),
+    ]:
+        size_kb = len(json.dumps(doc)) / 1024
+        t_old = best_of(lambda: legacy_extract_adf_text(doc), args.repeat)
+        t_new = best_of(lambda: render_adf(doc), args.repeat)
+        rows.append([label, f"{size_kb:.0f}", f"{t_old * 1000:.2f}", f"{t_new * 1000:.2f}",
+                     f"{t_old / t_new:.2f}x"])
+
+    print_table(["Input", "ADF KB", "legacy ms", "render_adf ms", "speedup"], rows)
+
+    deep = nested_adf(50)
+    print()
+    print(f"Depth 50: legacy keeps leaf = {'leaf' in legacy_extract_adf_text(deep)}, "
+          f"render_adf keeps leaf = {'leaf' in render_adf(deep)}")
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Field paths
+# ---------------------------------------------------------------------------
+
+# The lookups pack_search does for every table row
+SEARCH_ROW_PATHS = [
+    "key",
+    "fields.issuetype.name",
+    "fields.status.name",
+    "fields.priority.name",
+    "fields.assignee.displayName",
+    "fields.summary",
+]
+
+
+def legacy_get(d: Dict[str, Any], path: str, default: Any = "") -> Any:
+    """Previous split-per-call accessor, kept as the benchmark baseline."""
+    cur: Any = d
+    for p in path.split("."):
+        if isinstance(cur, dict) and p in cur:
+            cur = cur[p]
+        else:
+            return default
+    return cur
+
+
+def search_rows(count: int) -> List[Dict[str, Any]]:
+    """`count` issue rows; every fourth one is unassigned (a lookup miss)."""
+    issue = load_example_issue()
+    unassigned = copy.deepcopy(issue)
+    unassigned["fields"]["assignee"] = None
+    return [unassigned if i % 4 == 3 else issue for i in range(count)]
+
+
+def bench_paths(args) -> int:
+    from jira_fields import compile_path
+    import pack_search
+
+    rows = search_rows(args.rows)
+    getters = [compile_path(p) for p in SEARCH_ROW_PATHS]
+
+    def run_legacy():
+        for issue in rows:
+            for path in SEARCH_ROW_PATHS:
+                legacy_get(issue, path)
+
+    def run_compiled():
+        for issue in rows:
+            for getter in getters:
+                getter(issue, "")
+
+    def run_rows():
+        for issue in rows:
+            pack_search.format_table_row(issue)
+
+    results = []
+    for label, fn in [("legacy split get", run_legacy), ("compiled getters", run_compiled),
+                      ("format_table_row (full row)", run_rows)]:
+        t = best_of(fn, args.repeat)
+        results.append([label, f"{t * 1000:.1f}", f"{t / args.rows * 1e9:.0f}"])
+
+    print(f"{args.rows} rows x {len(SEARCH_ROW_PATHS)} lookups")
+    print()
+    print_table(["Variant", "total ms", "ns/row"], results)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Startup
+# ---------------------------------------------------------------------------
+
+# The script passed to python is always compiled from source, while modules
+# it imports load from __pycache__; jira_pack.py keeps the former tiny.
+STARTUP_CASES = [
+    ["jira_pack.py", "--help"],
+    ["jira_pack.py", "issue", "--help"],
+    ["jira_pack.py", "search", "--help"],
+    ["jira_pack.py", "dashboard", "--help"],
+    ["jira_pack.py", "normalize", "--help"],
+    ["jira_pack.py", "git", "--help"],
+    ["jira_pack.py", "issue", "../assets/examples/example_issue_raw.json"],
+    ["pack_issue.py", "../assets/examples/example_issue_raw.json"],
+    ["pack_dashboard.py", "--help"],
+]
+
+
+def startup_env() -> Dict[str, str]:
+    """Environment with bytecode caching on, as in a normal install, and no daemon forwarding."""
+    import os
+
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["JIRA_PACK_DAEMON"] = "0"
+    return env
+
+
+def import_profile(argv: List[str]) -> tuple:
+    """Run a script under `python -X importtime`; returns (modules, cumulative import us)."""
+    import subprocess
+
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + argv, cwd=SCRIPT_DIR,
+                          capture_output=True, text=True, env=startup_env())
+    modules = 0
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us = line.split(":", 1)[1].split("|")[0]
+        modules += 1
+        total_us += int(self_us)
+    return modules, total_us
+
+
+def bench_startup(args) -> int:
+    import subprocess
+
+    env = startup_env()
+    rows = []
+    for argv in STARTUP_CASES:
+        # First run populates __pycache__ for imported modules
+        subprocess.run([sys.executable] + argv, cwd=SCRIPT_DIR, capture_output=True, env=env)
+        modules, import_us = import_profile(argv)
+        wall = best_of(lambda: subprocess.run([sys.executable] + argv, cwd=SCRIPT_DIR,
+                                              capture_output=True, env=env), args.repeat)
+        rows.append([" ".join(argv), modules, f"{import_us / 1000:.1f}", f"{wall * 1000:.1f}"])
+
+    print_table(["Command", "modules imported", "import ms (-X importtime)", "wall ms"], rows)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Daemon
+# ---------------------------------------------------------------------------
+
+
+def bench_daemon(args) -> int:
+    import os
+    import subprocess
+    import tempfile
+
+    import jira_daemon
+
+    issue_path = str(EXAMPLE_ISSUE)
+    issue = load_example_issue()
+    with tempfile.TemporaryDirectory() as tmp:
+        sock = os.path.join(tmp, "bench.sock")
+        local_env = startup_env()
+        local_env["JIRA_PACK_SOCKET"] = sock
+        env = dict(local_env, JIRA_PACK_DAEMON="1")
+        cli = [sys.executable, "jira_pack.py", "issue", issue_path]
+        script = [sys.executable, "pack_issue.py", issue_path]
+
+        def run_cli(run_env, argv=cli):
+            subprocess.run(argv, cwd=SCRIPT_DIR, capture_output=True, env=run_env,
+                           stdin=subprocess.DEVNULL)
+
+        run_cli(local_env)  # populate __pycache__
+        t_local = best_of(lambda: run_cli(local_env), args.repeat)
+
+        subprocess.run([sys.executable, "jira_daemon.py", "start", "--socket", sock],
+                       cwd=SCRIPT_DIR, capture_output=True, env=env, check=True)
+        try:
+            run_cli(env)
+            t_forward = best_of(lambda: run_cli(env), args.repeat)
+            t_script = best_of(lambda: run_cli(env, script), args.repeat)
+            t_request = best_of(lambda: jira_daemon.request({"op": "pack_issue", "issue": issue}, sock),
+                                args.repeat)
+        finally:
+            jira_daemon.request({"op": "shutdown"}, sock)
+
+    print_table(["Variant", "ms per call"], [
+        ["jira_pack.py issue, fresh interpreter (JIRA_PACK_DAEMON=0)", f"{t_local * 1000:.1f}"],
+        ["jira_pack.py issue, forwarded to daemon", f"{t_forward * 1000:.1f}"],
+        ["pack_issue.py, forwarded to daemon", f"{t_script * 1000:.1f}"],
+        ["jira_daemon.request (in-process client)", f"{t_request * 1000:.2f}"],
+    ])
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Pack cache
+# ---------------------------------------------------------------------------
+
+
+def large_issue(copies: int = 50, comments: int = 200) -> Dict[str, Any]:
+    """The example issue with its description repeated and a long comment thread."""
+    issue = load_example_issue()
+    fields = issue["fields"]
+    fields["description"] = scaled_adf(copies)
+    thread = fields["comment"]["comments"]
+    fields["comment"]["comments"] = [copy.deepcopy(thread[i % len(thread)]) for i in range(comments)]
+    return issue
+
+
+def bench_cache(args) -> int:
+    import tempfile
+
+    import pack_issue
+    from pack_cache import PackCache, peek_identity
+
+    issue = load_example_issue()
+    issues = []
+    for i in range(args.issues):
+        issue["key"] = f"PROJ-{i}"
+        issue["fields"]["updated"] = f"2024-01-18T16:45:{i % 60:02d}.000+0000"
+        issues.append(json.loads(json.dumps(issue)))
+
+    single_rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = PackCache(tmp, pack_issue.PACK_VERSION)
+        for label, text in [("example", EXAMPLE_ISSUE.read_text(encoding="utf-8")),
+                            ("large (50x description, 200 comments)", json.dumps(large_issue()))]:
+            cache.put(*peek_identity(text), {}, pack_issue.pack_issue(json.loads(text)))
+            t_parse = best_of(lambda: pack_issue.pack_issue(json.loads(text)), args.repeat * 20)
+            t_peek = best_of(lambda: peek_identity(text), args.repeat * 20)
+            t_hit = best_of(lambda: cache.get(*peek_identity(text), {}), args.repeat * 20)
+            single_rows.append([label, f"{len(text) / 1024:.0f}", f"{t_parse * 1000:.3f}",
+                                f"{t_peek * 1000:.3f}", f"{t_hit * 1000:.3f}", f"{t_parse / t_hit:.1f}x"])
+
+        def run_batch():
+            for _ in pack_issue.pack_many(issues, cache=cache):
+                pass
+
+        t_cold = best_of(lambda: list(pack_issue.pack_many(issues)), args.repeat)
+        run_batch()
+        t_warm = best_of(run_batch, args.repeat)
+        cache.close()
+
+    print("Single issue from raw text:")
+    print()
+    print_table(["Issue", "KB", "json.loads + pack_issue ms", "peek_identity ms",
+                 "peek + cache hit ms", "speedup"], single_rows)
+    print()
+    print(f"Batch of {args.issues} already-parsed example issues (pack_many, 1 job):")
+    print()
+    print_table(["Variant", "total ms", "ms/issue"], [
+        ["no cache", f"{t_cold * 1000:.1f}", f"{t_cold / args.issues * 1000:.3f}"],
+        ["all hits", f"{t_warm * 1000:.1f}", f"{t_warm / args.issues * 1000:.3f}"],
+    ])
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Normalize
+# ---------------------------------------------------------------------------
+
+
+def write_search_export(path: str, count: int) -> None:
+    """Write a search envelope of `count` copies of the example issue."""
+    issue = load_example_issue()
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'{{"startAt": 0, "maxResults": {count}, "total": {count}, "issues": [')
+        for i in range(count):
+            issue["key"] = f"PROJ-{i}"
+            f.write(("," if i else "") + json.dumps(issue))
+        f.write("]}")
+
+
+def peak_mb(fn: Callable[[], Any]) -> float:
+    """Peak traced allocation in MB during one call."""
+    import tracemalloc
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def bench_normalize(args) -> int:
+    import os
+    import tempfile
+
+    from normalize_fields import DEFAULT_FIELD_MAP, normalize_issue, normalize_stream
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search.json")
+        write_search_export(path, args.issues)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        def run_legacy():
+            # Previous main(): load everything, normalize, dump with indent=2
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            data["issues"] = [normalize_issue(i, DEFAULT_FIELD_MAP) for i in data["issues"]]
+            out = json.dumps(data, indent=2, ensure_ascii=False)
+            return len(out) + 1
+
+        def run_stream(**kwargs):
+            # Count what would be written instead of keeping it
+            written = [0]
+
+            def write(text):
+                written[0] += len(text)
+
+            with open(path, "r", encoding="utf-8") as f:
+                normalize_stream(f, write, DEFAULT_FIELD_MAP, **kwargs)
+            return written[0]
+
+        rows = []
+        for label, fn in [("load + normalize + dumps(indent=2)", run_legacy),
+                          ("normalize_stream --pretty", lambda: run_stream(indent=2)),
+                          ("normalize_stream (compact)", run_stream),
+                          ("normalize_stream --drop-unmapped", lambda: run_stream(drop_unmapped=True))]:
+            out_mb = fn() / 1024 / 1024
+            seconds = best_of(fn, 1)
+            rows.append([label, f"{seconds * 1000:.0f}", f"{peak_mb(fn):.1f}", f"{out_mb:.1f}"])
+
+    print(f"{args.issues} issues, {size_mb:.1f} MB input")
+    print()
+    print_table(["Variant", "ms", "peak MB (tracemalloc)", "output MB"], rows)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Delivery forecast
+# ---------------------------------------------------------------------------
+
+# (label, remaining items, days left) with the velocity history from the
+# dashboard builder guide
+FORECAST_CASES = [
+    ("mid-sprint: 13 left, 6 days", 13, 6),
+    ("sprint start: 25 left, 10 days", 25, 10),
+    ("overrun: 40 left, 10 days", 40, 10),
+    ("far behind: 200 left, 5 days", 200, 5),
+]
+FORECAST_VELOCITY = [28, 25, 30, 22, 27, 12]
+
+
+def bench_forecast(args) -> int:
+    from pack_dashboard import simulate_delivery
+
+    engines = [("python", 5_000)]
+    try:
+        import numpy  # noqa: F401
+        engines = [("numpy", 10_000), ("numpy", 100_000)] + engines
+    except ImportError:
+        print("NumPy not installed; timing the pure-Python engine only")
+        print()
+
+    rows = []
+    for label, remaining, days_left in FORECAST_CASES:
+        for method in ("bootstrap", "normal"):
+            for engine, trials in engines:
+                def run():
+                    return simulate_delivery(FORECAST_VELOCITY, 10, remaining, days_left,
+                                             trials=trials, method=method, engine=engine)
+                result = run()
+                t = best_of(run, args.repeat)
+                days = result["completion_days"]
+                rows.append([label, method, engine, trials, f"{t * 1000:.1f}",
+                             f"{result['pessimistic']}/{result['expected']}/{result['optimistic']}",
+                             f"{days['p50']}/{days['p85']}/{days['p95']}"])
+
+    print_table(["Case", "method", "engine", "trials", "ms", "P on time % (-1σ/exp/+1σ)",
+                 "done by day p50/p85/p95"], rows)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Portfolio dashboards
+# ---------------------------------------------------------------------------
+
+
+def write_portfolio(directory: str, count: int) -> List[str]:
+    """`count` metrics files varied from the bundled example; returns their paths."""
+    import os
+    import random
+
+    with open(EXAMPLE_METRICS, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    rng = random.Random(0)
+    paths = []
+    for i in range(count):
+        data = copy.deepcopy(base)
+        data["project"] = {"key": f"P{i:04d}", "name": f"Project {i}"}
+        velocity = data["velocity"]
+        velocity["completed"] = [max(0, v + rng.randint(-8, 8)) for v in velocity["completed"]]
+        sprint_issues = data["sprint"]["issues"]
+        sprint_issues["done"] = rng.randint(0, sprint_issues["total"])
+        data["bug_trend"]["weekly_counts"] = [rng.randint(0, 12) for _ in range(6)]
+        path = os.path.join(directory, f"p{i:04d}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        paths.append(path)
+    return paths
+
+
+def bench_portfolio(args) -> int:
+    import os
+    import subprocess
+    import tempfile
+
+    import pack_dashboard
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_portfolio(tmp, args.projects)
+        out = os.path.join(tmp, "out")
+        os.makedirs(out)
+        env = startup_env()
+
+        def subprocess_loop():
+            for path in paths:
+                subprocess.run([sys.executable, "pack_dashboard.py", "--data", path,
+                                "--output", os.path.join(out, os.path.basename(path) + ".html")],
+                               cwd=SCRIPT_DIR, capture_output=True, env=env, check=True)
+
+        def in_process_loop():
+            for path in paths:
+                with open(path, "r", encoding="utf-8") as f:
+                    dashboard = pack_dashboard.build_dashboard(json.load(f))
+                html = pack_dashboard.generate_html(dashboard)
+                with open(os.path.join(out, os.path.basename(path) + ".html"), "w", encoding="utf-8") as f:
+                    f.write(html)
+
+        def portfolio(n):
+            return lambda: pack_dashboard.run_portfolio(tmp, out, jobs=n)
+
+        cases = [
+            ("per-project loop, fresh interpreter each (current workflow)", subprocess_loop),
+            ("per-project loop, one interpreter", in_process_loop),
+            ("--portfolio --jobs 1", portfolio(1)),
+        ]
+        if jobs > 1:
+            cases.append((f"--portfolio --jobs {jobs}", portfolio(jobs)))
+        rows = []
+        devnull = open(os.devnull, "w")
+        saved = sys.stdout
+        for label, fn in cases:
+            sys.stdout = devnull  # run_portfolio prints a summary
+            try:
+                t = best_of(fn, 1)
+            finally:
+                sys.stdout = saved
+            rows.append([label, f"{t:.2f}", f"{t * 1000 / len(paths):.1f}"])
+        devnull.close()
+
+    print(f"{args.projects} projects, {os.cpu_count()} CPUs")
+    print()
+    print_table(["Variant", "wall s", "ms per project"], rows)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Dependency graph
+# ---------------------------------------------------------------------------
+
+
+def link_issues(count: int, links: int, group: int = 50, seed: int = 0) -> List[Dict[str, Any]]:
+    """Issues with `links` Blocks links, recorded on both ends as Jira does.
+
+    Links mostly run forward within groups of `group` issues (epics) and 1%
+    cross groups; 1 in 2000 is left in random order, which closes cycles.
+    """
+    import random
+
+    rng = random.Random(seed)
+    link_type = {"name": "Blocks", "inward": "is blocked by", "outward": "blocks"}
+    open_status = {"name": "In Progress", "statusCategory": {"key": "indeterminate"}}
+    issues = [{"key": f"PROJ-{i}", "fields": {"status": open_status, "issuelinks": []}} for i in range(count)]
+    for _ in range(links):
+        a = rng.randrange(count)
+        r = rng.random()
+        if 0.0005 <= r < 0.01:
+            b = rng.randrange(count)
+        else:
+            base = a - a % group
+            b = base + rng.randrange(min(group, count - base))
+        if r >= 0.0005 and b < a:
+            a, b = b, a
+        issues[a]["fields"]["issuelinks"].append(
+            {"type": link_type, "outwardIssue": {"key": f"PROJ-{b}", "fields": {"status": open_status}}})
+        issues[b]["fields"]["issuelinks"].append(
+            {"type": link_type, "inwardIssue": {"key": f"PROJ-{a}", "fields": {"status": open_status}}})
+    return issues
+
+
+def bench_deps(args) -> int:
+    import os
+    import tempfile
+
+    from jira_deps import DependencyGraph, analyze, analyze_export
+
+    issues = link_issues(args.issues, args.links)
+    t0 = time.perf_counter()
+    graph = DependencyGraph.from_issues(issues)
+    t_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    result = analyze(graph)["dependency_graph"]
+    t_analyze = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export.ndjson")
+        with open(path, "w", encoding="utf-8") as f:
+            for issue in issues:
+                f.write(json.dumps(issue) + "\n")
+        size_mb = os.path.getsize(path) / 1e6
+        del issues
+        t0 = time.perf_counter()
+        with open(path, "r", encoding="utf-8") as f:
+            analyze_export(f, ndjson=True)
+        t_export = time.perf_counter() - t0
+
+    print(f"{len(graph)} issues, {graph.edge_count} distinct blocking links; "
+          f"longest chain {result['max_chain_length']}, {result['cycle_count']} cycles, "
+          f"{result['total_affected']} blocked")
+    print()
+    print_table(["Step", "s"], [
+        ["build CSR graph from parsed issues", f"{t_build:.2f}"],
+        ["analyze (SCC, chains, downstream counts, SPOF)", f"{t_analyze:.2f}"],
+        [f"end to end from a {size_mb:.0f} MB NDJSON export", f"{t_export:.2f}"],
+    ])
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Dashboard HTML
+# ---------------------------------------------------------------------------
+
+
+def large_dashboard_metrics(items: int) -> Dict[str, Any]:
+    """The example metrics as a portfolio-level dashboard: one epic per 10 issues, every open issue listed."""
+    from jira_synth import ProjectPlan, STATUSES
+
+    with open(EXAMPLE_METRICS, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    plan = ProjectPlan(items)
+    data["epics"] = [{"name": plan.summaries[i], "key": plan.key(i), "total": 10, "done": i % 11}
+                     for i in range(0, items, 10)]
+    data["attention_items"] = [{"key": plan.key(i), "summary": plan.summaries[i], "reason": "Blocked 3 天",
+                                "impact": "high", "action": "排除阻塞或升級處理"}
+                               for i in range(items) if STATUSES[plan.statuses[i]][2] != "done"]
+    return data
+
+
+def bench_html(args) -> int:
+    import os
+    import tempfile
+
+    import pack_dashboard
+
+    data = large_dashboard_metrics(args.items)
+    dashboard = pack_dashboard.build_dashboard(data)
+    template = pack_dashboard.get_template_path()
+    parts = pack_dashboard.load_template_parts(template)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "dashboard.html")
+
+        def legacy():
+            # Previous generate_html: indent=2 JSON joined into one string, then written
+            html = json.dumps(dashboard, ensure_ascii=False, indent=2).join(parts)
+            with open(out, "w", encoding="utf-8") as f:
+                f.write(html)
+
+        def write(compress):
+            def run():
+                with open(out, "w", encoding="utf-8") as f:
+                    pack_dashboard.write_html(dashboard, f, template, compress=compress)
+            return run
+
+        rows = []
+        for label, fn in [("indent=2 JSON, joined then written (previous)", legacy),
+                          ("compact JSON, written in parts", write(False)),
+                          ("--compress-data (gzip + base64)", write(True))]:
+            t = best_of(fn, args.repeat)
+            rows.append([label, f"{t * 1000:.1f}", f"{os.path.getsize(out) / 1024:.0f}",
+                         f"{peak_mb(fn):.1f}"])
+
+    print(f"{len(data['epics'])} epics, {len(data['attention_items'])} attention items")
+    print()
+    print_table(["Variant", "ms", "HTML KB", "peak MB (tracemalloc)"], rows)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# JSON codec backends
+# ---------------------------------------------------------------------------
+
+
+def bench_json(args) -> int:
+    import hashlib
+    import io
+    import os
+    import tempfile
+
+    import jira_json
+    import pack_dashboard
+    from jira_stream import iter_ndjson
+    from jira_synth import iter_issues, write_envelope, write_ndjson
+    from normalize_fields import DEFAULT_FIELD_MAP, normalize_stream
+    from pack_issue import pack_issue
+    from pack_search import pack_search_detailed, pack_search_results
+
+    metrics = large_dashboard_metrics(args.items)
+    template = pack_dashboard.get_template_path()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        envelope = os.path.join(tmp, "search.json")
+        ndjson = os.path.join(tmp, "search.ndjson")
+        with open(envelope, "w", encoding="utf-8") as f:
+            write_envelope(f, iter_issues(args.issues), args.issues)
+        with open(ndjson, "w", encoding="utf-8") as f:
+            write_ndjson(f, iter_issues(args.issues))
+        size_mb = os.path.getsize(envelope) / 1024 / 1024
+
+        def load_envelope():
+            return jira_json.load_path(envelope)
+
+        def load_gc_on():
+            pause = jira_json.GC_PAUSE_MIN
+            jira_json.GC_PAUSE_MIN = float("inf")
+            try:
+                return jira_json.load_path(envelope)
+            finally:
+                jira_json.GC_PAUSE_MIN = pause
+
+        def read_ndjson():
+            with open(ndjson, "r", encoding="utf-8") as f:
+                for _ in iter_ndjson(f):
+                    pass
+
+        def normalize(indent=None):
+            out = io.StringIO()
+            with open(envelope, "r", encoding="utf-8") as f:
+                normalize_stream(f, out.write, DEFAULT_FIELD_MAP, indent=indent)
+            return out.getvalue()
+
+        def html():
+            out = io.StringIO()
+            pack_dashboard.write_html(pack_dashboard.build_dashboard(metrics), out, template)
+            return out.getvalue()
+
+        def outputs() -> str:
+            """Digest of everything the scripts write from these inputs."""
+            data = load_envelope()
+            digest = hashlib.sha256()
+            for text in [pack_search_results(data, 0), pack_search_detailed(data, 200), normalize(), normalize(2),
+                         html()] + [pack_issue(issue) for issue in data["issues"][:200]]:
+                digest.update(text.encode("utf-8"))
+            return digest.hexdigest()
+
+        rows = []
+        reference = None
+        mismatched = False
+        for name in reversed(jira_json.available_backends()):
+            jira_json.set_backend(name)
+            digest = outputs()
+            reference = reference or digest
+            mismatched |= digest != reference
+            rows.append([name] + [f"{best_of(fn, args.repeat) * 1000:.0f}"
+                                  for fn in (load_envelope, load_gc_on, read_ndjson, normalize, html)]
+                        + ["yes" if digest == reference else "**NO**"])
+        jira_json.set_backend()
+
+    print(f"{args.issues} issues, {size_mb:.1f} MB envelope; dashboard with {len(metrics['epics'])} epics")
+    print()
+    print_table(["Backend", "load_path ms", "load_path, GC not paused ms", "NDJSON lines ms",
+                 "normalize_stream ms", "dashboard HTML ms", "output identical to json"], rows)
+    return 1 if mismatched else 0
+
+
+# ---------------------------------------------------------------------------
+# Commit range validation
+# ---------------------------------------------------------------------------
+
+
+def write_git_history(repo: str, commits: int, invalid: float = 0.03, seed: int = 0) -> None:
+    """Create a one-branch repo of `commits` commits via git fast-import.
+
+    About `invalid` of the messages break the PROJ-123 type: description
+    format (no key or no type); one in ten has a body.
+    """
+    import random
+    import subprocess
+
+    rng = random.Random(seed)
+    types = ["feat", "fix", "chore", "docs", "refactor", "test", "perf"]
+    subprocess.run(["git", "init", "-q", "-b", "main", repo], check=True)
+    proc = subprocess.Popen(["git", "-C", repo, "fast-import", "--quiet"], stdin=subprocess.PIPE)
+    for i in range(1, commits + 1):
+        key = f"PROJ-{rng.randint(1, 5000)}"
+        roll = rng.random()
+        if roll < invalid / 2:
+            message = f"wip {i}"
+        elif roll < invalid:
+            message = f"{key} update module {i}"
+        else:
+            message = f"{key} {rng.choice(types)}: change {i}"
+        if i % 10 == 0:
+            message += f"\n\nDetails for change {i}.\nRefs {key}"
+        data = (message + "\n").encode("utf-8")
+        proc.stdin.write(f"commit refs/heads/main\ncommitter Dev{i % 23} <dev{i % 23}@example.com> "
+                         f"{1700000000 + i * 60} +0000\ndata {len(data)}\n".encode("utf-8") + data
+                         + f"M 644 inline f{i % 100}.txt\ndata 8\n{i:07d}\n\n".encode("utf-8"))
+    proc.stdin.close()
+    if proc.wait() != 0:
+        raise RuntimeError("git fast-import failed")
+
+
+def bench_commits(args) -> int:
+    import os
+    import shutil
+    import subprocess
+    import tempfile
+
+    import git_helpers
+
+    if shutil.which("git") is None:
+        sys.stderr.write("Error: git not found\n")
+        return 1
+
+    def legacy_validate(message):
+        # Previous validate_commit: key pattern, then the full pattern
+        message = message.strip()
+        if not git_helpers.JIRA_KEY_PATTERN.match(message):
+            return False
+        return bool(git_helpers.COMMIT_PATTERN.match(message))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = os.path.join(tmp, "repo")
+        t0 = time.perf_counter()
+        write_git_history(repo, args.commits)
+        t_build = time.perf_counter() - t0
+        messages = [m for *_, m in git_helpers.iter_log(["main"], repo)]
+        env = startup_env()
+
+        # One interpreter per commit, as a hook calling `validate` does; sampled and extrapolated
+        sample = messages[:args.sample]
+        t0 = time.perf_counter()
+        for message in sample:
+            subprocess.run([sys.executable, "git_helpers.py", "validate", message],
+                           cwd=SCRIPT_DIR, capture_output=True, env=env)
+        t_spawn = (time.perf_counter() - t0) / len(sample) * len(messages)
+
+        t_legacy = best_of(lambda: [legacy_validate(m) for m in messages], args.repeat)
+        check = git_helpers.COMMIT_CHECK.match
+        t_combined = best_of(lambda: [check(m.strip()).group("format") for m in messages], args.repeat)
+        t_stream = best_of(lambda: git_helpers.validate_range(["main"], repo), args.repeat)
+        cli = [sys.executable, "git_helpers.py", "validate-range", "-C", repo, "main", "--format", "json"]
+        t_cli = best_of(lambda: subprocess.run(cli, cwd=SCRIPT_DIR, capture_output=True, env=env), args.repeat)
+        failures = len(git_helpers.validate_range(["main"], repo)[1])
+
+    print(f"{len(messages)} commits ({failures} invalid); repo built in {t_build:.1f}s")
+    print()
+    print_table(["Variant", "s", "commits/s"], [
+        [f"`validate` per commit, fresh interpreter (extrapolated from {len(sample)})",
+         f"{t_spawn:.1f}", f"{len(messages) / t_spawn:,.0f}"],
+        ["in-process: key pattern then full pattern (previous)", f"{t_legacy:.3f}",
+         f"{len(messages) / t_legacy:,.0f}"],
+        ["in-process: one combined pattern", f"{t_combined:.3f}", f"{len(messages) / t_combined:,.0f}"],
+        ["validate_range: git log stream + check", f"{t_stream:.3f}", f"{len(messages) / t_stream:,.0f}"],
+        ["`validate-range` CLI end to end (--format json)", f"{t_cli:.3f}", f"{len(messages) / t_cli:,.0f}"],
+    ])
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Scale suite
+# ---------------------------------------------------------------------------
+
+SCALE_CASES = ["pack_issue", "pack_search", "normalize_fields", "jira_metrics", "pack_dashboard"]
+SCALE_BASELINE = Path("~/.cache/jira-pack/scale_baseline.json").expanduser()
+
+
+def _timed_items(items: Any, work: Callable[[Any], Any]) -> List[float]:
+    """Seconds per item, counting the read/parse of each item as well as `work`."""
+    latencies = []
+    t = time.perf_counter()
+    for item in items:
+        work(item)
+        now = time.perf_counter()
+        latencies.append(now - t)
+        t = now
+    return latencies
+
+
+def run_scale_case(name: str, path: str) -> Dict[str, Any]:
+    """Run one scale case over `path` in this process; called in a fresh child."""
+    import os
+    import resource
+
+    from jira_stream import iter_envelope, iter_ndjson
+
+    sink = []  # outputs are sized, then dropped
+
+    if name == "pack_issue":
+        from pack_issue import pack_issue
+
+        def run():
+            with open(path, "r", encoding="utf-8") as f:
+                return _timed_items(iter_ndjson(f), lambda raw: sink.append(len(pack_issue(raw))))
+    elif name == "pack_search":
+        from pack_search import format_detailed_entry, format_table_row
+
+        def run():
+            with open(path, "r", encoding="utf-8") as f:
+                return _timed_items(iter_envelope(f), lambda issue: sink.append(
+                    len(format_table_row(issue)) + len("\n".join(format_detailed_entry(issue)))))
+    elif name == "normalize_fields":
+        from normalize_fields import DEFAULT_FIELD_MAP, _dumps, normalize_issue
+
+        def run():
+            with open(path, "r", encoding="utf-8") as f:
+                return _timed_items(iter_ndjson(f), lambda issue: sink.append(
+                    len(_dumps(normalize_issue(issue, DEFAULT_FIELD_MAP), None, 0))))
+    elif name == "jira_metrics":
+        from jira_metrics import MetricsAggregator
+
+        def run():
+            aggregator = MetricsAggregator()
+            with open(path, "r", encoding="utf-8") as f:
+                latencies = _timed_items(iter_ndjson(f), aggregator.add)
+            sink.append(len(json.dumps(aggregator.result())))
+            return latencies
+    elif name == "pack_dashboard":
+        from pack_dashboard import build_dashboard, generate_html
+
+        def work(metrics_path):
+            with open(metrics_path, "r", encoding="utf-8") as f:
+                sink.append(len(generate_html(build_dashboard(json.load(f)))))
+
+        paths = sorted(os.path.join(path, p) for p in os.listdir(path) if p.endswith(".json"))
+
+        def run():
+            return _timed_items(paths, work)
+    else:
+        raise ValueError(f"Unknown scale case: {name}")
+
+    if os.path.isdir(path):
+        size = sum(os.path.getsize(os.path.join(path, p)) for p in os.listdir(path))
+    else:
+        size = os.path.getsize(path)
+    t0 = time.perf_counter()
+    latencies = run()
+    seconds = time.perf_counter() - t0
+    latencies.sort()
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "items": len(latencies),
+        "seconds": seconds,
+        "items_per_s": len(latencies) / seconds,
+        "mb_per_s": size / 1e6 / seconds,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        # ru_maxrss is KB on Linux, bytes on macOS
+        "peak_rss_mb": rss / (1024 * 1024 if sys.platform == "darwin" else 1024),
+        "output_mb": sum(sink) / 1e6,
+    }
+
+
+def scale_regressions(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+                      threshold: float) -> List[str]:
+    """Metrics more than `threshold` (a fraction) worse than `baseline`."""
+    worse = []
+    for name, result in results.items():
+        base = baseline.get("cases", {}).get(name)
+        if not base:
+            continue
+        for metric, higher_is_better in [("items_per_s", True), ("mb_per_s", True), ("p50_ms", False),
+                                         ("p99_ms", False), ("peak_rss_mb", False)]:
+            old, new = base.get(metric), result[metric]
+            if not old:
+                continue
+            change = (old - new) / old if higher_is_better else (new - old) / old
+            if change > threshold:
+                worse.append(f"{name} {metric}: {old:.2f} -> {new:.2f} ({change:.0%} worse)")
+    return worse
+
+
+def bench_scale(args) -> int:
+    import os
+    import platform
+    import subprocess
+    import tempfile
+
+    import jira_synth
+
+    if args.run_case:
+        json.dump(run_scale_case(args.run_case, args.input), sys.stdout)
+        return 0
+
+    cases = args.cases.split(",") if args.cases else SCALE_CASES
+    unknown = [c for c in cases if c not in SCALE_CASES]
+    if unknown:
+        sys.stderr.write(f"Error: Unknown case(s): {', '.join(unknown)} (choose from {', '.join(SCALE_CASES)})\n")
+        return 1
+
+    params = {"issues": args.issues, "projects": args.projects, "seed": args.seed}
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        ndjson = os.path.join(tmp, "issues.ndjson")
+        envelope = os.path.join(tmp, "search.json")
+        metrics_dir = os.path.join(tmp, "metrics")
+        t0 = time.perf_counter()
+        if {"pack_issue", "normalize_fields", "jira_metrics"} & set(cases):
+            with open(ndjson, "w", encoding="utf-8") as f:
+                jira_synth.write_ndjson(f, jira_synth.iter_issues(args.issues, args.seed))
+        if "pack_search" in cases:
+            with open(envelope, "w", encoding="utf-8") as f:
+                jira_synth.write_envelope(f, jira_synth.iter_issues(args.issues, args.seed), args.issues)
+        if "pack_dashboard" in cases:
+            os.makedirs(metrics_dir)
+            for p in range(args.projects):
+                with open(os.path.join(metrics_dir, f"P{p:04d}.json"), "w", encoding="utf-8") as f:
+                    json.dump(jira_synth.synth_metrics(p, seed=args.seed), f, ensure_ascii=False)
+        print(f"Generated {args.issues} issues / {args.projects} projects (seed {args.seed}) "
+              f"in {time.perf_counter() - t0:.1f}s")
+        print()
+
+        inputs = {"pack_issue": ndjson, "pack_search": envelope, "normalize_fields": ndjson,
+                  "jira_metrics": ndjson, "pack_dashboard": metrics_dir}
+        env = startup_env()
+        for name in cases:
+            # A fresh interpreter per case, so peak RSS belongs to that case alone
+            proc = subprocess.run([sys.executable, str(Path(__file__).resolve()), "scale",
+                                   "--run-case", name, "--input", inputs[name]],
+                                  cwd=SCRIPT_DIR, capture_output=True, text=True, env=env)
+            if proc.returncode != 0:
+                sys.stderr.write(f"Error: {name} failed:\n{proc.stderr}")
+                return 1
+            results[name] = json.loads(proc.stdout)
+
+    print_table(["Script", "items", "items/s", "MB/s", "p50 ms", "p99 ms", "peak RSS MB"], [
+        [name, r["items"], f"{r['items_per_s']:.0f}", f"{r['mb_per_s']:.1f}", f"{r['p50_ms']:.2f}",
+         f"{r['p99_ms']:.2f}", f"{r['peak_rss_mb']:.0f}"] for name, r in results.items()])
+
+    baseline_path = Path(args.baseline) if args.baseline else SCALE_BASELINE
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({"params": params, "python": platform.python_version(), "machine": platform.node(),
+                       "cases": results}, f, indent=2)
+        print(f"\nBaseline saved to {baseline_path}")
+        return 0
+
+    if args.check:
+        try:
+            with open(baseline_path, "r", encoding="utf-8") as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            sys.stderr.write(f"Error: No baseline at {baseline_path}; run with --save-baseline first\n")
+            return 1
+        if baseline.get("params") != params:
+            sys.stderr.write(f"Error: Baseline was recorded with {baseline.get('params')}, not {params}\n")
+            return 1
+        worse = scale_regressions(results, baseline, args.threshold)
+        print()
+        if worse:
+            print(f"Regressions beyond {args.threshold:.0%} of {baseline_path}:")
+            for line in worse:
+                print(f"- {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} of {baseline_path}")
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks for the Jira pack scripts")
+    subparsers = parser.add_subparsers(dest="command", help="Benchmarks")
+
+    adf_parser = subparsers.add_parser("adf", help="ADF rendering: legacy recursive vs render_adf")
+    adf_parser.add_argument("--scale", type=int, default=100, help="Copies of the example description")
+    adf_parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    adf_parser.set_defaults(func=bench_adf)
+
+    paths_parser = subparsers.add_parser("paths", help="Field lookups: split-per-call vs compiled")
+    paths_parser.add_argument("--rows", type=int, default=100000, help="Issues in the synthetic export")
+    paths_parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    paths_parser.set_defaults(func=bench_paths)
+
+    startup_parser = subparsers.add_parser("startup", help="CLI startup: imports and wall time per command")
+    startup_parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement (best is kept)")
+    startup_parser.set_defaults(func=bench_startup)
+
+    daemon_parser = subparsers.add_parser("daemon", help="Per-call latency: fresh interpreter vs daemon")
+    daemon_parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement (best is kept)")
+    daemon_parser.set_defaults(func=bench_daemon)
+
+    cache_parser = subparsers.add_parser("cache", help="Packed-output cache: hit vs parse and pack")
+    cache_parser.add_argument("--issues", type=int, default=2000, help="Issues in the batch measurement")
+    cache_parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    cache_parser.set_defaults(func=bench_cache)
+
+    normalize_parser = subparsers.add_parser("normalize", help="Normalize: whole-document vs streaming")
+    normalize_parser.add_argument("--issues", type=int, default=2000, help="Issues in the search export")
+    normalize_parser.set_defaults(func=bench_normalize)
+
+    forecast_parser = subparsers.add_parser("forecast", help="Monte Carlo delivery forecast per engine")
+    forecast_parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept)")
+    forecast_parser.set_defaults(func=bench_forecast)
+
+    portfolio_parser = subparsers.add_parser("portfolio", help="Many dashboards: per-project loop vs --portfolio")
+    portfolio_parser.add_argument("--projects", type=int, default=100, help="Metrics files to build")
+    portfolio_parser.add_argument("--jobs", type=int, default=0, help="Portfolio workers (0 = all CPUs)")
+    portfolio_parser.set_defaults(func=bench_portfolio)
+
+    deps_parser = subparsers.add_parser("deps", help="Dependency graph from issue links at scale")
+    deps_parser.add_argument("--issues", type=int, default=100000, help="Issues in the synthetic export")
+    deps_parser.add_argument("--links", type=int, default=500000, help="Blocks links between them")
+    deps_parser.set_defaults(func=bench_deps)
+
+    html_parser = subparsers.add_parser("html", help="Dashboard HTML: indented vs compact vs compressed data")
+    html_parser.add_argument("--items", type=int, default=50000, help="Synthetic issues behind the dashboard")
+    html_parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    html_parser.set_defaults(func=bench_html)
+
+    json_parser = subparsers.add_parser("json", help="JSON codec per backend: decode/encode time, identical output")
+    json_parser.add_argument("--issues", type=int, default=2000, help="Issues in the synthetic export")
+    json_parser.add_argument("--items", type=int, default=50000, help="Synthetic issues behind the dashboard")
+    json_parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    json_parser.set_defaults(func=bench_json)
+
+    commits_parser = subparsers.add_parser("commits", help="Commit message validation: per-process vs validate-range")
+    commits_parser.add_argument("--commits", type=int, default=50000, help="Commits in the synthetic repo")
+    commits_parser.add_argument("--sample", type=int, default=20, help="Commits timed with one process each")
+    commits_parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    commits_parser.set_defaults(func=bench_commits)
+
+    scale_parser = subparsers.add_parser("scale", help="Throughput, latency and peak RSS per script "
+                                                       "on synthetic data, against a saved baseline")
+    scale_parser.add_argument("--issues", type=int, default=5000, help="Synthetic issues per input")
+    scale_parser.add_argument("--projects", type=int, default=50, help="Synthetic dashboard metrics files")
+    scale_parser.add_argument("--seed", type=int, default=42, help="Generator seed")
+    scale_parser.add_argument("--cases", help=f"Comma-separated subset of {','.join(SCALE_CASES)}")
+    scale_parser.add_argument("--baseline", help=f"Baseline file (default: {SCALE_BASELINE})")
+    scale_parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    scale_parser.add_argument("--check", action="store_true",
+                              help="Exit 1 if any metric is worse than the baseline by more than --threshold")
+    scale_parser.add_argument("--threshold", type=float, default=0.25,
+                              help="Allowed regression as a fraction (default: 0.25)")
+    scale_parser.add_argument("--run-case", choices=SCALE_CASES, help=argparse.SUPPRESS)
+    scale_parser.add_argument("--input", help=argparse.SUPPRESS)
+    scale_parser.set_defaults(func=bench_scale)
+
+    args = parser.parse_args()
+    if not hasattr(args, "func"):
+        parser.print_help()
+        return 1
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
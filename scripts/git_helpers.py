@@ -7,40 +7,57 @@ Usage:
     python git_helpers.py branch PROJ-123 "add user auth"
     python git_helpers.py mr-desc PROJ-123
     python git_helpers.py create-bug --title "Fix login" --mr-url "..."
+    python git_helpers.py validate-range origin/main..HEAD --format github
+    python git_helpers.py scan-log --all --project PROJ
+    python git_helpers.py key-log PROJ-123
 """
 
 import re
 import sys
 import argparse
-from typing import Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # === Commit Validation ===
 
+COMMIT_TYPES = "feat|fix|chore|docs|refactor|test|style|perf|ci|build|revert"
+
 COMMIT_PATTERN = re.compile(
-    r'^([A-Z]+-\d+)\s+(feat|fix|chore|docs|refactor|test|style|perf|ci|build|revert)(\([^)]+\))?:\s+.+'
+    rf'^([A-Z]+-\d+)\s+({COMMIT_TYPES})(\([^)]+\))?:\s+.+'
 )
 
 JIRA_KEY_PATTERN = re.compile(r'^[A-Z]+-\d+')
+JIRA_KEY_FINDER = re.compile(r'[A-Z]+-\d+')
 
+# 一次 match 同時判斷兩種錯誤：key 群組沒配到 = 缺 key，format 群組沒配到 = 格式錯
+# （結果與先 JIRA_KEY_PATTERN 再 COMMIT_PATTERN 相同）
+COMMIT_CHECK = re.compile(
+    rf'^(?P<key>[A-Z]+-\d+)?(?P<format>\s+(?:{COMMIT_TYPES})(?:\([^)]+\))?:\s+.+)?'
+)
+MISSING_KEY = "Missing Jira key at start (e.g., PROJ-123)"
+INVALID_FORMAT = "Invalid format. Expected: PROJ-123 type: description"
 
-def validate_commit(message: str) -> Tuple[bool, str]:
-    """驗證 commit message 格式"""
-    message = message.strip()
 
-    # 檢查是否有 Jira key
-    if not JIRA_KEY_PATTERN.match(message):
-        return False, "Missing Jira key at start (e.g., PROJ-123)"
+def commit_error(message: str) -> Optional[str]:
+    """commit message 的錯誤說明；格式正確時回傳 None"""
+    m = COMMIT_CHECK.match(message.strip())
+    if m.group("key") is None:
+        return MISSING_KEY
+    if m.group("format") is None:
+        return INVALID_FORMAT
+    return None
 
-    # 檢查完整格式
-    if not COMMIT_PATTERN.match(message):
-        return False, "Invalid format. Expected: PROJ-123 type: description"
 
+def validate_commit(message: str) -> Tuple[bool, str]:
+    """驗證 commit message 格式"""
+    error = commit_error(message)
+    if error:
+        return False, error
     return True, "Valid commit message"
 
 
 def extract_jira_keys(text: str) -> list:
     """從文字中提取所有 Jira keys"""
-    return re.findall(r'[A-Z]+-\d+', text)
+    return JIRA_KEY_FINDER.findall(text)
 
 
 # === Branch Name Generation ===
@@ -105,6 +122,251 @@ def create_bug_stub(title: str, mr_url: str, auto_close: bool = False) -> dict:
     }
 
 
+# === Git Log Index ===
+
+# git log 輸出格式：每筆 commit 以 \x1e 開頭，欄位以 \x1f 分隔
+LOG_FORMAT = "%x1e%H%x1f%an%x1f%ae%x1f%ct%x1f%B"
+LOG_INDEX_NAME = "jira-keys.sqlite"
+LOG_CHUNK = 1 << 16
+LOG_BATCH = 1000
+
+
+def _git(args: List[str], repo: str = ".", stdin: Optional[str] = None) -> str:
+    """執行 git 指令並回傳 stdout（失敗時丟 RuntimeError）"""
+    import subprocess
+
+    proc = subprocess.run(["git", "-C", repo] + args, input=stdin, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or f"git {args[0]} failed")
+    return proc.stdout
+
+
+def default_log_index(repo: str = ".") -> str:
+    """預設索引位置：<git common dir>/jira-keys.sqlite（worktree 共用）"""
+    import os
+
+    common = _git(["rev-parse", "--git-common-dir"], repo).strip()
+    return os.path.join(repo, common, LOG_INDEX_NAME)  # common 可能是相對路徑
+
+
+def iter_log(revs: List[str], repo: str = ".", options: Optional[List[str]] = None,
+             ignore_missing: bool = True) -> Iterator[Tuple[str, str, str, int, str]]:
+    """串流 `git log` 的 (sha, author, email, timestamp, message)，不緩衝整段歷史
+
+    `revs` 以 stdin 傳給 git（--stdin），排除點（^sha）再多也不受命令列長度限制；
+    `ignore_missing` 讓已被 gc 的舊 sha 直接略過（否則不存在的 rev 是錯誤）。
+    `options` 附加在 git log 後（如 --no-merges）。
+    """
+    import subprocess
+
+    options = (["--ignore-missing"] if ignore_missing else []) + (options or [])
+    proc = subprocess.Popen(
+        ["git", "-C", repo, "log", f"--format={LOG_FORMAT}"] + options + ["--stdin"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    proc.stdin.write(("\n".join(revs) + "\n").encode("utf-8"))
+    proc.stdin.close()
+    buffer = b""
+    try:
+        while True:
+            chunk = proc.stdout.read(LOG_CHUNK)
+            if not chunk:
+                break
+            records = (buffer + chunk).split(b"\x1e")
+            buffer = records.pop()
+            for record in records:
+                if record:
+                    yield _parse_log_record(record)
+        if buffer:
+            yield _parse_log_record(buffer)
+    finally:
+        proc.stdout.close()
+        stderr = proc.stderr.read().decode("utf-8", "replace")
+        proc.stderr.close()
+        if proc.wait() != 0 and stderr:
+            raise RuntimeError(stderr.strip())
+
+
+def _parse_log_record(record: bytes) -> Tuple[str, str, str, int, str]:
+    sha, author, email, timestamp, message = record.decode("utf-8", "replace").split("\x1f", 4)
+    return sha, author, email, int(timestamp), message
+
+
+def _key_filter(projects: Optional[List[str]]):
+    """只保留指定專案的 key（如 PROJ），避免 UTF-8、SHA-256 之類的誤判"""
+    if not projects:
+        return JIRA_KEY_FINDER.findall
+    finder = re.compile(r'(?<![A-Z])(?:' + "|".join(re.escape(p) for p in projects) + r')-\d+')
+    return finder.findall
+
+
+class LogIndex:
+    """Jira key → commits / branches / authors 的持久化索引（sqlite）
+
+    scan() 記住這次掃到的 tip；下次只掃 tip 之後的新 commit（以 ^舊tip 排除），
+    在大型 monorepo 上重跑只處理新增的部分。查詢走 key 的索引，毫秒級。
+    """
+
+    def __init__(self, path: str):
+        import sqlite3
+
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS commits ("
+            " sha TEXT PRIMARY KEY, author TEXT, email TEXT, time INTEGER, subject TEXT) WITHOUT ROWID"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS key_commits (key TEXT, sha TEXT, PRIMARY KEY (key, sha)) WITHOUT ROWID"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS key_branches (key TEXT, branch TEXT, sha TEXT,"
+            " PRIMARY KEY (key, branch)) WITHOUT ROWID"
+        )
+        # 每個掃描範圍（revs 的字串）最後掃到的 tip；complete = 範圍沒有排除點，tip 以下全數已索引
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS scanned (spec TEXT, sha TEXT, complete INTEGER, PRIMARY KEY (spec, sha))"
+        )
+
+    def __enter__(self) -> "LogIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def scan(self, revs: List[str], repo: str = ".", projects: Optional[List[str]] = None,
+             rebuild: bool = False) -> Dict[str, int]:
+        """掃描 `revs`（如 ["HEAD"]、["--all"]、["v1.0..main"]）中尚未掃過的 commit
+
+        先把 revs 解析成 sha 再跑 git log，掃描期間新增的 commit 留給下次。
+        改寫過的歷史（rebase、force push）新 commit 照常掃到；不再可達的舊 commit 留在索引，
+        --rebuild 可清掉。
+        回傳 {"commits": 掃描數, "matched": 含 key 的 commit 數, "keys": 新增 key 連結數}。
+        """
+        spec = " ".join(revs)
+        if rebuild:
+            for table in ("commits", "key_commits", "key_branches", "scanned"):
+                self.db.execute(f"DELETE FROM {table}")
+        resolved = _git(["rev-parse"] + revs, repo).split()
+        tips = [r for r in resolved if not r.startswith("^")]
+        complete = len(tips) == len(resolved)
+        # 同範圍上次的 tip，加上任何完整範圍的 tip（例如先掃過 HEAD，再掃 --all 不重掃 HEAD 的歷史）
+        seen = [f"^{sha}" for (sha,) in self.db.execute(
+            "SELECT DISTINCT sha FROM scanned WHERE spec = ? OR complete = 1", (spec,))]
+
+        find_keys = _key_filter(projects)
+        stats = {"commits": 0, "matched": 0, "keys": 0}
+        commits, links = [], []
+
+        def flush():
+            self.db.executemany("INSERT OR IGNORE INTO commits VALUES (?, ?, ?, ?, ?)", commits)
+            before = self.db.total_changes
+            self.db.executemany("INSERT OR IGNORE INTO key_commits VALUES (?, ?)", links)
+            stats["keys"] += self.db.total_changes - before
+            commits.clear()
+            links.clear()
+
+        if tips:
+            for sha, author, email, timestamp, message in iter_log(resolved + seen, repo):
+                stats["commits"] += 1
+                keys = set(find_keys(message))
+                if not keys:
+                    continue
+                stats["matched"] += 1
+                commits.append((sha, author, email, timestamp, message.split("\n", 1)[0]))
+                links.extend((key, sha) for key in keys)
+                if len(commits) >= LOG_BATCH:
+                    flush()
+            flush()
+        self._scan_branches(repo, find_keys)
+        self.db.execute("DELETE FROM scanned WHERE spec = ?", (spec,))
+        self.db.executemany("INSERT OR IGNORE INTO scanned VALUES (?, ?, ?)",
+                            [(spec, sha, int(complete)) for sha in tips])
+        self.db.commit()
+        return stats
+
+    def _scan_branches(self, repo: str, find_keys) -> None:
+        """分支名稱中的 key（每次重建，分支數遠少於 commit 數）"""
+        refs = _git(["for-each-ref", "--format=%(refname:short)%09%(objectname)", "refs/heads", "refs/remotes"], repo)
+        rows = []
+        for line in refs.splitlines():
+            branch, _, sha = line.partition("\t")
+            rows.extend((key, branch, sha) for key in set(find_keys(branch)))
+        self.db.execute("DELETE FROM key_branches")
+        self.db.executemany("INSERT OR IGNORE INTO key_branches VALUES (?, ?, ?)", rows)
+
+    def lookup(self, key: str) -> dict:
+        """單一 key 的 commits（新到舊）、branches、authors"""
+        commits = [
+            {"sha": sha, "author": author, "email": email, "time": time, "subject": subject}
+            for sha, author, email, time, subject in self.db.execute(
+                "SELECT c.sha, c.author, c.email, c.time, c.subject FROM key_commits k"
+                " JOIN commits c ON c.sha = k.sha WHERE k.key = ? ORDER BY c.time DESC",
+                (key,),
+            )
+        ]
+        branches = [b for (b,) in self.db.execute(
+            "SELECT branch FROM key_branches WHERE key = ? ORDER BY branch", (key,))]
+        authors: Dict[str, int] = {}
+        for c in commits:
+            authors[c["author"]] = authors.get(c["author"], 0) + 1
+        return {"key": key, "commits": commits, "branches": branches, "authors": authors}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "keys": self.db.execute("SELECT COUNT(DISTINCT key) FROM key_commits").fetchone()[0],
+            "commits": self.db.execute("SELECT COUNT(*) FROM commits").fetchone()[0],
+        }
+
+    def close(self) -> None:
+        self.db.commit()
+        self.db.close()
+
+
+# === Range Validation ===
+
+ZERO_SHA = "0" * 40
+
+
+def range_revs(spec: str, repo: str = ".") -> List[str]:
+    """把 `base..head` 轉成 git log 的 revs；base 為全 0（pre-receive 的新分支）時改為「head 且不在任何既有 ref」"""
+    base, sep, head = spec.partition("..")
+    if not sep or base.strip("0"):
+        return [spec]
+    refs = _git(["for-each-ref", "--format=%(objectname)"], repo).split()
+    return [head or "HEAD"] + [f"^{sha}" for sha in refs]
+
+
+def validate_range(specs: List[str], repo: str = ".", merges: bool = True) -> Tuple[int, List[dict]]:
+    """一個 git log 串流驗證範圍內所有 commit message
+
+    Returns:
+        (檢查的 commit 數, 失敗清單 [{"sha", "subject", "error"}]，新到舊)
+    """
+    revs = [rev for spec in specs for rev in range_revs(spec, repo)]
+    check = COMMIT_CHECK.match
+    checked = 0
+    failures = []
+    log = iter_log(revs, repo, None if merges else ["--no-merges"], ignore_missing=False)
+    for sha, _author, _email, _time, message in log:
+        checked += 1
+        m = check(message.strip())
+        if m.group("format") is None:
+            failures.append({
+                "sha": sha,
+                "subject": message.split("\n", 1)[0],
+                "error": MISSING_KEY if m.group("key") is None else INVALID_FORMAT,
+            })
+    return checked, failures
+
+
+def _annotation(text: str) -> str:
+    """GitHub Actions workflow command 的跳脫"""
+    return text.replace("%", "%25").replace("\r", "%0D").replace("\n", "%0A")
+
+
 # === CLI ===
 
 def main():
@@ -138,6 +400,31 @@ def main():
     extract_parser = subparsers.add_parser("extract-keys", help="從文字提取 Jira keys")
     extract_parser.add_argument("text", help="Text to extract from")
 
+    # validate-range
+    range_parser = subparsers.add_parser("validate-range", help="一次驗證範圍內所有 commit message（hook / CI 用）")
+    range_parser.add_argument("ranges", nargs="+",
+                              help="Revision ranges, e.g. origin/main..HEAD (base 0000000... = commits new to the repo)")
+    range_parser.add_argument("-C", dest="repo", default=".", help="Repository path (default: .)")
+    range_parser.add_argument("--no-merges", action="store_true", help="Skip merge commits")
+    range_parser.add_argument("--format", choices=["text", "json", "github"], default="text",
+                              help="Output: text, json, or GitHub Actions ::error annotations (default: text)")
+
+    # scan-log
+    scan_parser = subparsers.add_parser("scan-log", help="串流掃描 git log，建立 Jira key → commits 索引（增量）")
+    scan_parser.add_argument("revs", nargs="*", help="Revisions to scan (default: HEAD; e.g. main, v1.0..main)")
+    scan_parser.add_argument("--all", action="store_true", help="Scan every ref (like git log --all)")
+    scan_parser.add_argument("-C", dest="repo", default=".", help="Repository path (default: .)")
+    scan_parser.add_argument("--index", help=f"Index file (default: <git dir>/{LOG_INDEX_NAME})")
+    scan_parser.add_argument("--project", action="append", help="Only index keys of this project (repeatable; applies to commits scanned in this run, --rebuild to change)")
+    scan_parser.add_argument("--rebuild", action="store_true", help="Drop the index and rescan everything")
+
+    # key-log
+    keylog_parser = subparsers.add_parser("key-log", help="查詢 scan-log 索引：key 的 commits / branches / authors")
+    keylog_parser.add_argument("keys", nargs="+", help="Jira issue keys")
+    keylog_parser.add_argument("-C", dest="repo", default=".", help="Repository path (default: .)")
+    keylog_parser.add_argument("--index", help=f"Index file (default: <git dir>/{LOG_INDEX_NAME})")
+    keylog_parser.add_argument("--json", action="store_true", help="Output JSON")
+
     args = parser.parse_args()
 
     if args.command == "validate":
@@ -162,9 +449,84 @@ def main():
         keys = extract_jira_keys(args.text)
         print("\n".join(keys) if keys else "No Jira keys found")
 
+    elif args.command == "validate-range":
+        sys.exit(_validate_range_command(args))
+
+    elif args.command in ("scan-log", "key-log"):
+        sys.exit(_log_index_command(args))
+
     else:
         parser.print_help()
 
 
+def _validate_range_command(args) -> int:
+    """validate-range：有任何不合格的 commit 時 exit 1"""
+    try:
+        checked, failures = validate_range(args.ranges, args.repo, merges=not args.no_merges)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if args.format == "json":
+        import json
+        print(json.dumps({"checked": checked, "failures": failures}, indent=2, ensure_ascii=False))
+    elif args.format == "github":
+        for f in failures:
+            print(f"::error title=Invalid commit message {f['sha'][:10]}::"
+                  f"{_annotation(f['subject'])} ({_annotation(f['error'])})")
+        print(f"{checked - len(failures)}/{checked} commit messages valid")
+    else:
+        for f in failures:
+            print(f"✗ {f['sha'][:10]} {f['subject']}\n    {f['error']}")
+        mark = "✗" if failures else "✓"
+        print(f"{mark} {checked - len(failures)}/{checked} commit messages valid")
+    return 1 if failures else 0
+
+
+def _log_index_command(args) -> int:
+    """scan-log / key-log"""
+    import os
+    import sqlite3
+    import time
+
+    try:
+        index_path = args.index or default_log_index(args.repo)
+        if args.command == "key-log" and not os.path.exists(index_path):
+            print(f"Error: no index at {index_path}; run scan-log first", file=sys.stderr)
+            return 1
+        with LogIndex(index_path) as index:
+            if args.command == "scan-log":
+                start = time.perf_counter()
+                revs = (["--all"] if args.all else []) + args.revs
+                stats = index.scan(revs or ["HEAD"], args.repo, args.project, args.rebuild)
+                elapsed = time.perf_counter() - start
+                totals = index.stats()
+            else:
+                results = [index.lookup(key) for key in args.keys]
+    except (RuntimeError, OSError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.command == "scan-log":
+        print(f"Scanned {stats['commits']} new commits ({stats['matched']} with keys, "
+              f"{stats['keys']} new links) in {elapsed:.2f}s")
+        print(f"Index: {totals['keys']} keys, {totals['commits']} commits ({index_path})")
+        return 0
+
+    if args.json:
+        import json
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return 0
+    for result in results:
+        authors = ", ".join(f"{name} ({n})" for name, n in sorted(result["authors"].items(), key=lambda a: -a[1]))
+        print(f"{result['key']}: {len(result['commits'])} commits" + (f" by {authors}" if authors else ""))
+        for branch in result["branches"]:
+            print(f"  branch {branch}")
+        for c in result["commits"]:
+            day = time.strftime("%Y-%m-%d", time.localtime(c["time"]))
+            print(f"  {c['sha'][:10]} {day} {c['author']}: {c['subject']}")
+    return 0
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""Long-lived local daemon serving the pack/normalize/dashboard scripts.
+
+Usage:
+    python jira_daemon.py start            # detach and serve in the background
+    python jira_daemon.py serve            # serve in the foreground
+    python jira_daemon.py status
+    python jira_daemon.py stop
+
+While the daemon runs, `jira_pack.py <command> ...` forwards the call over
+a Unix domain socket instead of importing and running the script in a
+fresh interpreter. Set JIRA_PACK_DAEMON=0 to always run locally and
+JIRA_PACK_SOCKET to choose the socket path. By default the socket lives in
+a private (0700) per-user directory, and clients only connect to a socket
+owned by their own user.
+
+Protocol: one JSON object per line in each direction.
+    {"op": "pack_issue", "issue": {...}, "budget": 800}
+    {"op": "pack_search", "data": {...}, "max": 50, "detailed": false, "group_by": null, "diff": null}
+    {"op": "normalize", "data": {...}, "map_file": "field_map.json", "drop_unmapped": false}
+    {"op": "dashboard", "data": {...}, "template": null, "offline": false, "compress": false,
+     "chartjs": null}
+    {"op": "cli", "command": "issue", "argv": [...], "stdin": "...", "cwd": "...", "env": {...}}
+    {"op": "ping"} | {"op": "shutdown"}
+Responses are {"ok": true, "result": ...} or {"ok": false, "error": "..."}.
+
+The server keeps modules imported and caches field maps and the dashboard
+template (keyed by mtime) between requests. Requests are handled one at
+a time on the event loop; the scripts are CPU-bound, so this is also the
+fastest order to run them in.
+"""
+
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from jira_pack import socket_path
+
+# Largest request line accepted (issue/search JSON is sent inline)
+MAX_REQUEST_BYTES = 256 * 1024 * 1024
+# Options that stream stdin or spawn workers; these always run locally
+LOCAL_ONLY_OPTIONS = {"--stream", "-s", "--ndjson", "--batch", "-b", "--jobs", "-j"}
+# Client settings sent with each cli request ($JIRA_PACK_PROFILE, _CPROFILE,
+# _CHARTJS, ...) and applied while it runs, in place of the daemon's own
+ENV_PREFIX = "JIRA_PACK_"
+# Settings that concern the daemon itself, never sent or replaced
+DAEMON_ENV = {"JIRA_PACK_SOCKET", "JIRA_PACK_DAEMON"}
+# Settings fixed for a whole process (the JSON backend); calls with these run locally
+LOCAL_ONLY_ENV = {"JIRA_PACK_JSON"}
+
+
+def _check_socket_dir(path: str) -> None:
+    """Create the socket's directory (mode 0700) if missing; refuse the default one unless private.
+
+    The default directory sits in a shared location such as /tmp, where
+    another user could create it first to listen in on or answer requests.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(directory):
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    if os.path.basename(directory) != f"jira-pack-{os.getuid()}":
+        return  # a directory the user chose
+    st = os.lstat(directory)
+    if os.path.islink(directory) or st.st_uid != os.getuid():
+        raise PermissionError(f"{directory} is not a directory owned by this user")
+    if st.st_mode & 0o077:
+        os.chmod(directory, 0o700)
+
+
+def _owned_socket(path: str) -> bool:
+    """True if `path` is a socket created by this user (not planted by another)."""
+    import stat
+
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+
+def request(payload: Dict[str, Any], path: Optional[str] = None, timeout: float = 300.0) -> Any:
+    """Send one request and return its result; raises ConnectionError if unreachable."""
+    import socket
+
+    path = path or socket_path()
+    if not _owned_socket(path):
+        raise ConnectionError(f"daemon not reachable: {path} is not a socket owned by this user")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path)
+    except OSError as e:
+        sock.close()
+        raise ConnectionError(f"daemon not reachable: {e}") from e
+    with sock:
+        sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError("daemon closed the connection")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error", "daemon error"))
+    return response.get("result")
+
+
+def daemon_running(path: Optional[str] = None) -> bool:
+    """True if a daemon answers on the socket."""
+    path = path or socket_path()
+    if not os.path.exists(path):
+        return False
+    try:
+        return request({"op": "ping"}, path, timeout=2.0) == "pong"
+    except (ConnectionError, RuntimeError, OSError, ValueError):
+        return False
+
+
+def _stdin_ready(wait: float = 0.05) -> bool:
+    """True if stdin is a file, or a pipe/device that has data or EOF waiting."""
+    import select
+    import stat
+
+    try:
+        fd = sys.stdin.fileno()
+        if stat.S_ISREG(os.fstat(fd).st_mode):
+            return True
+        return bool(select.select([fd], [], [], wait)[0])
+    except (OSError, ValueError):
+        return False
+
+
+def _call_env(environ: Dict[str, str]) -> Dict[str, str]:
+    """The JIRA_PACK_* settings in `environ` that apply per call."""
+    return {k: v for k, v in environ.items()
+            if k.startswith(ENV_PREFIX) and k not in DAEMON_ENV and k not in LOCAL_ONLY_ENV}
+
+
+def forward_cli(command: str, argv: List[str]) -> Optional[int]:
+    """Run a jira_pack command in the daemon; None means "run it locally".
+
+    Falls back (returns None) when disabled via JIRA_PACK_DAEMON=0, when
+    the call streams or forks (LOCAL_ONLY_OPTIONS), when it sets a
+    process-wide option (LOCAL_ONLY_ENV), or when no daemon is listening.
+    stdin, when it is a file or a pipe with data ready, is read and sent
+    inline; the JIRA_PACK_* settings are sent along and apply to this call.
+    """
+    if os.environ.get("JIRA_PACK_DAEMON", "1") == "0":
+        return None
+    if any(arg.split("=", 1)[0] in LOCAL_ONLY_OPTIONS for arg in argv):
+        return None
+    if any(os.environ.get(key) for key in LOCAL_ONLY_ENV):
+        return None
+    path = socket_path()
+    if not os.path.exists(path):
+        return None
+
+    stdin = None
+    if not sys.stdin.isatty():
+        if not _stdin_ready():
+            # An open pipe with nothing on it yet: the command may or may not
+            # read it, and waiting could block forever, so run locally.
+            return None
+        stdin = sys.stdin.read()
+    payload = {"op": "cli", "command": command, "argv": argv, "stdin": stdin, "cwd": os.getcwd(),
+               "env": _call_env(os.environ)}
+    try:
+        result = request(payload, path)
+    except OSError:  # unreachable, refused, reset or timed out
+        if stdin is not None:
+            # stdin is already consumed; hand it to the local run
+            import io
+
+            sys.stdin = io.StringIO(stdin)
+        return None
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    return result["rc"]
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+
+
+def _run_cli(command: str, argv: List[str], stdin: Optional[str], cwd: str,
+             env: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """Run a jira_pack command in-process with captured stdio and the client's JIRA_PACK_* settings."""
+    import io
+    from contextlib import redirect_stderr, redirect_stdout
+
+    import jira_pack
+
+    if command not in jira_pack.COMMANDS or command == "daemon":
+        raise ValueError(f"unknown command '{command}'")
+
+    out, err = io.StringIO(), io.StringIO()
+    saved_stdin, saved_cwd, saved_env = sys.stdin, os.getcwd(), _call_env(os.environ)
+    try:
+        os.chdir(cwd)
+        sys.stdin = io.StringIO(stdin or "")
+        for key in saved_env:
+            del os.environ[key]
+        os.environ.update(_call_env(env or {}))
+        with redirect_stdout(out), redirect_stderr(err):
+            rc = jira_pack.run(command, argv)
+    finally:
+        sys.stdin = saved_stdin
+        os.chdir(saved_cwd)
+        for key in _call_env(os.environ):
+            del os.environ[key]
+        os.environ.update(saved_env)
+    return {"rc": rc, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+def dispatch(req: Dict[str, Any]) -> Any:
+    """Execute one request and return its result."""
+    op = req.get("op")
+    if op == "ping":
+        return "pong"
+    if op == "shutdown":
+        return "bye"
+    if op == "pack_issue":
+        from pack_issue import pack_issue, pack_issue_budget, get_token_counter
+
+        if req.get("budget") is not None:
+            output, tokens = pack_issue_budget(req["issue"], req["budget"],
+                                               get_token_counter(req.get("tokenizer", "estimate")))
+            return {"markdown": output, "tokens": tokens}
+        return {"markdown": pack_issue(req["issue"])}
+    if op == "pack_search":
+        from pack_search import (
+            pack_search_detailed, pack_search_diff, pack_search_groups, pack_search_results, parse_dimensions,
+        )
+
+        data = req["data"]
+        if req.get("group_by"):
+            return {"markdown": pack_search_groups(data.get("issues", []), parse_dimensions(req["group_by"]),
+                                                   req.get("top_keys", 3), req.get("group_rows", 10), data)}
+        if req.get("diff"):
+            return {"markdown": pack_search_diff(data.get("issues", []), req["diff"], req.get("max", 50), data)}
+        pack = pack_search_detailed if req.get("detailed") else pack_search_results
+        return {"markdown": pack(data, req.get("max", 50))}
+    if op == "normalize":
+        from normalize_fields import load_field_map, normalize_issue
+
+        field_map = load_field_map(req.get("map_file"))
+        drop = req.get("drop_unmapped", False)
+        data = req["data"]
+        if isinstance(data, dict) and "issues" in data:
+            data["issues"] = [normalize_issue(i, field_map, drop) for i in data["issues"]]
+            return data
+        return normalize_issue(data, field_map, drop)
+    if op == "dashboard":
+        from pathlib import Path
+
+        from pack_dashboard import build_dashboard, generate_html
+
+        dashboard = build_dashboard(req["data"])
+        template = Path(req["template"]) if req.get("template") else None
+        html = generate_html(dashboard, template, req.get("offline", False), req.get("compress", False),
+                             req.get("chartjs"))
+        return {"dashboard": dashboard, "html": html}
+    if op == "cli":
+        return _run_cli(req["command"], req.get("argv", []), req.get("stdin"), req.get("cwd", os.getcwd()),
+                        req.get("env"))
+    raise ValueError(f"unknown op '{op}'")
+
+
+def _preload() -> None:
+    """Import every command module up front so the first request is warm."""
+    import jira_pack
+    import importlib
+
+    for module_name, _ in jira_pack.COMMANDS.values():
+        if module_name != "jira_daemon":
+            importlib.import_module(module_name)
+    try:
+        from pack_dashboard import get_template_path, load_template
+
+        load_template(get_template_path())
+    except FileNotFoundError:
+        pass
+
+
+def serve(path: Optional[str] = None) -> int:
+    """Serve requests on the Unix socket until a shutdown request or signal."""
+    import asyncio
+    import signal
+
+    path = path or socket_path()
+    try:
+        _check_socket_dir(path)
+    except OSError as e:
+        sys.stderr.write(f"Error: cannot use socket directory: {e}\n")
+        return 1
+    if os.path.exists(path):
+        if daemon_running(path):
+            sys.stderr.write(f"Error: daemon already running on {path}\n")
+            return 1
+        os.unlink(path)  # stale socket from a crashed daemon
+
+    _preload()
+
+    async def handle(reader: "asyncio.StreamReader", writer: "asyncio.StreamWriter") -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    req = json.loads(line)
+                    response = {"ok": True, "result": dispatch(req)}
+                except Exception as e:
+                    req = {}
+                    response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+                if req.get("op") == "shutdown":
+                    stop.set()
+                    break
+        finally:
+            writer.close()
+
+    async def main_loop() -> None:
+        server = await asyncio.start_unix_server(handle, path=path, limit=MAX_REQUEST_BYTES)
+        os.chmod(path, 0o600)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        async with server:
+            await stop.wait()
+
+    stop = asyncio.Event()
+    try:
+        asyncio.run(main_loop())
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+    return 0
+
+
+def start(path: Optional[str] = None, wait: float = 5.0) -> int:
+    """Start `serve` in a detached process and wait until it answers."""
+    import subprocess
+    import time
+
+    path = path or socket_path()
+    if daemon_running(path):
+        print(f"Daemon already running on {path}")
+        return 0
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "serve", "--socket", path],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if daemon_running(path):
+            print(f"Daemon started on {path}")
+            return 0
+        time.sleep(0.05)
+    sys.stderr.write(f"Error: daemon did not start on {path}\n")
+    return 1
+
+
+def main() -> int:
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local daemon for the Jira pack scripts")
+    parser.add_argument("action", choices=["start", "serve", "stop", "status"], help="Daemon action")
+    parser.add_argument("--socket", help="Unix socket path (default: $JIRA_PACK_SOCKET or per-user runtime path)")
+    args = parser.parse_args()
+    path = args.socket or socket_path()
+
+    if args.action == "serve":
+        return serve(path)
+    if args.action == "start":
+        return start(path)
+    if args.action == "status":
+        running = daemon_running(path)
+        print(f"Daemon {'running' if running else 'not running'} ({path})")
+        return 0 if running else 1
+    # stop
+    if not daemon_running(path):
+        print(f"Daemon not running ({path})")
+        return 0
+    request({"op": "shutdown"}, path)
+    print("Daemon stopped")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
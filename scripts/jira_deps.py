@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""Blocking-dependency graph built from raw Jira issue links.
+
+Usage:
+    python jira_deps.py export.json > deps.json
+    python jira_deps.py export.ndjson --ndjson --top 20
+    python jira_deps.py --fields-param
+
+Reads `fields.issuelinks` from a search export (envelope or NDJSON, one
+issue at a time) and writes JSON with two members that can be merged into
+the dashboard metrics file:
+
+    dependency_graph    summary read by pack_dashboard.build_dashboard
+    dependency_chains   the legacy [{root, chain, length, downstream_count}]
+                        entries, one per single point of failure
+
+An edge A -> B means "A blocks B". Both sides of a link (A's outwardIssue
+and B's inwardIssue) collapse into one edge, and links touching an issue that
+is already done are dropped: a resolved blocker holds nothing up, and a
+resolved issue is no longer waiting.
+
+Issues are numbered in first-seen order and the graph is stored as CSR
+(compressed sparse row) arrays of ints, so 100k issues and 500k links take
+a few MB. Strongly connected components (cycles), the longest chain and
+the blocked set are computed in linear time. Transitive downstream counts
+are exact: reachable sets are bitsets (Python ints) merged in reverse
+topological order, numbered within each weakly connected component and
+freed once their last predecessor has read them.
+"""
+
+import json
+import sys
+from array import array
+from typing import Any, Dict, IO, Iterable, List, Optional, Tuple
+
+from jira_fields import compile_path
+
+# Link type (outward name, lower-case) counted as blocking
+BLOCKING_LINK_TYPES = frozenset(["blocks"])
+# Status categories / names whose issues no longer block
+DONE_CATEGORIES = frozenset(["done"])
+DONE_STATUSES = frozenset(["done", "closed", "resolved", "cancelled", "canceled"])
+# An issue blocking at least this many others (transitively) is a single point of failure
+SPOF_MIN_DOWNSTREAM = 3
+TOP_SPOF = 10
+MAX_CYCLES = 20
+
+# Every path read from an issue (for projection / the `fields=` parameter)
+LINK_FIELDS = [
+    "key",
+    "fields.status.name",
+    "fields.status.statusCategory.key",
+    "fields.issuelinks",
+]
+
+_KEY = compile_path("key")
+_LINKS = compile_path("fields.issuelinks")
+_STATUS = compile_path("fields.status")
+_LINK_OUTWARD_NAME = compile_path("type.outward")
+_LINKED_STATUS = compile_path("fields.status")
+
+
+def _is_done(status: Any) -> Optional[bool]:
+    """True/False from a status object; None when it is missing."""
+    if not isinstance(status, dict):
+        return None
+    category = status.get("statusCategory")
+    if isinstance(category, dict) and category.get("key"):
+        return category["key"] in DONE_CATEGORIES
+    name = status.get("name")
+    if name is None:
+        return None
+    return name.lower() in DONE_STATUSES
+
+
+# ---------------------------------------------------------------------------
+# Graph
+# ---------------------------------------------------------------------------
+
+
+class DependencyGraph:
+    """Issues numbered 0..n-1 with blocks-edges in CSR form.
+
+    `keys[i]` is the issue key of node i; the successors of node i (the
+    issues it blocks) are `targets[offsets[i]:offsets[i + 1]]`.
+    """
+
+    def __init__(self, keys: List[str], offsets: array, targets: array, done: bytearray):
+        self.keys = keys
+        self.offsets = offsets
+        self.targets = targets
+        self.done = done
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    @classmethod
+    def from_edges(cls, keys: List[str], src: array, dst: array, done: bytearray) -> "DependencyGraph":
+        """Build the CSR arrays from parallel edge arrays (counting sort by source)."""
+        n = len(keys)
+        offsets = array("l", [0]) * (n + 1)
+        for s in src:
+            offsets[s + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+        fill = array("l", offsets[:n])
+        targets = array("l", [0]) * len(src)
+        for s, d in zip(src, dst):
+            targets[fill[s]] = d
+            fill[s] += 1
+        return cls(keys, offsets, targets, done)
+
+    @classmethod
+    def from_issues(cls, issues: Iterable[Dict[str, Any]],
+                    link_types: Iterable[str] = BLOCKING_LINK_TYPES) -> "DependencyGraph":
+        """Build the graph from raw issues carrying `fields.issuelinks`."""
+        link_types = frozenset(t.lower() for t in link_types)
+        index: Dict[str, int] = {}
+        keys: List[str] = []
+        done = bytearray()
+        # 0 = status unknown, 1 = taken from a link, 2 = the issue's own status
+        status_from = bytearray()
+        edges = set()  # (blocker << 32) | blocked
+
+        def node(key: str, status: Any, rank: int) -> int:
+            i = index.get(key)
+            if i is None:
+                i = index[key] = len(keys)
+                keys.append(key)
+                done.append(0)
+                status_from.append(0)
+            if status_from[i] < rank:
+                state = _is_done(status)
+                if state is not None:
+                    done[i] = state
+                    status_from[i] = rank
+            return i
+
+        for issue in issues:
+            key = _KEY(issue)
+            if not key:
+                continue
+            me = node(key, _STATUS(issue), 2)
+            for link in _LINKS(issue) or ():
+                outward = _LINK_OUTWARD_NAME(link)
+                if not outward or outward.lower() not in link_types:
+                    continue
+                other = link.get("outwardIssue")
+                if other:
+                    other_key = other.get("key")
+                    if other_key:
+                        edges.add(me << 32 | node(other_key, _LINKED_STATUS(other), 1))
+                    continue
+                other = link.get("inwardIssue")
+                if other:
+                    other_key = other.get("key")
+                    if other_key:
+                        edges.add(node(other_key, _LINKED_STATUS(other), 1) << 32 | me)
+
+        src = array("l")
+        dst = array("l")
+        mask = 0xFFFFFFFF
+        for edge in edges:
+            s, d = edge >> 32, edge & mask
+            if s != d and not done[s] and not done[d]:
+                src.append(s)
+                dst.append(d)
+        return cls.from_edges(keys, src, dst, done)
+
+
+# ---------------------------------------------------------------------------
+# Analysis
+# ---------------------------------------------------------------------------
+
+
+def strongly_connected(graph: DependencyGraph) -> Tuple[array, int]:
+    """Tarjan's algorithm, iterative. Returns (component id per node, count).
+
+    Components are numbered in the order Tarjan completes them, which is a
+    reverse topological order: every edge goes to an equal or lower id.
+    """
+    n = len(graph)
+    offsets, targets = graph.offsets, graph.targets
+    unvisited = -1
+    order = array("l", [unvisited]) * n
+    low = array("l", [0]) * n
+    comp = array("l", [unvisited]) * n
+    on_stack = bytearray(n)
+    stack: List[int] = []
+    counter = 0
+    ncomp = 0
+
+    for root in range(n):
+        if order[root] != unvisited:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [(root, offsets[root])]
+        while work:
+            v, e = work[-1]
+            end = offsets[v + 1]
+            while e < end:
+                w = targets[e]
+                e += 1
+                if order[w] == unvisited:
+                    work[-1] = (v, e)
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append((w, offsets[w]))
+                    break
+                if on_stack[w] and order[w] < low[v]:
+                    low[v] = order[w]
+            else:
+                work.pop()
+                if low[v] == order[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        comp[w] = ncomp
+                        if w == v:
+                            break
+                    ncomp += 1
+                if work:
+                    u = work[-1][0]
+                    if low[v] < low[u]:
+                        low[u] = low[v]
+    return comp, ncomp
+
+
+def _weak_positions(graph: DependencyGraph) -> array:
+    """Bit position of each node within its weakly connected component."""
+    n = len(graph)
+    parent = list(range(n))
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    offsets, targets = graph.offsets, graph.targets
+    for v in range(n):
+        for e in range(offsets[v], offsets[v + 1]):
+            a, b = find(v), find(targets[e])
+            if a != b:
+                parent[a] = b
+    sizes: Dict[int, int] = {}
+    positions = array("l", [0]) * n
+    for v in range(n):
+        r = find(v)
+        positions[v] = sizes.get(r, 0)
+        sizes[r] = positions[v] + 1
+    return positions
+
+
+def analyze(graph: DependencyGraph, spof_min: int = SPOF_MIN_DOWNSTREAM, top: int = TOP_SPOF) -> Dict[str, Any]:
+    """Cycles, longest chain, downstream counts and single points of failure.
+
+    Returns {"dependency_graph": summary, "dependency_chains": [...]}; see
+    the module docstring. A chain counts issues, so A blocks B blocks C is
+    a chain of length 3; issues in a cycle count as one step.
+    """
+    n = len(graph)
+    offsets, targets, keys = graph.offsets, graph.targets, graph.keys
+    comp, ncomp = strongly_connected(graph)
+
+    members: List[List[int]] = [[] for _ in range(ncomp)]
+    for v in range(n):
+        members[comp[v]].append(v)
+
+    # Condensation: distinct successor components, and predecessor counts
+    succs: List[List[int]] = [[] for _ in range(ncomp)]
+    indegree = array("l", [0]) * ncomp
+    for c in range(ncomp):
+        seen = set()
+        for v in members[c]:
+            for e in range(offsets[v], offsets[v + 1]):
+                d = comp[targets[e]]
+                if d != c and d not in seen:
+                    seen.add(d)
+                    indegree[d] += 1
+        succs[c] = list(seen)
+
+    # Components are numbered successors-first, so one ascending pass sees
+    # every successor before its predecessors.
+    positions = _weak_positions(graph)
+    chain = array("l", [0]) * ncomp  # longest chain starting in c, in steps
+    nxt = array("l", [-1]) * ncomp
+    downstream = array("l", [0]) * n
+    reach: Dict[int, int] = {}
+    pending = array("l", indegree)
+    for c in range(ncomp):
+        bits = 0
+        for v in members[c]:
+            bits |= 1 << positions[v]
+        best, best_next = 0, -1
+        for d in succs[c]:
+            bits |= reach[d]
+            pending[d] -= 1
+            if not pending[d]:
+                del reach[d]
+            if chain[d] > best:
+                best, best_next = chain[d], d
+        chain[c] = best + 1
+        nxt[c] = best_next
+        count = bits.bit_count() - 1
+        for v in members[c]:
+            downstream[v] = count
+        if indegree[c]:
+            reach[c] = bits
+
+    def path_from(c: int) -> List[str]:
+        path = []
+        while c >= 0:
+            path.append(keys[min(members[c])])
+            c = nxt[c]
+        return path
+
+    cycles = sorted((sorted(keys[v] for v in m) for m in members if len(m) > 1), key=lambda m: (-len(m), m))
+    # Blocked: anything with a predecessor, including every member of a cycle
+    blocked = sum(len(members[c]) for c in range(ncomp) if indegree[c] or len(members[c]) > 1)
+
+    spof = sorted((v for v in range(n) if downstream[v] >= spof_min), key=lambda v: (-downstream[v], keys[v]))[:top]
+    longest = max(range(ncomp), key=lambda c: (chain[c], -min(members[c])), default=-1)
+    max_chain = path_from(longest) if longest >= 0 and chain[longest] > 1 else []
+
+    summary = {
+        "issues": n,
+        "links": graph.edge_count,
+        "max_chain_length": len(max_chain),
+        "max_chain_root": max_chain[0] if max_chain else "",
+        "max_chain": max_chain,
+        "single_points_of_failure": [keys[v] for v in spof],
+        "downstream_counts": {keys[v]: downstream[v] for v in spof},
+        "total_affected": blocked,
+        "cycles": cycles[:MAX_CYCLES],
+        "cycle_count": len(cycles),
+    }
+    chains = []
+    for v in spof:
+        path = path_from(comp[v])
+        path[0] = keys[v]
+        chains.append({"root": keys[v], "chain": path[1:], "length": len(path),
+                       "downstream_count": downstream[v]})
+    return {"dependency_graph": summary, "dependency_chains": chains}
+
+
+def analyze_export(fp: IO[str], ndjson: bool = False, **options: Any) -> Dict[str, Any]:
+    """Stream a search export and analyze its blocking links."""
+    from jira_stream import iter_issues
+
+    return analyze(DependencyGraph.from_issues(iter_issues(fp, ndjson)), **options)
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> int:
+    """Main entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Analyze blocking links in a Jira search export")
+    parser.add_argument("file", nargs="?", help="Search export JSON (or stdin if omitted)")
+    parser.add_argument("--ndjson", action="store_true", help="Input is one issue per line")
+    parser.add_argument("--top", type=int, default=TOP_SPOF, help="Single points of failure to list")
+    parser.add_argument("--spof-min", type=int, default=SPOF_MIN_DOWNSTREAM,
+                        help="Downstream issues that make a blocker a single point of failure")
+    parser.add_argument("--fields-param", action="store_true",
+                        help="Print the fields= value for the search API and exit")
+    args = parser.parse_args()
+
+    if args.fields_param:
+        from jira_fields import fields_param
+
+        print(fields_param(LINK_FIELDS))
+        return 0
+
+    try:
+        if args.file:
+            with open(args.file, "r", encoding="utf-8") as f:
+                result = analyze_export(f, args.ndjson, spof_min=args.spof_min, top=args.top)
+        else:
+            result = analyze_export(sys.stdin, args.ndjson, spof_min=args.spof_min, top=args.top)
+    except FileNotFoundError:
+        sys.stderr.write(f"Error: File not found: {args.file}\n")
+        return 1
+    except json.JSONDecodeError as e:
+        sys.stderr.write(f"Error: Invalid JSON: {e}\n")
+        return 1
+
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,192 @@
+"""Field access and formatting helpers shared by the pack scripts.
+
+`compile_path("fields.status.name")` splits the path once and returns a
+getter specialised for its depth, so per-row lookups are plain indexing:
+
+    STATUS = compile_path("fields.status.name")
+    for issue in issues:
+        status = STATUS(issue, "")
+
+A missing key, or a non-dict along the way, yields the default. Short
+paths index directly and let the lookup error signal a miss: JSON only
+produces dicts, lists and scalars, and indexing a list or scalar with a
+string key raises TypeError.
+
+`compile_projection(paths)` is the write-side counterpart: it strips an
+issue down to the given paths, and `fields_param(paths)` gives the
+matching `fields=` value for the Jira search API.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+FieldGetter = Callable[..., Any]
+
+_LOOKUP_ERRORS = (KeyError, TypeError, IndexError)
+
+
+def compile_path(path: str) -> FieldGetter:
+    """Compile a dotted path into a getter `fn(obj, default=None)`."""
+    parts = tuple(path.split("."))
+
+    if len(parts) == 1:
+        (a,) = parts
+
+        def getter(obj: Any, default: Any = None) -> Any:
+            try:
+                return obj[a]
+            except _LOOKUP_ERRORS:
+                return default
+
+    elif len(parts) == 2:
+        a, b = parts
+
+        def getter(obj: Any, default: Any = None) -> Any:
+            try:
+                return obj[a][b]
+            except _LOOKUP_ERRORS:
+                return default
+
+    elif len(parts) == 3:
+        a, b, c = parts
+
+        def getter(obj: Any, default: Any = None) -> Any:
+            try:
+                return obj[a][b][c]
+            except _LOOKUP_ERRORS:
+                return default
+
+    else:
+        def getter(obj: Any, default: Any = None) -> Any:
+            cur = obj
+            for part in parts:
+                if isinstance(cur, dict) and part in cur:
+                    cur = cur[part]
+                else:
+                    return default
+            return cur
+
+    getter.__name__ = f"get_{'_'.join(parts)}"
+    getter.__doc__ = f"Return obj.{path} or the default."
+    return getter
+
+
+_compiled: Dict[str, FieldGetter] = {}
+
+
+def get_path(obj: Any, path: str, default: Any = None) -> Any:
+    """Safely navigate nested dictionary using dot notation (compiled and cached per path)."""
+    getter = _compiled.get(path)
+    if getter is None:
+        getter = _compiled[path] = compile_path(path)
+    return getter(obj, default)
+
+
+# ---------------------------------------------------------------------------
+# Projection
+# ---------------------------------------------------------------------------
+
+# Issue members that live outside "fields"
+TOP_LEVEL_MEMBERS = frozenset(["key", "id", "self", "expand", "changelog", "renderedFields"])
+
+
+def field_paths(names: Iterable[str]) -> List[str]:
+    """Turn user field names into paths: "summary" -> "fields.summary".
+
+    Dotted names starting with "fields." and the top-level issue members
+    (key, id, ...) are kept as given.
+    """
+    paths = []
+    for name in names:
+        name = name.strip()
+        if not name:
+            continue
+        if name.startswith("fields.") or name.split(".", 1)[0] in TOP_LEVEL_MEMBERS:
+            paths.append(name)
+        else:
+            paths.append("fields." + name)
+    return paths
+
+
+def _projection_trie(paths: Iterable[str]) -> Dict[str, Any]:
+    """Nested dict of path parts; True marks a subtree kept whole."""
+    trie: Dict[str, Any] = {}
+    for path in paths:
+        node = trie
+        parts = path.split(".")
+        for part in parts[:-1]:
+            child = node.get(part)
+            if child is True:
+                break  # an ancestor is already kept whole
+            if child is None:
+                child = node[part] = {}
+            node = child
+        else:
+            node[parts[-1]] = True
+    return trie
+
+
+def _project(value: Any, trie: Dict[str, Any]) -> Any:
+    if isinstance(value, dict):
+        out = {}
+        for name, sub in trie.items():
+            if name in value:
+                child = value[name]
+                out[name] = child if sub is True else _project(child, sub)
+        return out
+    if isinstance(value, list):
+        return [_project(item, trie) for item in value]
+    return value
+
+
+def compile_projection(paths: Iterable[str]) -> Callable[[Any], Any]:
+    """Compile dotted paths into `fn(obj)` returning a copy with only those paths.
+
+    Lists along a path are mapped element by element and keep their length,
+    so "fields.components.name" keeps just the component names. Getters for
+    the same paths return the same values on the projection as on the
+    original.
+    """
+    trie = _projection_trie(paths)
+
+    def project(obj: Any) -> Any:
+        return _project(obj, trie)
+
+    return project
+
+
+def fields_param(paths: Iterable[str]) -> str:
+    """Comma-separated top-level field names for the search API `fields=` parameter."""
+    names: Dict[str, None] = {}
+    for path in paths:
+        parts = path.split(".")
+        if parts[0] == "fields" and len(parts) > 1:
+            names[parts[1]] = None
+    return ",".join(names)
+
+
+# ---------------------------------------------------------------------------
+# Formatting
+# ---------------------------------------------------------------------------
+
+
+def format_date(date_str: Optional[str]) -> str:
+    """Format ISO date to readable format."""
+    if not date_str:
+        return ""
+    # Take just the date part: 2024-01-15T10:30:00.000+0000 -> 2024-01-15
+    return date_str[:10] if len(date_str) >= 10 else date_str
+
+
+def truncate_text(text: str, max_length: int = 4000) -> str:
+    """Truncate multi-line text with indication if truncated."""
+    if len(text) <= max_length:
+        return text
+    return text[:max_length - 20] + "\n\n...(truncated)"
+
+
+def truncate_inline(text: str, max_len: int = 80) -> str:
+    """Flatten text to one table-safe line and truncate with ellipsis."""
+    text = str(text).replace("\n", " ").replace("|", "/").strip()
+    if len(text) > max_len:
+        return text[:max_len - 3] + "..."
+    return text
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+jira_history.py - Local sprint history for the dashboard
+
+pack_dashboard's trend vectors, delivery forecast and risk persistence
+read several sprints of history (velocity.completed, scope_creep
+.sprint_rates, bug_trend.weekly_counts, risk_history). With a history
+store, every run records what it was given plus the risk levels it
+computed, and fills those series back in from the store, so input JSON
+only needs the current sprint:
+
+    python pack_dashboard.py --data metrics.json --output dashboard.html --history ~/.cache/jira-pack/history.sqlite
+
+Layout (one sqlite file):
+
+    sprints (project, sprint, seq, committed, completed, scope_rate,
+             schedule, scope, resource, quality, recorded)
+    weeks   (project, week, bugs, recorded)      week = ISO week "2026-W04"
+
+Rows are keyed by project and sprint name (ISO week for bug counts); a
+later run for the same sprint updates its row. `seq` orders sprints as
+they appear in velocity.sprints, and a lookup reads the newest `window`
+rows of a project through the (project, seq) index. Each project keeps
+its newest `keep` sprints and weeks; `compact` also rebuilds the file.
+
+Usage:
+    python jira_history.py show --db history.sqlite PROJ
+    python jira_history.py compact --db history.sqlite --keep 52
+"""
+
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_PATH = "~/.cache/jira-pack/history.sqlite"
+DEFAULT_WINDOW = 6  # sprints / weeks handed to the dashboard, as collected from Jira
+DEFAULT_KEEP = 104  # sprints / weeks kept per project
+RISK_CATEGORIES = ("schedule", "scope", "resource", "quality")
+
+
+def iso_week(day) -> str:
+    """ISO week label of a date, e.g. "2026-W04" (sorts chronologically)."""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def _tail(labels: list, values: list) -> list:
+    """(label, value) pairs of two lists aligned at their newest end."""
+    n = min(len(labels), len(values))
+    return list(zip(labels[len(labels) - n:], values[len(values) - n:])) if n else []
+
+
+def current_sprint(data: dict) -> Optional[str]:
+    """Label the running sprint is stored under.
+
+    data.sprint.name when velocity.sprints lists it; otherwise the newest
+    velocity label (the series ends with the sprint in progress, as
+    jira_metrics.py writes it), falling back to the sprint name.
+    """
+    name = (data.get("sprint") or {}).get("name")
+    labels = [str(s) for s in (data.get("velocity") or {}).get("sprints") or ()]
+    if labels and (name is None or str(name) not in labels):
+        return labels[-1]
+    return None if name is None else str(name)
+
+
+class HistoryStore:
+    """Per-project sprint and weekly series in a sqlite file.
+
+    Each record_* call is one short write transaction, so portfolio
+    workers can share the file. `close()` (or leaving the `with` block)
+    trims each touched project to `keep` rows.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, keep: int = DEFAULT_KEEP, window: int = DEFAULT_WINDOW):
+        import sqlite3
+
+        self.path = os.path.expanduser(path)
+        self.keep = keep
+        self.window = window
+        self.touched = set()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS sprints ("
+            " project TEXT, sprint TEXT, seq REAL, committed REAL, completed REAL, scope_rate REAL,"
+            " schedule TEXT, scope TEXT, resource TEXT, quality TEXT, recorded REAL,"
+            " PRIMARY KEY (project, sprint))"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS sprints_order ON sprints (project, seq)")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS weeks ("
+            " project TEXT, week TEXT, bugs INTEGER, recorded REAL, PRIMARY KEY (project, week))"
+        )
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # -- writing -----------------------------------------------------------
+
+    def _transaction(self):
+        """Take the write lock now, so read-then-insert is atomic across processes; commits on exit."""
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def _place(self, project: str, labels: List[str]) -> None:
+        """Give sprints in `labels` (oldest first) that are not stored yet a row and seq.
+
+        New sprints slot in between the stored ones around them in
+        `labels`, so back-filling older history keeps the order.
+        """
+        stored = dict(self.db.execute(
+            f"SELECT sprint, seq FROM sprints WHERE project = ? AND sprint IN ({','.join('?' * len(labels))})",
+            [project] + labels,
+        ))
+        now = time.time()
+        i = 0
+        while i < len(labels):
+            if labels[i] in stored:
+                i += 1
+                continue
+            j = i
+            while j < len(labels) and labels[j] not in stored:
+                j += 1
+            run = labels[i:j]
+            lo = stored[labels[i - 1]] if i > 0 else None
+            hi = stored[labels[j]] if j < len(labels) else None
+            if lo is None and hi is None:
+                lo = self.db.execute("SELECT MAX(seq) FROM sprints WHERE project = ?", (project,)).fetchone()[0] or 0.0
+            elif hi is None:
+                hi = self.db.execute("SELECT MIN(seq) FROM sprints WHERE project = ? AND seq > ?",
+                                     (project, lo)).fetchone()[0]
+            elif lo is None:
+                lo = self.db.execute("SELECT MAX(seq) FROM sprints WHERE project = ? AND seq < ?",
+                                     (project, hi)).fetchone()[0]
+                if lo is None:
+                    lo = hi - len(run) - 1
+            step = 1.0 if hi is None else (hi - lo) / (len(run) + 1)
+            for k, label in enumerate(run, 1):
+                stored[label] = lo + k * step
+                self.db.execute("INSERT INTO sprints (project, sprint, seq, recorded) VALUES (?, ?, ?, ?)",
+                                (project, label, stored[label], now))
+            i = j
+
+    def _update(self, project: str, column: str, pairs: list) -> None:
+        now = time.time()
+        self.db.executemany(
+            f"UPDATE sprints SET {column} = ?, recorded = ? WHERE project = ? AND sprint = ?",
+            [(value, now, project, label) for label, value in pairs],
+        )
+
+    def record_input(self, project: str, data: dict, today=None) -> None:
+        """Store the labelled series of a dashboard input.
+
+        velocity.committed/completed and scope_creep.sprint_rates are matched
+        to velocity.sprints from the newest end, risk_history to the labels
+        before the current sprint; bug_trend.weekly_counts end at the week of
+        `today` (generated_at's date, else today).
+        """
+        from datetime import date, datetime, timedelta
+
+        self.touched.add(project)
+        with self._transaction():
+            velocity = data.get("velocity") or {}
+            labels = [str(s) for s in velocity.get("sprints") or ()]
+            if labels:
+                self._place(project, labels)
+                self._update(project, "committed", _tail(labels, velocity.get("committed") or []))
+                self._update(project, "completed", _tail(labels, velocity.get("completed") or []))
+                self._update(project, "scope_rate", _tail(labels, (data.get("scope_creep") or {}).get("sprint_rates") or []))
+                current = current_sprint(data)
+                prior = [label for label in labels if label != current]
+                for category, levels in (data.get("risk_history") or {}).items():
+                    if category in RISK_CATEGORIES:
+                        self._update(project, category, _tail(prior, levels or []))
+
+            counts = (data.get("bug_trend") or {}).get("weekly_counts") or []
+            if counts:
+                if today is None:
+                    try:
+                        today = datetime.fromisoformat(str(data.get("generated_at"))[:10]).date()
+                    except ValueError:
+                        today = date.today()
+                now = time.time()
+                self.db.executemany(
+                    "INSERT INTO weeks (project, week, bugs, recorded) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT(project, week) DO UPDATE SET bugs = excluded.bugs, recorded = excluded.recorded",
+                    [(project, iso_week(today - timedelta(weeks=k)), count, now)
+                     for k, count in enumerate(reversed(counts))],
+                )
+
+    def record_risks(self, project: str, sprint: str, risks: dict) -> None:
+        """Store the risk level of each category for `sprint`."""
+        self.touched.add(project)
+        with self._transaction():
+            self._place(project, [sprint])
+            now = time.time()
+            self.db.execute(
+                "UPDATE sprints SET schedule = ?, scope = ?, resource = ?, quality = ?, recorded = ?"
+                " WHERE project = ? AND sprint = ?",
+                [risks[c]["level"] for c in RISK_CATEGORIES] + [now, project, sprint],
+            )
+
+    # -- reading -----------------------------------------------------------
+
+    def sprints(self, project: str, column: str, window: int, exclude: str = None) -> list:
+        """(sprint, value) of the newest `window` sprints with `column` set, oldest first."""
+        rows = self.db.execute(
+            f"SELECT sprint, {column} FROM sprints WHERE project = ? AND {column} IS NOT NULL"
+            " AND sprint IS NOT ? ORDER BY seq DESC LIMIT ?",
+            (project, exclude, window),
+        ).fetchall()
+        rows.reverse()
+        return rows
+
+    def velocity(self, project: str, window: int = DEFAULT_WINDOW) -> dict:
+        """velocity member ({sprints, committed, completed}) of the newest `window` sprints."""
+        rows = self.db.execute(
+            "SELECT sprint, committed, completed FROM sprints WHERE project = ? AND completed IS NOT NULL"
+            " ORDER BY seq DESC LIMIT ?",
+            (project, window),
+        ).fetchall()
+        rows.reverse()
+        return {
+            "sprints": [r[0] for r in rows],
+            "committed": [_number(r[1]) if r[1] is not None else 0 for r in rows],
+            "completed": [_number(r[2]) for r in rows],
+        }
+
+    def risk_history(self, project: str, window: int = DEFAULT_WINDOW, exclude: str = None) -> dict:
+        """risk_history member: levels per category of the newest `window` sprints other than `exclude`."""
+        rows = self.db.execute(
+            "SELECT schedule, scope, resource, quality FROM sprints WHERE project = ? AND schedule IS NOT NULL"
+            " AND sprint IS NOT ? ORDER BY seq DESC LIMIT ?",
+            (project, exclude, window),
+        ).fetchall()
+        rows.reverse()
+        return {c: [r[i] for r in rows] for i, c in enumerate(RISK_CATEGORIES)}
+
+    def weekly_bugs(self, project: str, window: int = DEFAULT_WINDOW) -> list:
+        """Bug counts of the newest `window` recorded weeks, oldest first."""
+        rows = self.db.execute(
+            "SELECT bugs FROM weeks WHERE project = ? ORDER BY week DESC LIMIT ?", (project, window)
+        ).fetchall()
+        return [r[0] for r in reversed(rows)]
+
+    def merge(self, project: str, data: dict, window: int = None) -> dict:
+        """Record `data`'s series, then return a copy with them extended from the store.
+
+        Each series holds up to `window` points (the store's window by
+        default; more if the input has more). A series the input leaves out
+        is filled from the store too, unless it has values but no sprint
+        labels to match them to. An input risk_history is kept as given;
+        otherwise it is read from the sprints other than the current one
+        (see current_sprint).
+        """
+        window = window or self.window
+        self.record_input(project, data)
+        merged = dict(data)
+        velocity = data.get("velocity") or {}
+        labels = velocity.get("sprints") or []
+        if labels or not velocity.get("completed"):
+            stored = self.velocity(project, max(window, len(labels)))
+            if stored["sprints"]:
+                merged["velocity"] = dict(velocity, **stored)
+        scope = data.get("scope_creep") or {}
+        rates = scope.get("sprint_rates") or []
+        if labels or not rates:
+            stored_rates = self.sprints(project, "scope_rate", max(window, len(rates)))
+            if stored_rates:
+                merged["scope_creep"] = dict(scope, sprint_rates=[r for _, r in stored_rates])
+        bugs = data.get("bug_trend") or {}
+        weekly = self.weekly_bugs(project, max(window, len(bugs.get("weekly_counts") or ())))
+        if weekly:
+            merged["bug_trend"] = dict(bugs, weekly_counts=weekly)
+        if "risk_history" not in data:
+            merged["risk_history"] = self.risk_history(project, window, current_sprint(data))
+        return merged
+
+    # -- maintenance -------------------------------------------------------
+
+    def trim(self, project: str) -> int:
+        """Drop rows of `project` beyond its newest `keep` sprints and weeks; returns rows dropped."""
+        dropped = self.db.execute(
+            "DELETE FROM sprints WHERE project = ? AND seq < (SELECT MIN(seq) FROM"
+            " (SELECT seq FROM sprints WHERE project = ? ORDER BY seq DESC LIMIT ?))",
+            (project, project, self.keep),
+        ).rowcount
+        dropped += self.db.execute(
+            "DELETE FROM weeks WHERE project = ? AND week < (SELECT MIN(week) FROM"
+            " (SELECT week FROM weeks WHERE project = ? ORDER BY week DESC LIMIT ?))",
+            (project, project, self.keep),
+        ).rowcount
+        return dropped
+
+    def compact(self) -> int:
+        """Trim every project to `keep` rows and rebuild the file; returns rows dropped."""
+        projects = [r[0] for r in self.db.execute("SELECT DISTINCT project FROM sprints UNION SELECT project FROM weeks")]
+        dropped = sum(self.trim(p) for p in projects)
+        self.db.commit()
+        self.db.execute("VACUUM")
+        return dropped
+
+    def projects(self) -> Dict[str, Dict[str, int]]:
+        """{project: {"sprints": n, "weeks": n}}."""
+        result: Dict[str, Dict[str, int]] = {}
+        for table in ("sprints", "weeks"):
+            for project, count in self.db.execute(f"SELECT project, COUNT(*) FROM {table} GROUP BY project"):
+                result.setdefault(project, {"sprints": 0, "weeks": 0})[table] = count
+        return result
+
+    def close(self) -> None:
+        """Trim touched projects and close."""
+        if self.touched:
+            with self._transaction():
+                for project in self.touched:
+                    self.trim(project)
+        self.touched.clear()
+        self.db.close()
+
+
+def _number(value: Optional[float]):
+    """Stored REAL back to int where it is whole (story points are usually integers)."""
+    return int(value) if value is not None and float(value).is_integer() else value
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> int:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Inspect or compact the dashboard history store")
+    parser.add_argument("--db", default=DEFAULT_PATH, help=f"History file (default: {DEFAULT_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    show = sub.add_parser("show", help="Print a project's stored series as dashboard JSON members (or list projects)")
+    show.add_argument("project", nargs="?")
+    show.add_argument("--window", type=int, default=DEFAULT_WINDOW, help=f"Sprints/weeks (default: {DEFAULT_WINDOW})")
+    compact = sub.add_parser("compact", help="Keep the newest N sprints/weeks per project and rebuild the file")
+    compact.add_argument("--keep", type=int, default=DEFAULT_KEEP, help=f"Rows kept per project (default: {DEFAULT_KEEP})")
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.expanduser(args.db)):
+        sys.stderr.write(f"Error: no history at {args.db}\n")
+        return 1
+    if args.command == "compact":
+        with HistoryStore(args.db, args.keep) as store:
+            dropped = store.compact()
+        print(f"Dropped {dropped} rows; {os.path.getsize(os.path.expanduser(args.db)) / 1024:.1f} KB")
+        return 0
+
+    with HistoryStore(args.db) as store:
+        if not args.project:
+            for project, counts in sorted(store.projects().items()):
+                print(f"{project:<16} {counts['sprints']:>5} sprints {counts['weeks']:>5} weeks")
+            return 0
+        result = {
+            "velocity": store.velocity(args.project, args.window),
+            "scope_creep": {"sprint_rates": [r for _, r in store.sprints(args.project, "scope_rate", args.window)]},
+            "bug_trend": {"weekly_counts": store.weekly_bugs(args.project, args.window)},
+            "risk_history": store.risk_history(args.project, args.window),
+        }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,242 @@
+"""JSON codec shared by the pack scripts.
+
+JSON decoding dominates the profile on large exports, so the codec moves
+to the first importable of orjson and msgspec once FAST_AFTER bytes have
+gone through it. Until then the stdlib json module is used: importing
+orjson costs ~15 ms, more than it saves on a single issue.
+$JIRA_PACK_JSON (orjson, msgspec or json) forces a choice from the start.
+
+- loads(data): str, bytes, bytearray, memoryview or mmap
+- load(fp), load_path(path): a whole document, read as bytes; files of
+  MMAP_MIN bytes or more are mapped instead of read
+- dumps(value, indent=None, sort_keys=False): the text json.dumps gives with
+  ensure_ascii=False and compact separators (or `indent`)
+
+dumps() returns the same text on every backend, so packed markdown and
+dashboard HTML do not depend on what is installed. The fast encoders
+differ from the stdlib only in floats it writes in exponent form (1e+16,
+1e-05), so fast output that may hold one is re-encoded by the stdlib, as
+is anything a fast encoder rejects (non-string keys, integers past 64
+bits). NaN and Infinity are not JSON: the fast backends refuse them on
+input and write them as null. orjson reads integers past 64 bits as
+floats; Jira sends ids as strings, so none reach it.
+
+Cyclic GC is paused while a document of GC_PAUSE_MIN bytes or more is
+decoded. Building a large object graph otherwise sets off repeated full
+collections that each traverse it, which costs more than the parse.
+"""
+
+import gc
+import json
+import os
+import re
+from contextlib import contextmanager
+from typing import Any, Callable, IO, Iterator, Optional
+
+BACKEND_ENV = "JIRA_PACK_JSON"
+BACKENDS = ("orjson", "msgspec", "json")
+FAST_AFTER = 1 << 20
+MMAP_MIN = 1 << 20
+GC_PAUSE_MIN = 1 << 16
+
+# Where a fast encoder's float can differ from the stdlib's: 1e16, 1e-5 and 0.00001.
+# Searched separately; a leading literal keeps the regex scan fast.
+_EXPONENT = re.compile(rb"e[-+]?\d")
+_SMALL = b"0.0000"
+_DIGITS = frozenset(b"0123456789")
+_NUMBER_BYTES = frozenset(b"0123456789.+-eE")
+# Bytes that can precede a number token in compact or indented output
+_VALUE_START = frozenset(b"[:, \n")
+
+BACKEND = "json"
+_decode: Callable[[Any], Any] = json.loads
+_encode: Optional[Callable[[Any, Optional[int], bool], Optional[bytes]]] = None
+# Bytes decoded or encoded while the choice is pending; None once it is made
+_volume: Optional[int] = 0
+
+
+def _stdlib_decode(data: Any) -> Any:
+    if not isinstance(data, (str, bytes, bytearray)):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def _orjson_codec():
+    import orjson
+
+    passthrough = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def encode(value: Any, indent: Optional[int], sort_keys: bool) -> Optional[bytes]:
+        if indent not in (None, 2):
+            return None
+        option = passthrough
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(value, option=option)
+
+    return orjson.loads, encode
+
+
+def _msgspec_codec():
+    import msgspec
+
+    decoder = msgspec.json.Decoder()
+    encoders = {False: msgspec.json.Encoder(), True: msgspec.json.Encoder(order="sorted")}
+
+    def decode(data: Any) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            # Callers catch json.JSONDecodeError whatever the backend
+            raise json.JSONDecodeError(str(e), "", 0) from None
+
+    def encode(value: Any, indent: Optional[int], sort_keys: bool) -> Optional[bytes]:
+        data = encoders[sort_keys].encode(value)
+        return msgspec.json.format(data, indent=indent) if indent is not None else data
+
+    return decode, encode
+
+
+def set_backend(name: Optional[str] = None) -> str:
+    """Switch to backend `name`, or the first importable one; returns the name in use.
+
+    Raises ValueError for an unknown name and ImportError when the named
+    backend is not installed.
+    """
+    global BACKEND, _decode, _encode, _volume
+
+    _volume = None
+    if name is not None and name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend {name!r} (expected one of {', '.join(BACKENDS)})")
+    for candidate in (name,) if name else BACKENDS:
+        if candidate == "json":
+            BACKEND, _decode, _encode = "json", _stdlib_decode, None
+            return BACKEND
+        try:
+            codec = _orjson_codec() if candidate == "orjson" else _msgspec_codec()
+        except ImportError:
+            if name:
+                raise
+            continue
+        BACKEND, (_decode, _encode) = candidate, codec
+        return BACKEND
+    return BACKEND
+
+
+def available_backends() -> list:
+    """Backends importable here, in preference order."""
+    import importlib.util
+
+    return [name for name in BACKENDS if name == "json" or importlib.util.find_spec(name) is not None]
+
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """Disable cyclic GC for the block, restoring its previous state."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _account(size: int) -> None:
+    """Count `size` towards FAST_AFTER, choosing the backend once it is reached."""
+    global _volume
+
+    _volume += size
+    if _volume >= FAST_AFTER:
+        _select_from_env()
+
+
+def loads(data: Any) -> Any:
+    """Decode one JSON document from text or any bytes-like object."""
+    size = len(data)
+    if _volume is not None:
+        _account(size)
+    if size < GC_PAUSE_MIN:
+        return _decode(data)
+    with gc_paused():
+        return _decode(data)
+
+
+def load(fp: IO) -> Any:
+    """Decode the rest of `fp`; text streams such as stdin are read through their byte buffer."""
+    buffer = getattr(fp, "buffer", None)
+    return loads(buffer.read() if buffer is not None else fp.read())
+
+
+def load_path(path: str) -> Any:
+    """Decode the JSON file at `path`, mapping it into memory when large."""
+    import mmap
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN:
+            return loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return loads(view)
+
+
+def _starts_value(data: bytes, pos: int) -> bool:
+    """True if the number-like run around `pos` begins where a JSON value can."""
+    while pos and data[pos - 1] in _NUMBER_BYTES:
+        pos -= 1
+    return not pos or data[pos - 1] in _VALUE_START
+
+
+def _may_differ(data: bytes) -> bool:
+    """True if fast output may hold a float the stdlib formats differently.
+
+    Each candidate is traced back to the start of its token; one that starts
+    a value (rather than sitting inside a string such as a hash or a rank) is
+    taken to be a float. Strings that merely look like one only cost a
+    re-encode.
+    """
+    for match in _EXPONENT.finditer(data):
+        pos = match.start()
+        if pos and data[pos - 1] in _DIGITS and _starts_value(data, pos):
+            return True
+    pos = data.find(_SMALL)
+    while pos != -1:
+        if _starts_value(data, pos):
+            return True
+        pos = data.find(_SMALL, pos + 1)
+    return False
+
+
+def dumps(value: Any, indent: Optional[int] = None, sort_keys: bool = False) -> str:
+    """json.dumps(value, ensure_ascii=False, ...) text: compact separators, or `indent`."""
+    if _encode is not None:
+        try:
+            data = _encode(value, indent, sort_keys)
+        except (TypeError, ValueError, OverflowError):
+            data = None
+        if data is not None and not _may_differ(data):
+            return data.decode("utf-8")
+    if indent is None:
+        text = json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+    else:
+        text = json.dumps(value, ensure_ascii=False, indent=indent, sort_keys=sort_keys)
+    if _volume is not None:
+        _account(len(text))
+    return text
+
+
+def _select_from_env() -> None:
+    """Apply $JIRA_PACK_JSON, falling back to the first importable backend with a warning."""
+    name = os.environ.get(BACKEND_ENV) or None
+    try:
+        set_backend(name)
+    except (ImportError, ValueError) as e:
+        import sys
+
+        sys.stderr.write(f"Warning: ignoring ${BACKEND_ENV}={name} ({e}); using {set_backend()}\n")
+
+
+if os.environ.get(BACKEND_ENV):
+    _volume = FAST_AFTER
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""Dashboard metrics derived from one raw Jira search export.
+
+Usage:
+    python jira_metrics.py export.ndjson --ndjson --project PROJ > metrics.json
+    python jira_metrics.py export.json --now 2026-01-23 --merge agent_notes.json
+    python jira_metrics.py --fields-param
+
+Replaces the dozen counting queries of the dashboard builder guide (Phases
+A-C) with one export of the project, `expand=changelog` optional. Issues are
+read one at a time (jira_stream) and folded into counters, so memory grows
+with the number of assignees, sprints, epics and weeks, not with the export.
+The output has the metrics.json shape pack_dashboard.build_dashboard reads:
+
+    sprint          the active sprint: dates, day/totalDays (weekdays) and
+                    issues {total, done, inProgress, todo, blocked, unassigned}
+    velocity        committed/completed issue counts of the last sprints
+    issues          totals and counts by status, priority and type
+    bug_trend       bugs created per week, open high-priority bugs
+    scope_creep     share of each sprint's issues added after it started
+    resource        max_wip and in-progress count per assignee
+    epics           total/done per epic
+    attention_items overdue and blocked issues, most urgent first
+
+risk_history, strategic_insights and the dependency members cannot come from
+a single export; --merge FILE (or pack_dashboard.py --export) layers them on.
+
+Sprint membership is read from the sprint custom field (Cloud objects or
+Server "...Sprint@1a2b[id=..,state=..]" strings); which customfield_* holds
+the sprint, epic link, epic name and flag comes from the normalize_fields field map
+(--map), and already-normalized exports work as is. With a changelog an
+issue counts as added mid-sprint when its Sprint field gained the sprint
+after the sprint started, and blocked time runs from the last status
+change; without one, the created and updated timestamps stand in.
+"""
+
+import heapq
+import json
+import re
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, IO, Iterable, List, Optional, Tuple
+
+from jira_fields import compile_path
+
+DONE, IN_PROGRESS, TODO = "done", "indeterminate", "new"
+# Status names counted as blocked (besides the "blocked" label and the flag field)
+BLOCKED_STATUSES = frozenset(["blocked", "on hold", "impeded"])
+BLOCKED_LABELS = frozenset(["blocked"])
+HIGH_PRIORITIES = frozenset(["highest", "high", "blocker", "critical"])
+BUG_TYPES = frozenset(["bug", "defect"])
+EPIC_TYPES = frozenset(["epic"])
+# Status names used when an export has no statusCategory
+DONE_STATUSES = frozenset(["done", "closed", "resolved", "cancelled", "canceled"])
+TODO_STATUSES = frozenset(["to do", "open", "backlog", "new", "selected for development"])
+
+VELOCITY_SPRINTS = 6
+BUG_WEEKS = 6
+ATTENTION_MAX = 10
+EPICS_MAX = 12
+
+# Paths read from every issue, besides the mapped custom fields
+METRICS_FIELDS = [
+    "key",
+    "fields.summary",
+    "fields.status.name",
+    "fields.status.statusCategory.key",
+    "fields.priority.name",
+    "fields.issuetype.name",
+    "fields.assignee.displayName",
+    "fields.created",
+    "fields.updated",
+    "fields.duedate",
+    "fields.labels",
+    "fields.parent",
+    "changelog",
+]
+# Friendly names (normalize_fields map values) of the custom fields used
+MAPPED_FIELDS = ("sprint", "epic_link", "epic_name", "flagged")
+
+_KEY = compile_path("key")
+_FIELDS = compile_path("fields")
+_STATUS_NAME = compile_path("status.name")
+_STATUS_CATEGORY = compile_path("status.statusCategory.key")
+_PRIORITY = compile_path("priority.name")
+_TYPE = compile_path("issuetype.name")
+_ASSIGNEE = compile_path("assignee.displayName")
+_PARENT_KEY = compile_path("parent.key")
+_PARENT_TYPE = compile_path("parent.fields.issuetype.name")
+_PARENT_SUMMARY = compile_path("parent.fields.summary")
+_HISTORIES = compile_path("changelog.histories")
+
+_SERVER_SPRINT = re.compile(r"(\w+)=([^,\]]*)")
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    """Jira or ISO timestamp as an aware datetime (UTC if no offset); None if unparsable."""
+    if not isinstance(value, str) or len(value) < 10:
+        return None
+    text = value.replace("Z", "+00:00")
+    if len(text) > 5 and text[-5] in "+-" and text[-3] != ":":
+        text = text[:-2] + ":" + text[-2:]  # +0800 -> +08:00
+    try:
+        t = datetime.fromisoformat(text)
+    except ValueError:
+        try:
+            t = datetime.fromisoformat(text[:10])
+        except ValueError:
+            return None
+    return t if t.tzinfo else t.replace(tzinfo=timezone.utc)
+
+
+def _day(value: Any) -> Optional[date]:
+    """The calendar date of a timestamp or YYYY-MM-DD string."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+def weekdays_between(start: date, end: date) -> int:
+    """Mon-Fri days in [start, end)."""
+    if end <= start:
+        return 0
+    days = (end - start).days
+    weeks, extra = divmod(days, 7)
+    count = weeks * 5
+    first = start.weekday()
+    for d in range(extra):
+        if (first + d) % 7 < 5:
+            count += 1
+    return count
+
+
+def _category(fields: Dict[str, Any]) -> str:
+    """Status category key, inferred from the status name when missing."""
+    category = _STATUS_CATEGORY(fields)
+    if category in (DONE, IN_PROGRESS, TODO):
+        return category
+    name = (_STATUS_NAME(fields) or "").lower()
+    if name in DONE_STATUSES:
+        return DONE
+    if name in TODO_STATUSES:
+        return TODO
+    return IN_PROGRESS
+
+
+def parse_sprint(value: Any) -> Optional[Dict[str, Any]]:
+    """One sprint field entry (Cloud object or Server string) as {id, name, state, start, end}."""
+    if isinstance(value, str):
+        attrs = dict(_SERVER_SPRINT.findall(value))
+        if "id" not in attrs:
+            return None
+        value = attrs
+    if not isinstance(value, dict) or value.get("id") in (None, ""):
+        return None
+    return {
+        "id": str(value["id"]),
+        "name": value.get("name") or f"Sprint {value['id']}",
+        "state": str(value.get("state") or "").lower(),
+        "start": _timestamp(value.get("startDate")),
+        "end": _timestamp(value.get("endDate")),
+    }
+
+
+class _Sprint:
+    """Counters for one sprint."""
+
+    __slots__ = ("id", "name", "state", "start", "end", "committed", "added", "completed", "status")
+
+    def __init__(self, info: Dict[str, Any]):
+        self.id = info["id"]
+        self.name = info["name"]
+        self.state = info["state"]
+        self.start = info["start"]
+        self.end = info["end"]
+        self.committed = 0  # in the sprint when it started
+        self.added = 0      # joined after it started
+        self.completed = 0  # done with this as their last sprint
+        # total/done/inProgress/todo/blocked/unassigned; filled for active sprints only
+        self.status = dict.fromkeys(("total", "done", "inProgress", "todo", "blocked", "unassigned"), 0)
+
+
+class MetricsAggregator:
+    """Folds issues into dashboard metrics one at a time; see the module docstring."""
+
+    def __init__(self, now: Optional[date] = None, field_map: Optional[Dict[str, str]] = None,
+                 project: Optional[str] = None, sprint: Optional[str] = None,
+                 weeks: int = BUG_WEEKS, velocity_sprints: int = VELOCITY_SPRINTS):
+        self.now = now or datetime.now(timezone.utc).date()
+        self.project = project
+        self.sprint = sprint
+        self.weeks = weeks
+        self.velocity_sprints = velocity_sprints
+        # friendly name -> field ids holding it (raw customfield_* and the normalized name)
+        self.field_ids: Dict[str, List[str]] = {name: [name] for name in MAPPED_FIELDS}
+        for field_id, name in (field_map or {}).items():
+            if name in self.field_ids:
+                self.field_ids[name].insert(0, field_id)
+
+        self.total = self.done = 0
+        self.by_status: Dict[str, int] = {}
+        self.by_priority: Dict[str, int] = {}
+        self.by_type: Dict[str, int] = {}
+        self.bug_weeks = [0] * weeks
+        self.high_priority_bugs = 0
+        self.wip: Dict[str, int] = {}
+        self.sprints: Dict[str, _Sprint] = {}
+        self.epics: Dict[str, List[Any]] = {}  # key -> [name, total, done]
+        self.attention: List[Tuple[tuple, int, Dict[str, Any]]] = []  # min-heap of the most urgent
+        self.seen = 0
+        self.first_key: Optional[str] = None
+
+    def _mapped(self, fields: Dict[str, Any], name: str) -> Any:
+        for field_id in self.field_ids[name]:
+            value = fields.get(field_id)
+            if value is not None:
+                return value
+        return None
+
+    def add(self, issue: Dict[str, Any]) -> None:
+        """Fold one raw (or normalized) issue into the counters."""
+        fields = _FIELDS(issue)
+        if not isinstance(fields, dict):
+            return
+        key = _KEY(issue) or ""
+        self.seen += 1
+        if self.first_key is None and key:
+            self.first_key = key
+
+        category = _category(fields)
+        done = category == DONE
+        status_name = _STATUS_NAME(fields) or "Unknown"
+        priority = _PRIORITY(fields) or "None"
+        itype = _TYPE(fields) or "Unknown"
+        assignee = _ASSIGNEE(fields)
+        labels = fields.get("labels") or ()
+        blocked = not done and (status_name.lower() in BLOCKED_STATUSES
+                                or any(str(label).lower() in BLOCKED_LABELS for label in labels)
+                                or bool(self._mapped(fields, "flagged")))
+        histories = _HISTORIES(issue)
+
+        self.total += 1
+        self.done += done
+        self.by_status[status_name] = self.by_status.get(status_name, 0) + 1
+        self.by_priority[priority] = self.by_priority.get(priority, 0) + 1
+        self.by_type[itype] = self.by_type.get(itype, 0) + 1
+
+        if category == IN_PROGRESS and assignee:
+            self.wip[assignee] = self.wip.get(assignee, 0) + 1
+
+        if itype.lower() in BUG_TYPES:
+            created = _day(fields.get("created"))
+            if created is not None:
+                week = (self.now - created).days // 7
+                if 0 <= week < self.weeks:
+                    self.bug_weeks[self.weeks - 1 - week] += 1
+            if not done and priority.lower() in HIGH_PRIORITIES:
+                self.high_priority_bugs += 1
+
+        self._add_epic(key, fields, itype, done)
+        self._add_sprints(fields, histories, category, blocked, assignee)
+        self._add_attention(key, fields, priority, blocked, done, status_name, histories)
+
+    def _add_epic(self, key: str, fields: Dict[str, Any], itype: str, done: bool) -> None:
+        epic_name = self._mapped(fields, "epic_name")
+        if itype.lower() in EPIC_TYPES or isinstance(epic_name, str):
+            entry = self.epics.setdefault(key, [None, 0, 0])
+            entry[0] = epic_name or fields.get("summary") or entry[0]
+            return
+        epic = self._mapped(fields, "epic_link")
+        name = None
+        if not isinstance(epic, str) and (_PARENT_TYPE(fields) or "").lower() in EPIC_TYPES:
+            epic, name = _PARENT_KEY(fields), _PARENT_SUMMARY(fields)
+        if not isinstance(epic, str) or not epic:
+            return
+        entry = self.epics.setdefault(epic, [None, 0, 0])
+        entry[0] = entry[0] or name
+        entry[1] += 1
+        entry[2] += done
+
+    def _sprint_joins(self, histories: Any) -> Dict[str, Optional[datetime]]:
+        """Sprint id -> when the issue's Sprint field first gained it, from the changelog."""
+        joins: Dict[str, Optional[datetime]] = {}
+        for history in histories or ():
+            for item in history.get("items") or ():
+                if str(item.get("field", "")).lower() != "sprint":
+                    continue
+                before = set(str(item.get("from") or "").replace(" ", "").split(","))
+                for sprint_id in str(item.get("to") or "").replace(" ", "").split(","):
+                    if sprint_id and sprint_id not in before and sprint_id not in joins:
+                        joins[sprint_id] = _timestamp(history.get("created"))
+        return joins
+
+    def _add_sprints(self, fields: Dict[str, Any], histories: Any, category: str,
+                     blocked: bool, assignee: Optional[str]) -> None:
+        values = self._mapped(fields, "sprint")
+        if not values:
+            return
+        infos = [s for s in map(parse_sprint, values if isinstance(values, list) else [values]) if s]
+        if not infos:
+            return
+        created = _timestamp(fields.get("created"))
+        joins = self._sprint_joins(histories) if histories else {}
+        last = max(infos, key=lambda s: s["start"] or datetime.max.replace(tzinfo=timezone.utc))
+        for info in infos:
+            sprint = self.sprints.get(info["id"])
+            if sprint is None:
+                sprint = self.sprints[info["id"]] = _Sprint(info)
+            joined = joins.get(info["id"], created)
+            if sprint.start is not None and joined is not None and joined > sprint.start:
+                sprint.added += 1
+            else:
+                sprint.committed += 1
+            if category == DONE and info is last:
+                sprint.completed += 1
+            if sprint.state == "active" or info["name"] == self.sprint or info["id"] == self.sprint:
+                status = sprint.status
+                status["total"] += 1
+                status[{DONE: "done", IN_PROGRESS: "inProgress", TODO: "todo"}[category]] += 1
+                status["blocked"] += blocked
+                status["unassigned"] += not assignee
+
+    def _add_attention(self, key: str, fields: Dict[str, Any], priority: str, blocked: bool,
+                       done: bool, status_name: str, histories: Any) -> None:
+        if done:
+            return
+        due = _day(fields.get("duedate"))
+        overdue = (self.now - due).days if due is not None and due < self.now else 0
+        if not blocked and not overdue:
+            return
+        blocked_days = 0
+        if blocked:
+            since = _day(fields.get("updated"))
+            for history in histories or ():
+                for item in history.get("items") or ():
+                    if item.get("field") == "status" and item.get("toString") == status_name:
+                        since = _day(history.get("created")) or since
+            blocked_days = (self.now - since).days if since else 0
+        high = priority.lower() in HIGH_PRIORITIES
+        reasons = []
+        if blocked:
+            reasons.append(f"Blocked {blocked_days} 天")
+        if overdue:
+            reasons.append(f"逾期 {overdue} 天")
+        item = {
+            "key": key,
+            "summary": fields.get("summary") or "",
+            "reason": "，".join(reasons),
+            "impact": "high" if high or blocked_days >= 5 or overdue >= 7 else "medium",
+            "action": ("排除阻塞或升級處理" if blocked
+                       else "重新評估期限或縮減範圍"),
+        }
+        rank = (high, blocked and overdue > 0, max(blocked_days, overdue))
+        entry = (rank, -self.seen, item)
+        if len(self.attention) < ATTENTION_MAX:
+            heapq.heappush(self.attention, entry)
+        elif entry > self.attention[0]:
+            heapq.heapreplace(self.attention, entry)
+
+    def _active_sprint(self) -> Optional[_Sprint]:
+        sprints = list(self.sprints.values())
+        if self.sprint:
+            chosen = [s for s in sprints if self.sprint in (s.id, s.name)]
+        else:
+            chosen = [s for s in sprints if s.state == "active"]
+        if not chosen:
+            return None
+        return max(chosen, key=lambda s: (s.status["total"], s.start or datetime.min.replace(tzinfo=timezone.utc)))
+
+    def result(self) -> Dict[str, Any]:
+        """The metrics.json document for everything added so far."""
+        now = self.now
+        active = self._active_sprint()
+        closed = sorted((s for s in self.sprints.values() if s.state == "closed" and s.start is not None
+                         and (active is None or active.start is None or s.start < active.start)),
+                        key=lambda s: s.start)
+        keep = self.velocity_sprints - (active is not None)
+        history = closed[-keep:] if keep > 0 else []
+        if active is not None:
+            history.append(active)
+
+        project_key = self.project or (self.first_key or "").rsplit("-", 1)[0]
+        result: Dict[str, Any] = {
+            "project": {"key": project_key, "name": project_key},
+            "generated_at": datetime.combine(now, datetime.min.time()).isoformat(),
+            "date_range": f"{now - timedelta(days=7 * self.weeks)} ~ {now}",
+        }
+        if active is not None:
+            sprint: Dict[str, Any] = {"name": active.name}
+            if active.start is not None and active.end is not None:
+                start, end = active.start.date(), active.end.date()
+                sprint["startDate"] = start.isoformat()
+                sprint["endDate"] = end.isoformat()
+                sprint["totalDays"] = max(weekdays_between(start, end), 1)
+                sprint["day"] = min(weekdays_between(start, now + timedelta(days=1)), sprint["totalDays"])
+            sprint["issues"] = dict(active.status)
+            result["sprint"] = sprint
+        result["velocity"] = {
+            "sprints": [s.name for s in history],
+            "committed": [s.committed + s.added for s in history],
+            "completed": [s.completed for s in history],
+        }
+        result["issues"] = {
+            "total": self.total,
+            "done": self.done,
+            "active": self.total - self.done,
+            "by_status": self.by_status,
+            "by_priority": self.by_priority,
+            "by_type": self.by_type,
+        }
+        result["bug_trend"] = {"weekly_counts": self.bug_weeks, "high_priority_open": self.high_priority_bugs}
+        rates = [round(s.added / (s.committed + s.added), 2) if s.committed + s.added else 0.0 for s in history]
+        result["scope_creep"] = {"current_rate": rates[-1] if active is not None and rates else 0.0,
+                                 "sprint_rates": rates}
+        wip = sorted(self.wip.items(), key=lambda kv: (-kv[1], kv[0]))
+        result["resource"] = {"max_wip": wip[0][1] if wip else 0, "wip_by_assignee": dict(wip)}
+        epics = sorted(self.epics.items(), key=lambda kv: (-kv[1][1], kv[0]))
+        result["epics"] = [{"name": name or key, "total": total, "done": done, "key": key}
+                           for key, (name, total, done) in epics if total][:EPICS_MAX]
+        result["attention_items"] = [item for _, _, item in sorted(self.attention, reverse=True)]
+        return result
+
+
+def aggregate(issues: Iterable[Dict[str, Any]], **options: Any) -> Dict[str, Any]:
+    """Metrics for an iterable of issues; `options` go to MetricsAggregator."""
+    aggregator = MetricsAggregator(**options)
+    for issue in issues:
+        aggregator.add(issue)
+    return aggregator.result()
+
+
+def aggregate_export(fp: IO[str], ndjson: bool = False, **options: Any) -> Dict[str, Any]:
+    """Metrics for a search envelope or NDJSON export, read one issue at a time."""
+    from jira_stream import iter_issues
+
+    return aggregate(iter_issues(fp, ndjson=ndjson), **options)
+
+
+def metrics_fields(field_map: Dict[str, str]) -> List[str]:
+    """METRICS_FIELDS plus the custom fields mapped to the names in MAPPED_FIELDS."""
+    return METRICS_FIELDS + [f"fields.{field_id}" for field_id, name in field_map.items() if name in MAPPED_FIELDS]
+
+
+def main() -> int:
+    """Main entry point."""
+    import argparse
+
+    from normalize_fields import load_field_map
+
+    parser = argparse.ArgumentParser(description="Derive dashboard metrics from a raw Jira search export")
+    parser.add_argument("file", nargs="?", help="Search export JSON (or stdin if omitted)")
+    parser.add_argument("--ndjson", action="store_true", help="Input is one issue per line")
+    parser.add_argument("--project", help="Project key for the dashboard (default: from the first issue key)")
+    parser.add_argument("--sprint", help="Sprint name or id to report (default: the active sprint)")
+    parser.add_argument("--now", help="Reference date YYYY-MM-DD for overdue/weeks/sprint day (default: today)")
+    parser.add_argument("--weeks", type=int, default=BUG_WEEKS, help=f"Weeks of bug trend (default: {BUG_WEEKS})")
+    parser.add_argument("--map", help="Field map JSON (normalize_fields format) locating sprint/epic_link/epic_name/flagged")
+    parser.add_argument("--merge", metavar="METRICS",
+                        help="Metrics JSON whose members override the derived ones (risk_history, insights, ...)")
+    parser.add_argument("--fields-param", action="store_true",
+                        help="Print the fields= value for the search API and exit")
+    args = parser.parse_args()
+
+    field_map = load_field_map(args.map)
+    if args.fields_param:
+        from jira_fields import fields_param
+
+        print(fields_param(metrics_fields(field_map)))
+        return 0
+
+    try:
+        now = date.fromisoformat(args.now) if args.now else None
+    except ValueError:
+        sys.stderr.write(f"Error: --now must be YYYY-MM-DD, got {args.now!r}\n")
+        return 1
+    options = {"now": now, "field_map": field_map, "project": args.project, "sprint": args.sprint,
+               "weeks": args.weeks}
+    try:
+        if args.file:
+            with open(args.file, "r", encoding="utf-8") as f:
+                result = aggregate_export(f, args.ndjson or args.file.endswith((".ndjson", ".jsonl")), **options)
+        else:
+            result = aggregate_export(sys.stdin, args.ndjson, **options)
+        if args.merge:
+            with open(args.merge, "r", encoding="utf-8") as f:
+                result.update(json.load(f))
+    except FileNotFoundError as e:
+        sys.stderr.write(f"Error: File not found: {e.filename}\n")
+        return 1
+    except json.JSONDecodeError as e:
+        sys.stderr.write(f"Error: Invalid JSON: {e}\n")
+        return 1
+
+    json.dump(result, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Single entry point for the Jira pack scripts.
+
+Usage:
+    python jira_pack.py issue issue.json > issue_packed.md
+    python jira_pack.py search search.json --max 20
+    python jira_pack.py dashboard --data metrics.json --output dashboard.html
+    python jira_pack.py normalize issue.json --map field_map.json
+    python jira_pack.py deps search.json > deps.json
+    python jira_pack.py metrics search.ndjson > metrics.json
+    python jira_pack.py git validate "PROJ-123 feat: add feature"
+
+Each command runs the matching script's main() in-process. Only the chosen
+command's module is imported, so `--help` and dispatch cost next to
+nothing and heavy imports happen only when a command needs them.
+When `jira_pack.py daemon start` is running, commands (whether run through
+jira-pack or as the scripts themselves) are forwarded to it over a Unix
+socket instead (see jira_daemon.py).
+Alias it as `jira-pack` (e.g. `alias jira-pack="python /path/to/scripts/jira_pack.py"`).
+"""
+
+import os
+import sys
+
+# command -> (module, one-line description)
+COMMANDS = {
+    "issue": ("pack_issue", "Pack a Jira issue JSON into compact markdown"),
+    "search": ("pack_search", "Pack Jira search results into a markdown table"),
+    "dashboard": ("pack_dashboard", "Generate the executive dashboard HTML"),
+    "normalize": ("normalize_fields", "Normalize customfield_* names"),
+    "deps": ("jira_deps", "Dependency graph (cycles, chains, SPOFs) from issue links"),
+    "metrics": ("jira_metrics", "Dashboard metrics derived from a raw search export"),
+    "history": ("jira_history", "Inspect or compact the dashboard sprint history store"),
+    "git": ("git_helpers", "Git <-> Jira helpers (validate/branch/mr-desc/...)"),
+    "daemon": ("jira_daemon", "Start/stop the local daemon that serves these commands"),
+}
+
+
+def socket_path() -> str:
+    """Daemon socket: $JIRA_PACK_SOCKET, else in a private per-user directory of the runtime dir."""
+    path = os.environ.get("JIRA_PACK_SOCKET")
+    if path:
+        return path
+    base = os.environ.get("XDG_RUNTIME_DIR") or "/tmp"
+    return os.path.join(base, f"jira-pack-{os.getuid()}", "daemon.sock")
+
+
+def usage() -> str:
+    """Top-level help text (built without argparse to keep startup minimal)."""
+    lines = ["usage: jira-pack <command> [args ...]", "", "commands:"]
+    for name, (_, desc) in COMMANDS.items():
+        lines.append(f"  {name:<10} {desc}")
+    lines.append("")
+    lines.append("Run `jira-pack <command> --help` for command options.")
+    return "\n".join(lines) + "\n"
+
+
+def run(command: str, argv: list) -> int:
+    """Import the command's module and run its main() with `argv`."""
+    import importlib
+
+    module_name = COMMANDS[command][0]
+    module = importlib.import_module(module_name)
+    saved = sys.argv
+    sys.argv = [f"jira-pack {command}"] + list(argv)
+    try:
+        rc = module.main()
+    except SystemExit as e:
+        rc = e.code
+    finally:
+        sys.argv = saved
+    if rc is None:
+        return 0
+    if isinstance(rc, str):
+        sys.stderr.write(rc + "\n")
+        return 1
+    return rc
+
+
+# Annotated as a string: importing typing would add to every command's startup
+def forward(command: str, argv: list) -> "int | None":
+    """Run `command` in the daemon if one may be listening; None means run it here.
+
+    Also called by the scripts' own entry points, so `python pack_issue.py
+    ...` is served by a running daemon just like `jira-pack issue ...`.
+    """
+    # Only a socket on disk means a daemon may be listening; otherwise skip
+    # importing the client altogether
+    if os.environ.get("JIRA_PACK_DAEMON", "1") == "0" or not os.path.exists(socket_path()):
+        return None
+    from jira_daemon import forward_cli
+
+    return forward_cli(command, argv)
+
+
+def main() -> int:
+    """Main entry point."""
+    args = sys.argv[1:]
+    if not args or args[0] in ("-h", "--help"):
+        sys.stdout.write(usage())
+        return 0
+    command = args[0]
+    if command not in COMMANDS:
+        sys.stderr.write(f"Error: unknown command '{command}'\n\n{usage()}")
+        return 2
+    if command != "daemon":
+        rc = forward(command, args[1:])
+        if rc is not None:
+            return rc
+    return run(command, args[1:])
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,223 @@
+"""Opt-in stage timing for the pack/normalize/dashboard scripts.
+
+Scripts mark their stages with `stage()`:
+
+    from jira_profile import stage
+
+    with stage("load"):
+        data = json.load(f)
+
+and wrap a run in `session()`. While no session is active (the default),
+`stage()` returns one shared no-op context manager, so the marks cost a
+function call each. A session starts when a script gets `--profile PATH`
+or JIRA_PACK_PROFILE=PATH is set, and records per stage:
+
+    wall time, CPU time (process), and the tracemalloc peak above the
+    stage's starting allocation (JIRA_PACK_PROFILE_MEMORY=0 skips
+    tracemalloc, which otherwise slows allocation-heavy stages 2-3x)
+
+PATH receives a Chrome trace-event JSON file (open it in
+chrome://tracing, Perfetto or speedscope); a per-stage summary goes to
+stderr. `--cprofile PATH` / JIRA_PACK_CPROFILE=PATH additionally runs the
+session under cProfile and writes pstats data to PATH
+(`python -m pstats PATH`).
+
+Only the current process is traced; pool workers (--jobs) are not.
+"""
+
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+PROFILE_ENV = "JIRA_PACK_PROFILE"
+CPROFILE_ENV = "JIRA_PACK_CPROFILE"
+MEMORY_ENV = "JIRA_PACK_PROFILE_MEMORY"
+
+
+class _NoStage:
+    """Shared do-nothing context manager returned while profiling is off."""
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+
+_NO_STAGE = _NoStage()
+_active = None  # Profiler of the running session, if any
+
+
+class _Stage:
+    """One timed block; records a Chrome trace "complete" (ph=X) event on exit."""
+
+    def __init__(self, profiler: "Profiler", name: str, args: Dict[str, Any]):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> None:
+        profiler = self.profiler
+        self.traced = self.peak = 0
+        if profiler.memory:
+            import tracemalloc
+
+            self.traced, peak = tracemalloc.get_traced_memory()
+            if profiler.stack:
+                # Bank the parent's peak before resetting it for this stage
+                parent = profiler.stack[-1]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.peak = self.traced
+        profiler.stack.append(self)
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+
+    def __exit__(self, *exc: Any) -> bool:
+        cpu = time.process_time() - self.cpu
+        end = time.perf_counter()
+        profiler = self.profiler
+        profiler.stack.pop()
+        event_args = dict(self.args, cpu_ms=round(cpu * 1000, 3))
+        if profiler.memory:
+            import tracemalloc
+
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            event_args["peak_kb"] = round((self.peak - self.traced) / 1024, 1)
+            if profiler.stack:
+                parent = profiler.stack[-1]
+                parent.peak = max(parent.peak, self.peak)
+        profiler.events.append({
+            "name": self.name,
+            "cat": "stage",
+            "ph": "X",
+            "ts": round((self.wall - profiler.origin) * 1e6, 1),
+            "dur": round((end - self.wall) * 1e6, 1),
+            "pid": profiler.pid,
+            "tid": 0,
+            "args": event_args,
+        })
+        return False
+
+
+class Profiler:
+    """Collects completed stages of one session."""
+
+    def __init__(self, memory: bool = True):
+        self.memory = memory
+        self.events: List[Dict[str, Any]] = []
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.stack: List[_Stage] = []  # open stages, innermost last
+
+    def stage(self, name: str, **args: Any) -> _Stage:
+        """Time a `with` block as stage `name`; `args` are stored with the event."""
+        return _Stage(self, name, args)
+
+    def trace(self) -> Dict[str, Any]:
+        """The Chrome trace-event document."""
+        events = sorted(self.events, key=lambda e: (e["ts"], -e["dur"]))
+        meta = {"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+                "args": {"name": os.path.basename(sys.argv[0]) or "python"}}
+        return {"traceEvents": [meta] + events, "displayTimeUnit": "ms"}
+
+    def summary(self) -> str:
+        """Stages in start order as a fixed-width table, nested stages indented."""
+        lines = [f"{'stage':<32} {'wall ms':>10} {'cpu ms':>10}" + (f" {'peak KB':>10}" if self.memory else "")]
+        depth: List[float] = []  # end times of enclosing stages
+        for e in sorted(self.events, key=lambda e: (e["ts"], -e["dur"])):
+            while depth and e["ts"] >= depth[-1]:
+                depth.pop()
+            name = "  " * len(depth) + e["name"]
+            line = f"{name:<32} {e['dur'] / 1000:>10.2f} {e['args']['cpu_ms']:>10.2f}"
+            if self.memory:
+                line += f" {e['args']['peak_kb']:>10.1f}"
+            lines.append(line)
+            depth.append(e["ts"] + e["dur"])
+        return "\n".join(lines) + "\n"
+
+
+def stage(name: str, **args: Any):
+    """Context manager timing a stage in the active session (no-op otherwise)."""
+    if _active is None:
+        return _NO_STAGE
+    return _active.stage(name, **args)
+
+
+def enabled() -> bool:
+    """True while a session is recording."""
+    return _active is not None
+
+
+def add_arguments(parser: Any) -> None:
+    """Add --profile / --cprofile to an argparse parser."""
+    parser.add_argument("--profile", metavar="TRACE.json",
+                        help=f"Write per-stage wall/CPU/memory as a Chrome trace (or set ${PROFILE_ENV})")
+    parser.add_argument("--cprofile", metavar="OUT.prof",
+                        help=f"Also run under cProfile and write pstats data (or set ${CPROFILE_ENV})")
+
+
+class _Session:
+    """Context manager installing a Profiler (and cProfile) around a run."""
+
+    def __init__(self, trace_path: Optional[str], cprofile_path: Optional[str], name: str):
+        self.trace_path = trace_path
+        self.cprofile_path = cprofile_path
+        self.profiler = Profiler(memory=bool(trace_path) and os.environ.get(MEMORY_ENV, "1") != "0")
+        self.run = self.profiler.stage(name)
+        self.started_tracemalloc = False
+        self.cprof = None
+
+    def __enter__(self) -> None:
+        global _active
+
+        if self.profiler.memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self.started_tracemalloc = True
+        if self.cprofile_path:
+            import cProfile
+
+            self.cprof = cProfile.Profile()
+        _active = self.profiler
+        if self.cprof is not None:
+            self.cprof.enable()
+        self.run.__enter__()
+
+    def __exit__(self, *exc: Any) -> bool:
+        global _active
+
+        self.run.__exit__(*exc)
+        if self.cprof is not None:
+            self.cprof.disable()
+        _active = None
+        if self.started_tracemalloc:
+            import tracemalloc
+
+            tracemalloc.stop()
+        if self.cprof is not None:
+            self.cprof.dump_stats(self.cprofile_path)
+        if self.trace_path:
+            import json
+
+            with open(self.trace_path, "w", encoding="utf-8") as f:
+                json.dump(self.profiler.trace(), f)
+            sys.stderr.write(self.profiler.summary())
+            sys.stderr.write(f"Trace written to {self.trace_path}\n")
+        return False
+
+
+def session(trace_path: Optional[str] = None, cprofile_path: Optional[str] = None, name: str = "run"):
+    """Context manager recording the enclosed run as stage `name` if profiling is requested.
+
+    Paths default to $JIRA_PACK_PROFILE / $JIRA_PACK_CPROFILE; with neither
+    set (or a session already active) the block runs untouched.
+    """
+    trace_path = trace_path or os.environ.get(PROFILE_ENV)
+    cprofile_path = cprofile_path or os.environ.get(CPROFILE_ENV)
+    if _active is not None or not (trace_path or cprofile_path):
+        return _NO_STAGE
+    return _Session(trace_path, cprofile_path, name)
@@ -0,0 +1,196 @@
+"""Incremental readers for Jira search exports.
+
+Two input shapes are read without loading the whole document:
+
+- NDJSON: one issue object per line
+- Search envelope: { "startAt": 0, "total": N, "issues": [ ... ] }
+
+Both yield one issue dict at a time, so memory is bounded by the largest
+single issue rather than by the size of the export.
+
+NDJSON lines are decoded, and output encoded, by jira_json. Envelope
+values are still located with the stdlib decoder, the only one that can
+resume at an offset inside a rolling buffer.
+"""
+
+import json
+from typing import Any, Callable, Dict, IO, Iterator, Optional, Tuple
+
+from jira_json import dumps, loads
+
+CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\r\n"
+
+
+class _Reader:
+    """Rolling text buffer with JSON value decoding on top of a file object."""
+
+    def __init__(self, fp: IO[str], chunk_size: int = CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Read more input, dropping the consumed prefix. False at EOF."""
+        if self.eof:
+            return False
+        # Grow geometrically so a huge value is re-scanned O(log n) times
+        chunk = self.fp.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character ('' at EOF)."""
+        while True:
+            buf, pos = self.buf, self.pos
+            n = len(buf)
+            while pos < n and buf[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < n:
+                return buf[pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume one of `chars` or raise JSONDecodeError."""
+        ch = self.peek()
+        if not ch or ch not in chars:
+            raise json.JSONDecodeError(f"Expecting one of {chars!r}", self.buf, self.pos)
+        self.pos += 1
+        return ch
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def iter_ndjson(fp: IO[str]) -> Iterator[Dict[str, Any]]:
+    """Yield one issue per non-blank line."""
+    for line in fp:
+        line = line.strip()
+        if line:
+            yield loads(line)
+
+
+def _iter_array(reader: _Reader) -> Iterator[Any]:
+    """Yield the elements of the array at the reader position."""
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(",]") == "]":
+            break
+
+
+def iter_members(fp: IO[str]) -> Iterator[Tuple[str, Any]]:
+    """Yield (key, value) for each top-level member of a JSON object, in order.
+
+    The value of an "issues" array is an iterator over its elements rather
+    than a list; it must be consumed before the next member is read (any
+    remainder is skipped when iteration moves on).
+    """
+    reader = _Reader(fp)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key == "issues" and reader.peek() == "[":
+            items = _iter_array(reader)
+            yield key, items
+            for _ in items:
+                pass
+        else:
+            yield key, reader.value()
+        if reader.expect(",}") == "}":
+            break
+
+
+def iter_envelope(fp: IO[str], meta: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield issues from a search envelope one at a time.
+
+    Scalar top-level values (total, startAt, maxResults, ...) are stored in
+    `meta` as they are seen. If the document has no "issues" array it is
+    treated as a single issue and yielded whole.
+    """
+    if meta is None:
+        meta = {}
+    head: Dict[str, Any] = {}
+    seen_issues = False
+
+    for key, val in iter_members(fp):
+        if key == "issues" and isinstance(val, Iterator):
+            seen_issues = True
+            head.clear()
+            yield from val
+            continue
+        if not isinstance(val, (dict, list)):
+            meta[key] = val
+        if not seen_issues:
+            head[key] = val
+
+    if not seen_issues and head:
+        yield head
+
+
+def iter_issues(fp: IO[str], ndjson: bool = False,
+                meta: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield issues from NDJSON or a search envelope."""
+    if ndjson:
+        return iter_ndjson(fp)
+    return iter_envelope(fp, meta)
+
+
+def write_projected(fp: IO[str], write: Callable[[str], Any], project: Callable[[Any], Any],
+                    ndjson: bool = False) -> int:
+    """Copy an export to `write` with every issue passed through `project`.
+
+    Envelopes keep their scalar members (total, startAt, ...) in place and
+    drop other expansions such as "names" or "schema"; NDJSON stays NDJSON.
+    Output is compact JSON. Returns the number of issues written.
+    """
+    count = 0
+    if ndjson:
+        for issue in iter_ndjson(fp):
+            write(dumps(project(issue)) + "\n")
+            count += 1
+        return count
+
+    sep = "{"
+    for key, value in iter_members(fp):
+        if key == "issues" and isinstance(value, Iterator):
+            write(sep + '"issues":[')
+            for issue in value:
+                write(("," if count else "") + dumps(project(issue)))
+                count += 1
+            write("]")
+        elif isinstance(value, (dict, list)):
+            continue
+        else:
+            write(sep + dumps(key) + ":" + dumps(value))
+        sep = ","
+    write(("{}" if sep == "{" else "}") + "\n")
+    return count
@@ -0,0 +1,617 @@
+#!/usr/bin/env python3
+"""Seeded synthetic Jira data for scale testing.
+
+Usage:
+    python jira_synth.py issues --count 10000 > issues.ndjson
+    python jira_synth.py envelope --count 500 --total 12000 > search.json
+    python jira_synth.py metrics --projects 50 --issues 400 --out-dir metrics/
+
+Generates raw issues shaped like REST API v3 responses: ADF descriptions
+with headings, marks, nested bullet/ordered lists, code blocks, tables,
+panels and inline nodes; comment threads; the custom fields mapped in
+normalize_fields.DEFAULT_FIELD_MAP plus unmapped select/option fields and
+the empty custom fields real exports carry; and Blocks/Relates/Duplicates
+links recorded on both ends. `metrics` writes dashboard inputs in the
+format of assets/examples/example_metrics.json, with the dependency graph
+computed from synthetic links by jira_deps.
+
+The same --seed always produces the same bytes. Issues are generated one
+at a time from a small per-project plan (type, status, priority, summary
+and links per issue), so writing a million-issue export needs memory only
+for the plan.
+"""
+
+import json
+import random
+import sys
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+BASE_URL = "https://your-domain.atlassian.net"
+
+# (name, id, statusCategory key, weight)
+STATUSES = [
+    ("To Do", "10000", "new", 20),
+    ("In Progress", "10002", "indeterminate", 18),
+    ("In Review", "10003", "indeterminate", 6),
+    ("Blocked", "10004", "indeterminate", 3),
+    ("Done", "10001", "done", 53),
+]
+STATUS_CATEGORIES = {
+    "new": (2, "To Do", "blue-gray"),
+    "indeterminate": (4, "In Progress", "yellow"),
+    "done": (3, "Done", "green"),
+}
+# (name, id, weight)
+ISSUE_TYPES = [("Story", "10001", 40), ("Task", "10002", 30), ("Bug", "10003", 20), ("Sub-task", "10004", 10)]
+PRIORITIES = [("Highest", "1", 3), ("High", "2", 15), ("Medium", "3", 55), ("Low", "4", 20), ("Lowest", "5", 7)]
+# (name, inward, outward, weight)
+LINK_TYPES = [
+    ("Blocks", "is blocked by", "blocks", 50),
+    ("Relates", "relates to", "relates to", 40),
+    ("Duplicate", "is duplicated by", "duplicates", 10),
+]
+
+FIRST_NAMES = ["John", "Jane", "Wei", "Mei-Ling", "Carlos", "Aisha", "Kenji", "Olga", "Priya", "Tom"]
+LAST_NAMES = ["Doe", "Smith", "Chen", "Lin", "Garcia", "Khan", "Tanaka", "Ivanova", "Patel", "Bergström"]
+COMPONENTS = ["Authentication", "Billing", "Reporting", "API Gateway", "Mobile", "Search", "Notifications"]
+LABELS = ["backend", "frontend", "tech-debt", "security", "performance", "ux", "customer", "regression"]
+TEAMS = ["Platform", "Growth", "Payments", "Core UX"]
+WORDS = (
+    "login session token cache timeout retry payload schema migration export dashboard report "
+    "query index latency error handler service endpoint user account permission audit webhook "
+    "queue worker deploy config rollback feature flag billing invoice search filter pagination "
+    "mobile layout render validation upload attachment notification email locale currency"
+).split()
+VERBS = ["Fix", "Add", "Refactor", "Investigate", "Support", "Remove", "Migrate", "Improve", "Document"]
+LANGUAGES = ["python", "java", "javascript", "sql", "bash", "json"]
+EMOJI = [(":warning:", "⚠️"), (":white_check_mark:", "✅"), (":fire:", "🔥"), (":bug:", "🐛")]
+
+DEFAULT_SEED = 42
+DEFAULT_PROJECT = "PROJ"
+DEFAULT_COMMENTS = 6    # mean comments per issue
+DEFAULT_LINKS = 1.5     # mean links per issue
+EPIC_SIZE = 40          # issues per epic; Blocks links mostly stay inside one
+ACTIVE_SPRINT = 27      # two-week sprints from 2024-01-01; the one open at year end
+
+
+def _weighted(rng: random.Random, table: List[tuple]) -> int:
+    """Index into `table`, weighted by each row's last element."""
+    return rng.choices(range(len(table)), weights=[row[-1] for row in table])[0]
+
+
+def _words(rng: random.Random, lo: int, hi: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(lo, hi)))
+
+
+def _timestamp(day: int, seconds: int) -> str:
+    """Jira timestamp `day` days after 2024-01-01 plus `seconds`."""
+    import datetime
+
+    t = datetime.datetime(2024, 1, 1) + datetime.timedelta(days=day, seconds=seconds)
+    return t.strftime("%Y-%m-%dT%H:%M:%S.") + f"{t.microsecond // 1000:03d}+0000"
+
+
+def _date(day: int) -> str:
+    import datetime
+
+    return (datetime.date(2024, 1, 1) + datetime.timedelta(days=day)).isoformat()
+
+
+# ---------------------------------------------------------------------------
+# Users and small field objects
+# ---------------------------------------------------------------------------
+
+
+def _user(n: int, full: bool = True) -> Dict[str, Any]:
+    account = f"5c{n:022x}"
+    name = f"{FIRST_NAMES[n % len(FIRST_NAMES)]} {LAST_NAMES[n // len(FIRST_NAMES) % len(LAST_NAMES)]}"
+    user: Dict[str, Any] = {"self": f"{BASE_URL}/rest/api/3/user?accountId={account}", "accountId": account}
+    if full:
+        handle = name.lower().replace(" ", ".")
+        user["emailAddress"] = f"{handle}@example.com"
+        user["avatarUrls"] = {f"{s}x{s}": f"https://avatar-management.atlassian.net/avatar/{account}/{s}"
+                              for s in (48, 24, 16, 32)}
+    user["displayName"] = name
+    user["active"] = True
+    if full:
+        user["timeZone"] = "Asia/Taipei"
+        user["accountType"] = "atlassian"
+    return user
+
+
+def _status(index: int, full: bool = True) -> Dict[str, Any]:
+    name, sid, category, _ = STATUSES[index]
+    status: Dict[str, Any] = {"self": f"{BASE_URL}/rest/api/3/status/{sid}", "name": name, "id": sid}
+    cat_id, cat_name, color = STATUS_CATEGORIES[category]
+    status["statusCategory"] = {"self": f"{BASE_URL}/rest/api/3/statuscategory/{cat_id}", "id": cat_id,
+                                "key": category, "colorName": color, "name": cat_name}
+    if full:
+        status["description"] = ""
+        status["iconUrl"] = f"{BASE_URL}/"
+    return status
+
+
+def _issuetype(index: int, full: bool = True) -> Dict[str, Any]:
+    name, tid, _ = ISSUE_TYPES[index]
+    itype: Dict[str, Any] = {"self": f"{BASE_URL}/rest/api/3/issuetype/{tid}", "id": tid, "name": name}
+    if full:
+        itype["subtask"] = name == "Sub-task"
+        itype["hierarchyLevel"] = -1 if name == "Sub-task" else 0
+    return itype
+
+
+def _sprint(n: int) -> Dict[str, Any]:
+    state = "closed" if n < ACTIVE_SPRINT else "active" if n == ACTIVE_SPRINT else "future"
+    return {"id": n, "name": f"Sprint {n}", "state": state, "boardId": 1,
+            "startDate": _date((n - 1) * 14) + "T00:00:00.000Z", "endDate": _date(n * 14) + "T00:00:00.000Z"}
+
+
+def _priority(index: int) -> Dict[str, Any]:
+    name, pid, _ = PRIORITIES[index]
+    return {"self": f"{BASE_URL}/rest/api/3/priority/{pid}", "name": name, "id": pid,
+            "iconUrl": f"{BASE_URL}/images/icons/priorities/{name.lower()}.svg"}
+
+
+# ---------------------------------------------------------------------------
+# ADF
+# ---------------------------------------------------------------------------
+
+
+def _text(rng: random.Random, lo: int = 4, hi: int = 18) -> List[Dict[str, Any]]:
+    """Inline content: plain runs with the occasional mark or inline node."""
+    out: List[Dict[str, Any]] = [{"type": "text", "text": _words(rng, lo, hi).capitalize() + " "}]
+    r = rng.random()
+    if r < 0.15:
+        out.append({"type": "text", "text": rng.choice(WORDS), "marks": [{"type": "strong"}]})
+    elif r < 0.25:
+        out.append({"type": "text", "text": f"{rng.choice(WORDS)}()", "marks": [{"type": "code"}]})
+    elif r < 0.32:
+        out.append({"type": "text", "text": "docs",
+                    "marks": [{"type": "link", "attrs": {"href": f"https://example.com/{rng.choice(WORDS)}"}}]})
+    elif r < 0.37:
+        user = rng.randrange(40)
+        out.append({"type": "mention", "attrs": {"id": f"5c{user:022x}", "text": "@" + _user(user, False)["displayName"]}})
+    elif r < 0.40:
+        short, text = rng.choice(EMOJI)
+        out.append({"type": "emoji", "attrs": {"shortName": short, "text": text}})
+    elif r < 0.42:
+        out.append({"type": "status", "attrs": {"text": "IN REVIEW", "color": "blue"}})
+    elif r < 0.44:
+        out.append({"type": "inlineCard", "attrs": {"url": f"{BASE_URL}/browse/PROJ-{rng.randrange(1, 999)}"}})
+    if len(out) > 1:
+        out.append({"type": "text", "text": " " + _words(rng, 2, 8) + "."})
+    return out
+
+
+def _paragraph(rng: random.Random) -> Dict[str, Any]:
+    return {"type": "paragraph", "content": _text(rng)}
+
+
+def _list(rng: random.Random, depth: int = 0) -> Dict[str, Any]:
+    """A bullet or ordered list, sometimes nesting another list under an item."""
+    items = []
+    for _ in range(rng.randint(2, 5)):
+        content = [_paragraph(rng)]
+        if depth < 3 and rng.random() < 0.25:
+            content.append(_list(rng, depth + 1))
+        items.append({"type": "listItem", "content": content})
+    kind = "orderedList" if rng.random() < 0.35 else "bulletList"
+    node: Dict[str, Any] = {"type": kind, "content": items}
+    if kind == "orderedList":
+        node["attrs"] = {"order": 1}
+    return node
+
+
+def _code_block(rng: random.Random) -> Dict[str, Any]:
+    lines = [f"{rng.choice(WORDS)}_{i} = {rng.choice(WORDS)}({rng.randint(0, 99)})" for i in range(rng.randint(2, 12))]
+    return {"type": "codeBlock", "attrs": {"language": rng.choice(LANGUAGES)},
+            "content": [{"type": "text", "text": "\n".join(lines)}]}
+
+
+def _table(rng: random.Random) -> Dict[str, Any]:
+    cols = rng.randint(2, 4)
+
+    def cell(kind: str, text: str) -> Dict[str, Any]:
+        return {"type": kind, "attrs": {}, "content": [{"type": "paragraph", "content": [{"type": "text", "text": text}]}]}
+
+    rows = [{"type": "tableRow", "content": [cell("tableHeader", rng.choice(WORDS).title()) for _ in range(cols)]}]
+    for _ in range(rng.randint(1, 6)):
+        rows.append({"type": "tableRow", "content": [cell("tableCell", _words(rng, 1, 4)) for _ in range(cols)]})
+    return {"type": "table", "attrs": {"isNumberColumnEnabled": False, "layout": "default"}, "content": rows}
+
+
+def synth_adf(rng: random.Random, blocks: int) -> Dict[str, Any]:
+    """An ADF document of about `blocks` top-level blocks."""
+    content: List[Dict[str, Any]] = []
+    for i in range(blocks):
+        r = rng.random()
+        if i == 0 or r < 0.12:
+            content.append({"type": "heading", "attrs": {"level": rng.choice((2, 3))},
+                            "content": [{"type": "text", "text": _words(rng, 1, 4).title()}]})
+        elif r < 0.50:
+            content.append(_paragraph(rng))
+        elif r < 0.70:
+            content.append(_list(rng))
+        elif r < 0.80:
+            content.append(_code_block(rng))
+        elif r < 0.87:
+            content.append(_table(rng))
+        elif r < 0.93:
+            content.append({"type": "panel", "attrs": {"panelType": rng.choice(("info", "warning", "note"))},
+                            "content": [_paragraph(rng)]})
+        elif r < 0.96:
+            content.append({"type": "blockquote", "content": [_paragraph(rng)]})
+        else:
+            content.append({"type": "rule"})
+    return {"version": 1, "type": "doc", "content": content}
+
+
+# ---------------------------------------------------------------------------
+# Issues
+# ---------------------------------------------------------------------------
+
+
+class ProjectPlan:
+    """Per-issue type, status, priority, summary and links for one project.
+
+    Everything an issue needs to know about *other* issues lives here, so
+    issues can then be generated independently, one at a time.
+    """
+
+    def __init__(self, count: int, seed: int = DEFAULT_SEED, project: str = DEFAULT_PROJECT,
+                 links: float = DEFAULT_LINKS):
+        rng = random.Random(f"{seed}:{project}:plan")
+        self.count = count
+        self.seed = seed
+        self.project = project
+        self.types = [_weighted(rng, ISSUE_TYPES) for _ in range(count)]
+        self.priorities = [_weighted(rng, PRIORITIES) for _ in range(count)]
+        # Older issues are more likely to be done
+        self.statuses = []
+        for i in range(count):
+            status = _weighted(rng, STATUSES)
+            if STATUSES[status][2] == "done" and rng.random() < i / max(count, 1) * 0.6:
+                status = rng.randrange(len(STATUSES) - 1)
+            self.statuses.append(status)
+        self.summaries = [f"{rng.choice(VERBS)} {_words(rng, 2, 7)}" for _ in range(count)]
+        # issue -> [(link type index, other issue, outward?)], both ends recorded
+        self.links: List[List[tuple]] = [[] for _ in range(count)]
+        if count > 1:
+            for _ in range(int(count * links / 2)):
+                kind = _weighted(rng, LINK_TYPES)
+                a = rng.randrange(count)
+                if LINK_TYPES[kind][0] == "Blocks" and rng.random() >= 0.01:
+                    # Mostly forward within an epic, so chains form and cycles are rare
+                    base = a - a % EPIC_SIZE
+                    b = base + rng.randrange(min(EPIC_SIZE, count - base))
+                    if rng.random() >= 0.001 and b < a:
+                        a, b = b, a
+                else:
+                    b = rng.randrange(count)
+                if a == b:
+                    continue
+                self.links[a].append((kind, b, True))
+                self.links[b].append((kind, a, False))
+
+    def key(self, i: int) -> str:
+        return f"{self.project}-{i + 1}"
+
+    def link_stub(self, i: int) -> Dict[str, Any]:
+        """The linked-issue summary Jira embeds in issuelinks."""
+        return {"id": str(10000 + i), "key": self.key(i), "self": f"{BASE_URL}/rest/api/3/issue/{10000 + i}",
+                "fields": {"summary": self.summaries[i], "status": _status(self.statuses[i], full=False),
+                           "priority": _priority(self.priorities[i]),
+                           "issuetype": _issuetype(self.types[i], full=False)}}
+
+
+def synth_issue(plan: ProjectPlan, i: int, comments: float = DEFAULT_COMMENTS) -> Dict[str, Any]:
+    """Issue `i` of `plan` as a raw REST API v3 issue."""
+    rng = random.Random(f"{plan.seed}:{plan.project}:{i}")
+    key = plan.key(i)
+    issue_id = str(10000 + i)
+    created_day = i * 365 // max(plan.count, 1)
+    created = _timestamp(created_day, rng.randrange(86400))
+    updated_day = created_day + rng.randint(0, 30)
+    updated = _timestamp(updated_day, rng.randrange(86400))
+    status = plan.statuses[i]
+    done = STATUSES[status][2] == "done"
+    itype = plan.types[i]
+    assignee = None if rng.random() < 0.15 else _user(rng.randrange(40))
+    reporter = _user(rng.randrange(40))
+    epic = i - i % EPIC_SIZE
+    # Planned into the next two-week sprint; some are pulled into the running one
+    sprint_no = created_day // 14 + (1 if rng.random() < 0.15 else 2)
+    sprints = [sprint_no]
+    if not done and ACTIVE_SPRINT - 3 <= sprint_no < ACTIVE_SPRINT and rng.random() < 0.3:
+        sprints.append(ACTIVE_SPRINT)  # carried over
+
+    issuelinks = []
+    for n, (kind, other, outward) in enumerate(plan.links[i]):
+        name, inward_text, outward_text, _ = LINK_TYPES[kind]
+        link_id = str(20000 + i * 8 + n)
+        issuelinks.append({
+            "id": link_id,
+            "self": f"{BASE_URL}/rest/api/3/issueLink/{link_id}",
+            "type": {"id": str(10000 + kind), "name": name, "inward": inward_text, "outward": outward_text,
+                     "self": f"{BASE_URL}/rest/api/3/issueLinkType/{10000 + kind}"},
+            ("outwardIssue" if outward else "inwardIssue"): plan.link_stub(other),
+        })
+
+    thread = []
+    n_comments = min(int(rng.expovariate(1 / comments)) if comments > 0 else 0, 200)
+    for c in range(n_comments):
+        author = _user(rng.randrange(40), full=False)
+        stamp = _timestamp(created_day + c, rng.randrange(86400))
+        body_blocks = [_paragraph(rng) for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.1:
+            body_blocks.append(_code_block(rng))
+        thread.append({
+            "self": f"{BASE_URL}/rest/api/3/issue/{issue_id}/comment/{30000 + c}",
+            "id": str(30000 + c),
+            "author": author,
+            "body": {"version": 1, "type": "doc", "content": body_blocks},
+            "updateAuthor": author,
+            "created": stamp,
+            "updated": stamp,
+            "jsdPublic": True,
+        })
+
+    fields: Dict[str, Any] = {
+        "statuscategorychangedate": updated,
+        "issuetype": _issuetype(itype),
+        "timespent": None,
+        "project": {"self": f"{BASE_URL}/rest/api/3/project/10000", "id": "10000", "key": plan.project,
+                    "name": f"Project {plan.project}", "projectTypeKey": "software", "simplified": False},
+        "fixVersions": [{"self": f"{BASE_URL}/rest/api/3/version/{10000 + v}", "id": str(10000 + v),
+                         "name": f"1.{v}.0", "archived": False, "released": v < sprint_no // 4}
+                        for v in rng.sample(range(12), rng.randint(0, 2))],
+        "resolution": {"name": "Done", "id": "10000"} if done else None,
+        "resolutiondate": updated if done else None,
+        "watches": {"self": f"{BASE_URL}/rest/api/3/issue/{key}/watchers", "watchCount": rng.randint(0, 9),
+                    "isWatching": False},
+        "created": created,
+        "customfield_10000": [_sprint(n) for n in sprints],
+        "customfield_10001": rng.choice((1, 2, 3, 5, 8, 13, None)),
+        "customfield_10002": plan.key(epic) if epic != i else None,
+        "customfield_10003": _words(rng, 2, 3).title() if epic == i else None,
+        "customfield_10004": f"0|i{i:05x}:",
+        "customfield_10005": [{"value": "Impediment", "id": "10019"}] if status == 3 else None,
+        "customfield_10006": {"id": str(rng.randrange(len(TEAMS))), "name": rng.choice(TEAMS)},
+        "customfield_10007": synth_adf(rng, rng.randint(1, 3)) if rng.random() < 0.4 else None,
+        "customfield_10008": _date(created_day) if rng.random() < 0.5 else None,
+        "customfield_10009": _date(created_day + rng.randint(3, 40)) if rng.random() < 0.5 else None,
+        # Unmapped fields: a single select, a multi-select and a cascading select
+        "customfield_10100": {"self": f"{BASE_URL}/rest/api/3/customFieldOption/{10100 + i % 4}",
+                              "value": ("Web", "iOS", "Android", "API")[i % 4], "id": str(10100 + i % 4)},
+        "customfield_10101": [{"value": label, "id": str(10200 + n)}
+                              for n, label in enumerate(rng.sample(LABELS, rng.randint(0, 2)))],
+        "customfield_10102": {"value": "EMEA", "id": "10300", "child": {"value": "DE", "id": "10301"}},
+        "priority": _priority(plan.priorities[i]),
+        "labels": rng.sample(LABELS, rng.randint(0, 3)),
+        "versions": [],
+        "issuelinks": issuelinks,
+        "assignee": assignee,
+        "updated": updated,
+        "status": _status(status),
+        "components": [{"self": f"{BASE_URL}/rest/api/3/component/{10000 + c}", "id": str(10000 + c),
+                        "name": COMPONENTS[c]} for c in rng.sample(range(len(COMPONENTS)), rng.randint(0, 2))],
+        "description": synth_adf(rng, rng.randint(2, 14)) if rng.random() < 0.9 else None,
+        "summary": plan.summaries[i],
+        "creator": reporter,
+        "subtasks": [],
+        "reporter": reporter,
+        "environment": None,
+        "duedate": _date(created_day + rng.randint(5, 60)) if rng.random() < 0.3 else None,
+        "comment": {"comments": thread, "self": f"{BASE_URL}/rest/api/3/issue/{issue_id}/comment",
+                    "maxResults": n_comments, "total": n_comments, "startAt": 0},
+        "votes": {"self": f"{BASE_URL}/rest/api/3/issue/{key}/votes", "votes": rng.randint(0, 3), "hasVoted": False},
+        "worklog": {"startAt": 0, "maxResults": 20, "total": 0, "worklogs": []},
+    }
+    # Real exports carry dozens of custom fields that are always empty
+    for n in range(10010, 10040):
+        fields[f"customfield_{n}"] = None
+    if ISSUE_TYPES[itype][0] == "Sub-task" and i:
+        parent = rng.randrange(max(epic, i - EPIC_SIZE), i) if i > epic else i - 1
+        fields["parent"] = {"id": str(10000 + parent), "key": plan.key(parent),
+                            "fields": {"summary": plan.summaries[parent],
+                                       "status": _status(plan.statuses[parent], full=False)}}
+
+    return {"expand": "renderedFields,names,schema,operations,editmeta,changelog,versionedRepresentations",
+            "id": issue_id, "self": f"{BASE_URL}/rest/api/3/issue/{issue_id}", "key": key, "fields": fields}
+
+
+def iter_issues(count: int, seed: int = DEFAULT_SEED, project: str = DEFAULT_PROJECT,
+                comments: float = DEFAULT_COMMENTS, links: float = DEFAULT_LINKS) -> Iterator[Dict[str, Any]]:
+    """Yield `count` synthetic issues of one project in key order."""
+    plan = ProjectPlan(count, seed, project, links)
+    for i in range(count):
+        yield synth_issue(plan, i, comments)
+
+
+def write_ndjson(fp: TextIO, issues: Iterator[Dict[str, Any]]) -> int:
+    """Write one compact issue per line; returns the count."""
+    count = 0
+    for issue in issues:
+        fp.write(json.dumps(issue, ensure_ascii=False, separators=(",", ":")) + "\n")
+        count += 1
+    return count
+
+
+def write_envelope(fp: TextIO, issues: Iterator[Dict[str, Any]], count: int,
+                   start_at: int = 0, total: Optional[int] = None) -> int:
+    """Write a search envelope holding `count` issues; returns the count."""
+    total = count if total is None else total
+    fp.write(f'{{"expand":"schema,names","startAt":{start_at},"maxResults":{count},"total":{total},"issues":[')
+    written = 0
+    for issue in issues:
+        fp.write(("," if written else "") + json.dumps(issue, ensure_ascii=False, separators=(",", ":")))
+        written += 1
+    fp.write("]}\n")
+    return written
+
+
+# ---------------------------------------------------------------------------
+# Dashboard metrics
+# ---------------------------------------------------------------------------
+
+
+def synth_metrics(project_index: int, issues: int = 300, seed: int = DEFAULT_SEED,
+                  sprints: int = 6) -> Dict[str, Any]:
+    """Dashboard input (pack_dashboard --data) for one synthetic project.
+
+    Counts come from a ProjectPlan of `issues` issues; the dependency
+    members are computed from its Blocks links with jira_deps.
+    """
+    from jira_deps import DependencyGraph, analyze
+
+    project = f"P{project_index:04d}"
+    plan = ProjectPlan(issues, seed, project)
+    rng = random.Random(f"{seed}:{project}:metrics")
+
+    by_status: Dict[str, int] = {}
+    by_priority: Dict[str, int] = {}
+    by_type: Dict[str, int] = {}
+    for i in range(issues):
+        by_status[STATUSES[plan.statuses[i]][0]] = by_status.get(STATUSES[plan.statuses[i]][0], 0) + 1
+        by_priority[PRIORITIES[plan.priorities[i]][0]] = by_priority.get(PRIORITIES[plan.priorities[i]][0], 0) + 1
+        by_type[ISSUE_TYPES[plan.types[i]][0]] = by_type.get(ISSUE_TYPES[plan.types[i]][0], 0) + 1
+    done = by_status.get("Done", 0)
+
+    capacity = rng.randint(18, 45)
+    committed = [max(5, capacity + rng.randint(-6, 6)) for _ in range(sprints)]
+    completed = [max(0, c - rng.randint(-2, 9)) for c in committed]
+    day = rng.randint(1, 10)
+    sprint_total = rng.randint(15, 40)
+    sprint_done = min(sprint_total, int(sprint_total * day / 10 * rng.uniform(0.4, 1.2)))
+    in_progress = rng.randint(0, sprint_total - sprint_done)
+    completed[-1] = sprint_done
+
+    def level() -> str:
+        return rng.choices(("healthy", "warning", "critical"), weights=(6, 3, 1))[0]
+
+    # Same shape as the ProjectPlan issues, carrying only what jira_deps reads
+    link_issues = []
+    for i in range(issues):
+        links = []
+        for kind, other, outward in plan.links[i]:
+            name, inward_text, outward_text, _ = LINK_TYPES[kind]
+            links.append({"type": {"name": name, "inward": inward_text, "outward": outward_text},
+                          ("outwardIssue" if outward else "inwardIssue"):
+                              {"key": plan.key(other), "fields": {"status": _status(plan.statuses[other], False)}}})
+        link_issues.append({"key": plan.key(i), "fields": {"status": _status(plan.statuses[i], False),
+                                                           "issuelinks": links}})
+    deps = analyze(DependencyGraph.from_issues(link_issues))
+
+    epics = []
+    for e in range(0, issues, EPIC_SIZE):
+        members = range(e, min(e + EPIC_SIZE, issues))
+        epics.append({"name": plan.summaries[e][:30], "key": plan.key(e), "total": len(members),
+                      "done": sum(STATUSES[plan.statuses[m]][2] == "done" for m in members)})
+
+    attention = []
+    for i in range(issues):
+        if STATUSES[plan.statuses[i]][0] == "Blocked" and len(attention) < 8:
+            attention.append({"key": plan.key(i), "summary": plan.summaries[i],
+                              "reason": f"Blocked {rng.randint(1, 12)} 天",
+                              "impact": rng.choice(("high", "medium", "low")), "action": "確認阻塞原因"})
+
+    return {
+        "project": {"key": project, "name": f"Project {project_index}"},
+        "generated_at": _timestamp(380, 36000)[:19],
+        "date_range": f"{_date(373)} ~ {_date(380)}",
+        "sprint": {"name": f"Sprint {sprints + 17}", "startDate": _date(368), "endDate": _date(382),
+                   "day": day, "totalDays": 10,
+                   "issues": {"total": sprint_total, "done": sprint_done, "inProgress": in_progress,
+                              "todo": sprint_total - sprint_done - in_progress,
+                              "blocked": rng.randint(0, 3), "unassigned": rng.randint(0, 4)}},
+        "velocity": {"sprints": [f"S{18 + s}" for s in range(sprints)], "committed": committed,
+                     "completed": completed},
+        "issues": {"total": issues, "done": done, "active": issues - done, "by_status": by_status,
+                   "by_priority": by_priority, "by_type": by_type},
+        "bug_trend": {"weekly_counts": [rng.randint(0, 12) for _ in range(6)],
+                      "high_priority_open": rng.randint(0, 6)},
+        "scope_creep": {"current_rate": round(rng.uniform(0, 0.3), 2),
+                        "sprint_rates": [round(rng.uniform(0, 0.3), 2) for _ in range(4)]},
+        "resource": {"max_wip": rng.randint(2, 9)},
+        "risk_history": {dim: [level() for _ in range(4)] for dim in ("schedule", "scope", "resource", "quality")},
+        "dependency_graph": deps["dependency_graph"],
+        "dependency_chains": deps["dependency_chains"],
+        "epics": epics,
+        "attention_items": attention,
+        "strategic_insights": [],
+    }
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+
+def main() -> int:
+    """Main entry point."""
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Generate seeded synthetic Jira data")
+    subparsers = parser.add_subparsers(dest="command", help="What to generate")
+
+    def common(p):
+        p.add_argument("--seed", type=int, default=DEFAULT_SEED, help=f"Random seed (default: {DEFAULT_SEED})")
+        p.add_argument("--output", "-o", help="Output file (default: stdout)")
+
+    def issue_options(p):
+        p.add_argument("--count", "-n", type=int, default=1000, help="Issues to generate (default: 1000)")
+        p.add_argument("--project", default=DEFAULT_PROJECT, help=f"Project key (default: {DEFAULT_PROJECT})")
+        p.add_argument("--comments", type=float, default=DEFAULT_COMMENTS,
+                       help=f"Mean comments per issue (default: {DEFAULT_COMMENTS})")
+        p.add_argument("--links", type=float, default=DEFAULT_LINKS,
+                       help=f"Mean issue links per issue (default: {DEFAULT_LINKS})")
+        common(p)
+
+    issues_parser = subparsers.add_parser("issues", help="Raw issues, one JSON object per line")
+    issue_options(issues_parser)
+
+    envelope_parser = subparsers.add_parser("envelope", help="One search API envelope")
+    issue_options(envelope_parser)
+    envelope_parser.add_argument("--start-at", type=int, default=0, help="startAt of the page (default: 0)")
+    envelope_parser.add_argument("--total", type=int, help="total reported by the envelope (default: --count)")
+
+    metrics_parser = subparsers.add_parser("metrics", help="Dashboard metrics files (pack_dashboard --data)")
+    metrics_parser.add_argument("--projects", type=int, default=1, help="Projects to generate (default: 1)")
+    metrics_parser.add_argument("--issues", type=int, default=300, help="Issues per project (default: 300)")
+    metrics_parser.add_argument("--out-dir", help="Write P0000.json, P0001.json, ... here "
+                                                  "(default: one project to --output/stdout)")
+    common(metrics_parser)
+
+    args = parser.parse_args()
+    if not args.command:
+        parser.print_help()
+        return 1
+
+    if args.command == "metrics" and args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+        for p in range(args.projects):
+            with open(os.path.join(args.out_dir, f"P{p:04d}.json"), "w", encoding="utf-8") as f:
+                json.dump(synth_metrics(p, args.issues, args.seed), f, ensure_ascii=False, indent=2)
+        sys.stderr.write(f"Wrote {args.projects} metrics files to {args.out_dir}\n")
+        return 0
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.command == "metrics":
+            json.dump(synth_metrics(0, args.issues, args.seed), out, ensure_ascii=False, indent=2)
+            out.write("\n")
+            return 0
+        issues = iter_issues(args.count, args.seed, args.project, args.comments, args.links)
+        if args.command == "issues":
+            write_ndjson(out, issues)
+        else:
+            write_envelope(out, issues, args.count, args.start_at, args.total)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,18 +3,27 @@
 
 Usage:
     python normalize_fields.py issue.json --map field_map.json > normalized.json
+    python normalize_fields.py search.json --map field_map.json --drop-unmapped > normalized.json
+    python normalize_fields.py export.ndjson --ndjson > normalized.ndjson
     python normalize_fields.py --generate-map issue.json > field_map.json
 
 This script helps manage custom fields by:
 1. Generating a mapping template from issue metadata
 2. Applying mappings to convert customfield_XXXXX to readable names
+
+Normalization streams: a search envelope is rewritten one issue at a time
+(and NDJSON one line at a time), so memory stays at one issue however
+large the export. Output is compact JSON; --pretty gives the indented form.
 """
 
 import json
 import sys
 import re
-from typing import Any, Dict, List, Optional
-from pathlib import Path
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional
+
+from jira_json import dumps, load, load_path
+from jira_profile import add_arguments as add_profile_arguments, session as profile_session, stage
+from jira_stream import iter_members, iter_ndjson
 
 
 DEFAULT_FIELD_MAP = {
@@ -33,17 +42,29 @@ DEFAULT_FIELD_MAP = {
 }
 
 
+CUSTOM_FIELD_PATTERN = re.compile(r"customfield_\d+")
+
+# abspath -> (mtime, parsed map), so long-lived processes read each map once
+_field_map_cache: Dict[str, Any] = {}
+
+
 def load_field_map(map_file: Optional[str]) -> Dict[str, str]:
     """Load field mapping from JSON file or use defaults."""
-    if map_file and Path(map_file).exists():
-        with open(map_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+    import os
+
+    if map_file and os.path.exists(map_file):
+        key = os.path.abspath(map_file)
+        mtime = os.stat(key).st_mtime_ns
+        cached = _field_map_cache.get(key)
+        if cached is None or cached[0] != mtime:
+            cached = _field_map_cache[key] = (mtime, load_path(key))
+        return dict(cached[1])
     return DEFAULT_FIELD_MAP.copy()
 
 
 def is_custom_field(field_name: str) -> bool:
     """Check if field name is a custom field."""
-    return bool(re.match(r"customfield_\d+", field_name))
+    return bool(CUSTOM_FIELD_PATTERN.match(field_name))
 
 
 def normalize_field_name(field_name: str, field_map: Dict[str, str]) -> str:
@@ -53,24 +74,87 @@ def normalize_field_name(field_name: str, field_map: Dict[str, str]) -> str:
     return field_name
 
 
-def normalize_issue(issue: Dict[str, Any], field_map: Dict[str, str]) -> Dict[str, Any]:
-    """Normalize all custom fields in an issue."""
-    result = {}
-
-    for key, value in issue.items():
-        if key == "fields" and isinstance(value, dict):
-            # Normalize fields section
-            normalized_fields = {}
-            for field_key, field_value in value.items():
-                new_key = normalize_field_name(field_key, field_map)
-                normalized_fields[new_key] = field_value
-            result[key] = normalized_fields
-        else:
-            result[key] = value
+def normalize_fields(fields: Dict[str, Any], field_map: Dict[str, str],
+                     drop_unmapped: bool = False) -> Dict[str, Any]:
+    """Rename the keys of an issue's `fields` dict (values are shared, not copied).
 
+    With `drop_unmapped`, custom fields missing from `field_map` are left
+    out; the map doubles as the allow-list.
+    """
+    rename = field_map.get
+    if drop_unmapped:
+        return {rename(k, k): v for k, v in fields.items()
+                if k in field_map or not CUSTOM_FIELD_PATTERN.match(k)}
+    return {rename(k, k): v for k, v in fields.items()}
+
+
+def normalize_issue(issue: Dict[str, Any], field_map: Dict[str, str],
+                    drop_unmapped: bool = False) -> Dict[str, Any]:
+    """Normalize all custom fields in an issue."""
+    result = dict(issue)
+    fields = result.get("fields")
+    if isinstance(fields, dict):
+        result["fields"] = normalize_fields(fields, field_map, drop_unmapped)
     return result
 
 
+def _dumps(value: Any, indent: Optional[int], level: int) -> str:
+    """Serialize `value` as it would appear `level` levels deep in a whole-document dump."""
+    if indent is None:
+        return dumps(value)
+    text = dumps(value, indent)
+    return text.replace("\n", "\n" + " " * (indent * level)) if level else text
+
+
+def normalize_stream(fp: IO[str], write: Callable[[str], Any], field_map: Dict[str, str],
+                     ndjson: bool = False, drop_unmapped: bool = False,
+                     indent: Optional[int] = None) -> int:
+    """Normalize a single issue, search envelope or NDJSON export from `fp`.
+
+    Only one issue is held in memory at a time. Members are written in
+    input order, so the output matches dumping the normalized document in
+    one go. NDJSON is written back one compact issue per line. Returns the
+    number of issues written.
+    """
+    count = 0
+    if ndjson:
+        for issue in iter_ndjson(fp):
+            write(_dumps(normalize_issue(issue, field_map, drop_unmapped), None, 0) + "\n")
+            count += 1
+        return count
+
+    if indent is None:
+        open_obj, sep, colon, close_obj = "{", ",", ":", "}"
+        open_arr, close_arr = "[", "]"
+    else:
+        pad, pad2 = " " * indent, " " * (indent * 2)
+        open_obj, sep, colon, close_obj = "{\n" + pad, ",\n" + pad, ": ", "\n}"
+        open_arr, close_arr = "[\n" + pad2, "\n" + pad + "]"
+    item_sep = "," if indent is None else ",\n" + pad2
+
+    members = 0
+    for key, value in iter_members(fp):
+        write((sep if members else open_obj) + dumps(key) + colon)
+        members += 1
+        if key == "issues" and isinstance(value, Iterator):
+            # Issues are decoded lazily, one at a time
+            empty = True
+            for issue in value:
+                write((item_sep if not empty else open_arr)
+                      + _dumps(normalize_issue(issue, field_map, drop_unmapped), indent, 2))
+                empty = False
+                count += 1
+            write("[]" if empty else close_arr)
+        elif key == "fields" and isinstance(value, dict):
+            # A single issue rather than an envelope
+            write(_dumps(normalize_fields(value, field_map, drop_unmapped), indent, 1))
+            count = 1
+        else:
+            write(_dumps(value, indent, 1))
+    write((close_obj if members else "{}") + "\n")
+    return count
+
+
 def generate_field_map(issues: List[Dict[str, Any]]) -> Dict[str, str]:
     """Generate a field mapping template from issue data."""
     custom_fields = set()
@@ -142,39 +226,61 @@ def main() -> int:
         "--output", "-o",
         help="Output file (defaults to stdout)"
     )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Input is NDJSON (one issue per line); output is NDJSON too"
+    )
+    parser.add_argument(
+        "--drop-unmapped",
+        action="store_true",
+        help="Drop custom fields that are not in the field map"
+    )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent normalized output (default: compact JSON)"
+    )
+    add_profile_arguments(parser)
 
     args = parser.parse_args()
 
     try:
-        # Read input
-        if args.file:
-            with open(args.file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        else:
-            data = json.load(sys.stdin)
+        with profile_session(args.profile, args.cprofile):
+            return _main(args)
+    except json.JSONDecodeError as e:
+        sys.stderr.write(f"Error: Invalid JSON input - {e}\n")
+        return 1
+    except FileNotFoundError as e:
+        sys.stderr.write(f"Error: File not found - {e}\n")
+        return 1
+    except Exception as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
 
-        # Process based on mode
+
+def _main(args) -> int:
+    """Body of main() after argument parsing; errors propagate to main's handlers."""
+    if not (args.generate_map or args.from_meta):
+        return _normalize_main(args)
+
+    # Read input
+    with stage("load"):
+        data = load_path(args.file) if args.file else load(sys.stdin)
+
+    # Process based on mode
+    with stage("generate_map" if args.generate_map else "from_meta"):
         if args.generate_map:
             # Generate mapping template
             issues = data.get("issues", [data]) if isinstance(data, dict) else [data]
             result = generate_field_map(issues)
-        elif args.from_meta:
+        else:
             # Extract from createmeta
             result = extract_field_names_from_meta(data)
-        else:
-            # Normalize issue(s)
-            field_map = load_field_map(args.map_file)
-
-            if "issues" in data:
-                # Search results
-                data["issues"] = [normalize_issue(i, field_map) for i in data["issues"]]
-                result = data
-            else:
-                # Single issue
-                result = normalize_issue(data, field_map)
 
-        # Output
-        output = json.dumps(result, indent=2, ensure_ascii=False)
+    # Output
+    with stage("write"):
+        output = dumps(result, 2)
 
         if args.output:
             with open(args.output, "w", encoding="utf-8") as f:
@@ -182,18 +288,31 @@ def main() -> int:
         else:
             sys.stdout.write(output + "\n")
 
-        return 0
+    return 0
 
-    except json.JSONDecodeError as e:
-        sys.stderr.write(f"Error: Invalid JSON input - {e}\n")
-        return 1
-    except FileNotFoundError as e:
-        sys.stderr.write(f"Error: File not found - {e}\n")
-        return 1
-    except Exception as e:
-        sys.stderr.write(f"Error: {e}\n")
-        return 1
+
+def _normalize_main(args) -> int:
+    """Stream-normalize the input file (or stdin) to the output file (or stdout)."""
+    with stage("load_field_map"):
+        field_map = load_field_map(args.map_file)
+    indent = 2 if args.pretty else None
+    fp = open(args.file, "r", encoding="utf-8") if args.file else sys.stdin
+    try:
+        out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+        try:
+            normalize_stream(fp, out.write, field_map, ndjson=args.ndjson,
+                             drop_unmapped=args.drop_unmapped, indent=indent)
+        finally:
+            if args.output:
+                out.close()
+    finally:
+        if args.file:
+            fp.close()
+    return 0
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    from jira_pack import forward
+
+    rc = forward("normalize", sys.argv[1:])
+    raise SystemExit(main() if rc is None else rc)
@@ -0,0 +1,285 @@
+"""On-disk cache of packed issue markdown.
+
+The same store also holds pack_dashboard's phase outputs (JSON text keyed
+by phase name and input hash, under their own version string).
+
+An entry is addressed by the sha256 of (issue key, fields.updated, packer
+version, options), so an issue that has not changed since it was last
+packed is served from disk, and editing the issue or the packer simply
+misses. Layout under the cache directory:
+
+    index.sqlite            entries (digest, key, updated, size, tokens, last_used) + counters
+    objects/ab/abcdef....md packed markdown, one file per entry
+
+Entries are evicted least-recently-used first once the total size passes
+`max_bytes`. Hit/miss counters accumulate in the index across runs.
+
+`peek_identity(text)` finds the key and fields.updated of a raw issue by
+walking the head of the document, so a hit never decodes the description
+or comments.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from json.decoder import scanstring
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+INDEX_NAME = "index.sqlite"
+# Seconds to wait for another process's write; past that the cache is skipped
+LOCK_TIMEOUT = 2.0
+# Hits whose last_used stamps are buffered before one short write
+TOUCH_BATCH = 256
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+# Members to pick out: name -> result slot, or a nested spec for an object member
+_IDENTITY_SPEC = {"key": "key", "fields": {"updated": "updated"}}
+
+
+def _scan_object(text: str, pos: int, spec: Dict[str, Any], found: Dict[str, Any]) -> int:
+    """Walk the object at `pos`, filling `found` from `spec`.
+
+    Member values that are not wanted are skipped with the C decoder.
+    Returns the position after the object, or -1 once every slot is filled.
+    """
+    ws = _WHITESPACE.match
+    pos = ws(text, pos).end()
+    if text[pos] != "{":
+        raise ValueError("expected object")
+    pos = ws(text, pos + 1).end()
+    if text[pos] == "}":
+        return pos + 1
+    while True:
+        if text[pos] != '"':
+            raise ValueError("expected member name")
+        name, pos = scanstring(text, pos + 1)
+        pos = ws(text, pos).end()
+        if text[pos] != ":":
+            raise ValueError("expected ':'")
+        pos = ws(text, pos + 1).end()
+        target = spec.get(name)
+        if isinstance(target, dict) and text[pos] == "{":
+            pos = _scan_object(text, pos, target, found)
+            if pos < 0:
+                return pos
+        else:
+            value, pos = _DECODER.raw_decode(text, pos)
+            if isinstance(target, str):
+                found[target] = value
+                if len(found) == 2:
+                    return -1
+        pos = ws(text, pos).end()
+        if text[pos] == ",":
+            pos = ws(text, pos + 1).end()
+        elif text[pos] == "}":
+            return pos + 1
+        else:
+            raise ValueError("expected ',' or '}'")
+
+
+def peek_identity(text: str) -> Optional[Tuple[str, str]]:
+    """Return (key, fields.updated) of a raw issue without parsing all of it.
+
+    Members are walked in order and stop as soon as both are seen; in Jira
+    responses `key` and `fields.updated` precede the description and
+    comments, so those are never decoded. Returns None when either is
+    missing or not a string, or the head is malformed; callers then parse
+    the issue as usual.
+    """
+    found: Dict[str, Any] = {}
+    try:
+        if _scan_object(text, 0, _IDENTITY_SPEC, found) != -1:
+            return None
+    except (ValueError, IndexError):
+        return None
+    key, updated = found["key"], found["updated"]
+    if isinstance(key, str) and isinstance(updated, str):
+        return key, updated
+    return None
+
+
+class PackCache:
+    """Size-bounded LRU cache of packed issues in `cache_dir`.
+
+    Every write is its own short transaction, so concurrent runs sharing the
+    directory only wait for single statements, never for a whole batch.
+    Hits only refresh last_used, so those stamps are buffered and written
+    TOUCH_BATCH at a time (and on `put()`/`close()`). An index that stays
+    locked past LOCK_TIMEOUT turns the cache off for the rest of the run
+    (`disabled`): every get() then misses and put() stores nothing, so the
+    cache can slow packing down by one timeout at most, never stop it.
+    """
+
+    def __init__(self, cache_dir: str, version: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        import sqlite3
+
+        self.cache_dir = cache_dir
+        self.version = version
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.disabled = False
+        self._touched: Dict[str, float] = {}
+        self._db_error = sqlite3.OperationalError
+        os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+        self.db = sqlite3.connect(os.path.join(cache_dir, INDEX_NAME), timeout=LOCK_TIMEOUT,
+                                  isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " digest TEXT PRIMARY KEY, key TEXT, updated TEXT,"
+            " size INTEGER, tokens INTEGER, last_used REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_used)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)")
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def __enter__(self) -> "PackCache":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def digest(self, key: str, updated: str, options: Dict[str, Any]) -> str:
+        """Content address of an entry."""
+        ident = json.dumps([self.version, key, updated, options], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(ident.encode("utf-8")).hexdigest()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, "objects", digest[:2], digest + ".md")
+
+    def get(self, key: str, updated: str, options: Dict[str, Any]) -> Optional[Tuple[str, Optional[int]]]:
+        """Return (markdown, tokens) for a cached entry, or None on a miss."""
+        if self.disabled:
+            self.misses += 1
+            return None
+        digest = self.digest(key, updated, options)
+        try:
+            row = self.db.execute("SELECT tokens FROM entries WHERE digest = ?", (digest,)).fetchone()
+            if row is not None:
+                try:
+                    with open(self._object_path(digest), "r", encoding="utf-8") as f:
+                        markdown = f.read()
+                except FileNotFoundError:
+                    with self._transaction():
+                        self._drop([digest])
+                else:
+                    self._touched[digest] = time.time()
+                    if len(self._touched) >= TOUCH_BATCH:
+                        self._flush_touched()
+                    self.hits += 1
+                    return markdown, row[0]
+        except self._db_error:
+            self.disabled = True
+        self.misses += 1
+        return None
+
+    def put(self, key: str, updated: str, options: Dict[str, Any], markdown: str,
+            tokens: Optional[int] = None) -> None:
+        """Store packed output, evicting old entries if over the size limit."""
+        if self.disabled:
+            return
+        digest = self.digest(key, updated, options)
+        path = self._object_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = markdown.encode("utf-8")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        try:
+            self._flush_touched()
+            with self._transaction():
+                old = self.db.execute("SELECT size FROM entries WHERE digest = ?", (digest,)).fetchone()
+                self.db.execute(
+                    "INSERT OR REPLACE INTO entries (digest, key, updated, size, tokens, last_used)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (digest, key, updated, len(data), tokens, time.time()),
+                )
+            self.total_bytes += len(data) - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+        except self._db_error:
+            # The object stays unindexed; a later put of the same digest rewrites and indexes it
+            self.disabled = True
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """One short write transaction (the connection is otherwise in autocommit)."""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def _flush_touched(self) -> None:
+        """Write buffered last_used stamps of hits."""
+        if self._touched:
+            with self._transaction():
+                self.db.executemany("UPDATE entries SET last_used = ? WHERE digest = ?",
+                                    [(stamp, digest) for digest, stamp in self._touched.items()])
+            self._touched.clear()
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries until under `max_bytes`; returns entries dropped."""
+        with self._transaction():
+            self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            victims = []
+            excess = self.total_bytes - self.max_bytes
+            if excess > 0:
+                for digest, size in self.db.execute("SELECT digest, size FROM entries ORDER BY last_used"):
+                    victims.append(digest)
+                    excess -= size
+                    if excess <= 0:
+                        break
+            self._drop(victims)
+        return len(victims)
+
+    def _drop(self, digests: List[str]) -> None:
+        for digest in digests:
+            row = self.db.execute("SELECT size FROM entries WHERE digest = ?", (digest,)).fetchone()
+            self.db.execute("DELETE FROM entries WHERE digest = ?", (digest,))
+            if row:
+                self.total_bytes -= row[0]
+            try:
+                os.unlink(self._object_path(digest))
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """Entries, bytes and hit/miss counters (persisted plus this session's)."""
+        totals = dict(self.db.execute("SELECT name, value FROM counters"))
+        entries = self.db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        return {
+            "entries": entries,
+            "bytes": self.total_bytes,
+            "hits": totals.get("hits", 0) + self.hits,
+            "misses": totals.get("misses", 0) + self.misses,
+        }
+
+    def close(self) -> None:
+        """Write buffered stamps and counters, then close the index."""
+        if not self.disabled:
+            try:
+                self._flush_touched()
+                with self._transaction():
+                    for name, value in (("hits", self.hits), ("misses", self.misses)):
+                        if value:
+                            self.db.execute(
+                                "INSERT INTO counters (name, value) VALUES (?, ?)"
+                                " ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                                (name, value),
+                            )
+            except self._db_error:
+                pass
+        self.hits = self.misses = 0
+        self.db.close()
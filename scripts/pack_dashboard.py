@@ -10,19 +10,25 @@ Target audience: Chairman / C-level executives (Traditional Chinese labels)
 Usage:
     python pack_dashboard.py --data metrics.json --output dashboard.html
     python pack_dashboard.py --data metrics.json --output dashboard.html --offline
+    python pack_dashboard.py --data metrics.json --output dashboard.html --compress-data
     cat metrics.json | python pack_dashboard.py --output dashboard.html
+    python pack_dashboard.py --data metrics.json --links search_export.json --output dashboard.html
+    python pack_dashboard.py --export search_export.ndjson --data notes.json --output dashboard.html
+    python pack_dashboard.py --portfolio metrics_dir/ --out-dir dashboards/ --jobs 8
+    python pack_dashboard.py --data metrics.json --output dashboard.html --cache-dir ~/.cache/jira-dashboard
+    python pack_dashboard.py --data current_sprint.json --output dashboard.html --history ~/.cache/jira-pack/history.sqlite
 
 Input: JSON with collected Jira data (see INPUT_SCHEMA below)
 Output: Self-contained HTML dashboard file
 """
 
-import json
 import sys
-import os
-import argparse
-from datetime import datetime
-from pathlib import Path
-from statistics import mean, stdev
+
+from jira_json import dumps, load, load_path, loads
+from jira_profile import stage
+
+# argparse, datetime, pathlib and statistics are imported where they are
+# used, so `--help` and library imports stay cheap for short-lived calls.
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -63,6 +69,8 @@ def safe_div(a, b, default=0):
 
 def aggregate_metrics(data: dict) -> dict:
     """Calculate all KPIs from raw Jira data."""
+    from statistics import mean
+
     sprint = data.get("sprint", {})
     issues = data.get("issues", {})
     velocity = data.get("velocity", {})
@@ -97,6 +105,8 @@ def aggregate_metrics(data: dict) -> dict:
 def calculate_trend(values: list) -> str:
     """Determine trend direction from a list of numeric values (oldest→newest).
     Returns: 'up' (worsening), 'down' (improving), or 'flat'."""
+    from statistics import mean
+
     if len(values) < 2:
         return "flat"
     recent = values[-2:]
@@ -151,42 +161,218 @@ def calculate_trend_vectors(data: dict) -> dict:
 # ---------------------------------------------------------------------------
 
 
-def calculate_delivery_probability(data: dict) -> dict:
-    """Calculate probability of on-time delivery with confidence intervals."""
+# Monte Carlo forecast settings
+MC_TRIALS = 100_000
+MC_TRIALS_PYTHON = 5_000  # the pure-Python engine is ~100x slower per trial
+MC_MAX_DAYS = 250  # trials still open after this many days count as "later"
+MC_TAIL_DRAWS = 1_000_000  # past the deadline, a longer projected tail is run on a sample
+MC_SEED = 0  # fixed, so rebuilding from the same data gives the same numbers
+MC_PERCENTILES = (50, 85, 95)
+
+
+def _pct(p: float) -> int:
+    """Probability as a display percentage clamped to 5..99."""
+    return min(max(int(round(p * 100)), 5), 99)
+
+
+def _simulate_numpy(np, velocities: list, sprint_days: int, remaining: float, days_left: int,
+                    vel_std: float, trials: int, method: str, seed: int) -> tuple:
+    """Vectorized engine: one array op per simulated day across all trials."""
+    rng = np.random.default_rng(seed)
+    vel = np.asarray(velocities, dtype=np.float64)
+    mu = float(vel.mean())
+    base, scale, shift = mu / sprint_days, sprint_days ** -0.5, vel_std / sprint_days
+    daily_values = base + (vel - mu) * scale
+
+    sigma = vel_std * scale
+    # Random generation dominates; uint8 indices and float32 normals halve it
+    index_type = np.uint8 if len(daily_values) <= 256 else np.int64
+
+    def draw(n):
+        if method == "normal":
+            return rng.standard_normal(n, dtype=np.float32) * sigma + base
+        return daily_values.take(rng.integers(0, len(daily_values), n, dtype=index_type))
+
+    done_day = np.zeros(trials, dtype=np.int32)  # 0 = not finished within the horizon
+    cum = np.zeros(trials)
+    cum_opt = np.zeros(trials)
+    cum_pess = np.zeros(trials)
+    # Up to the deadline every trial is needed for the +/-1 sigma scenarios
+    for day in range(1, min(days_left, MC_MAX_DAYS) + 1):
+        daily = draw(trials)
+        cum_opt += np.maximum(daily + shift, 0)
+        cum_pess += np.maximum(daily - shift, 0)
+        cum += np.maximum(daily, 0)
+        done_day[(cum >= remaining) & (done_day == 0)] = day
+    on_opt = int(np.count_nonzero(cum_opt >= remaining))
+    on_pess = int(np.count_nonzero(cum_pess >= remaining))
+
+    # After it, only the trials still open are carried forward. Work far
+    # beyond the deadline would keep all of them running to MC_MAX_DAYS, so
+    # when the projected tail exceeds MC_TAIL_DRAWS a sample is run instead
+    # and its completion days weighted back up to the open count.
+    cum = cum[done_day == 0]
+    tail_days = MC_MAX_DAYS - days_left
+    if base > 0:
+        tail_days = min(tail_days, max(int(remaining / base) - days_left, 1))
+    weight = 1
+    if cum.size * tail_days > MC_TAIL_DRAWS:
+        sample = max(MC_TAIL_DRAWS // tail_days, 1)
+        weight = cum.size / sample
+        cum = cum[rng.choice(cum.size, sample, replace=False)]
+    tail = np.zeros(MC_MAX_DAYS + 1, dtype=np.int64)
+    for day in range(days_left + 1, MC_MAX_DAYS + 1):
+        if not cum.size:
+            break
+        cum += np.maximum(draw(cum.size), 0)
+        hit = cum >= remaining
+        tail[day] = np.count_nonzero(hit)
+        cum = cum[~hit]
+
+    counts = np.bincount(done_day, minlength=MC_MAX_DAYS + 1) + tail * weight
+    counts[0] = max(trials - counts[1:].sum(), 0)
+    return counts.tolist(), on_opt, on_pess
+
+
+def _simulate_python(velocities: list, sprint_days: int, remaining: float, days_left: int,
+                     vel_std: float, trials: int, method: str, seed: int) -> tuple:
+    """Pure-Python engine with the same model, for when NumPy is not installed."""
+    import random
+    from statistics import mean
+
+    rng = random.Random(seed)
+    mu = mean(velocities)
+    base, scale, shift = mu / sprint_days, sprint_days ** -0.5, vel_std / sprint_days
+    if method == "normal":
+        gauss, sigma = rng.gauss, vel_std * scale
+
+        def draw():
+            return gauss(base, sigma)
+    else:
+        choice = rng.choice
+        daily_values = [base + (v - mu) * scale for v in velocities]
+
+        def draw():
+            return choice(daily_values)
+
+    counts = [0] * (MC_MAX_DAYS + 1)
+    on_opt = on_pess = 0
+    horizon = min(days_left, MC_MAX_DAYS)
+    for _ in range(trials):
+        cum = opt = pess = 0.0
+        done = 0
+        for day in range(1, horizon + 1):
+            daily = draw()
+            if daily + shift > 0:
+                opt += daily + shift
+            if daily > shift:
+                pess += daily - shift
+            if daily > 0:
+                cum += daily
+            if not done and cum >= remaining:
+                done = day
+        on_opt += opt >= remaining
+        on_pess += pess >= remaining
+        day = horizon
+        while not done and day < MC_MAX_DAYS:
+            day += 1
+            daily = draw()
+            if daily > 0:
+                cum += daily
+            if cum >= remaining:
+                done = day
+        counts[done] += 1
+    return counts, on_opt, on_pess
+
+
+def simulate_delivery(velocities: list, sprint_days: int, remaining: float, days_left: int,
+                      trials: int = None, method: str = "bootstrap", engine: str = "auto",
+                      seed: int = MC_SEED) -> dict:
+    """Monte Carlo forecast of finishing `remaining` items within `days_left` days.
+
+    Each simulated day draws a sprint velocity from the history ("bootstrap")
+    or from a normal fit ("normal") and completes
+    mean/sprint_days + (v - mean)/sqrt(sprint_days) items, so a full
+    simulated sprint reproduces both the mean and the spread of the history.
+    Optimistic/pessimistic rerun the same draws with velocity +/-1 sigma.
+
+    Returns the on-time probabilities, completion-day percentiles and the
+    cumulative completion distribution (index i = done within i + 1 days).
+    """
+    from statistics import stdev
+
+    np = None
+    if engine in ("auto", "numpy"):
+        try:
+            import numpy as np
+        except ImportError:
+            if engine == "numpy":
+                raise ValueError("numpy engine requested but NumPy is not installed. "
+                                 "Install with: pip install numpy")
+    if trials is None:
+        trials = MC_TRIALS if np is not None else MC_TRIALS_PYTHON
+    # Sprint fields may arrive as floats (10.0); the engines count whole days
+    sprint_days, days_left = max(int(sprint_days), 1), max(int(days_left), 0)
+    vel_std = stdev(velocities) if len(velocities) > 1 else sum(velocities) / len(velocities) * 0.2
+
+    args = (velocities, sprint_days, remaining, days_left, vel_std, trials, method, seed)
+    if np is not None:
+        counts, on_opt, on_pess = _simulate_numpy(np, *args)
+    else:
+        counts, on_opt, on_pess = _simulate_python(*args)
+
+    distribution = []
+    done = 0
+    last_day = max((d for d in range(1, len(counts)) if counts[d]), default=0)
+    for day in range(1, last_day + 1):
+        done += counts[day]
+        distribution.append(round(done / trials, 4))
+    on_time = sum(counts[1:days_left + 1]) / trials
+
+    percentiles = {}
+    for q in MC_PERCENTILES:
+        percentiles[f"p{q}"] = next((day for day, p in enumerate(distribution, 1) if p >= q / 100), None)
+
+    return {
+        "expected": _pct(on_time),
+        "optimistic": _pct(on_opt / trials),
+        "pessimistic": _pct(on_pess / trials),
+        "on_time": round(on_time, 4),
+        "completion_days": percentiles,
+        "distribution": distribution,
+        "later": round(counts[0] / trials, 4),
+        "remaining": remaining,
+        "days_left": days_left,
+        "trials": trials,
+        "method": method,
+        "engine": "numpy" if np is not None else "python",
+    }
+
+
+def calculate_delivery_probability(data: dict, trials: int = None, method: str = "bootstrap",
+                                   engine: str = "auto") -> dict:
+    """Probability of on-time delivery, from a Monte Carlo forecast of the sprint.
+
+    See simulate_delivery(); `expected`/`optimistic`/`pessimistic` keep their
+    meaning (velocity as is, +1 sigma, -1 sigma) for the dashboard template.
+    """
     sprint = data.get("sprint", {})
     velocity = data.get("velocity", {})
     completed_list = velocity.get("completed", [])
 
     remaining = sprint.get("issues", {}).get("total", 0) - sprint.get("issues", {}).get("done", 0)
-    sprint_days = sprint.get("totalDays", 10)
-    days_left = max(sprint_days - sprint.get("day", 0), 0)
+    # Whole days: totalDays/day may arrive as floats, and 0.5 is no sprint at all
+    sprint_days = int(sprint.get("totalDays", 10) or 0)
+    days_left = max(sprint_days - int(sprint.get("day", 0) or 0), 0)
 
-    if not completed_list or sprint_days == 0:
+    if not completed_list or sprint_days <= 0:
         return {"expected": 50, "optimistic": 75, "pessimistic": 25}
 
-    vel_avg = mean(completed_list)
-    vel_std = stdev(completed_list) if len(completed_list) > 1 else vel_avg * 0.2
-
-    daily_capacity = vel_avg / sprint_days
-    daily_capacity_worst = max((vel_avg - vel_std) / sprint_days, 0.1)
-    daily_capacity_best = (vel_avg + vel_std) / sprint_days
-
     if remaining <= 0:
         return {"expected": 99, "optimistic": 99, "pessimistic": 95}
 
-    days_needed_expected = remaining / daily_capacity if daily_capacity > 0 else 999
-    days_needed_worst = remaining / daily_capacity_worst
-    days_needed_best = remaining / daily_capacity_best if daily_capacity_best > 0 else days_needed_expected
-
-    p_expected = min(max(int(safe_div(days_left, days_needed_expected) * 100), 5), 99)
-    p_optimistic = min(max(int(safe_div(days_left, days_needed_best) * 100), 5), 99)
-    p_pessimistic = min(max(int(safe_div(days_left, days_needed_worst) * 100), 5), 99)
-
-    return {
-        "expected": p_expected,
-        "optimistic": p_optimistic,
-        "pessimistic": p_pessimistic,
-    }
+    return simulate_delivery(completed_list, sprint_days, remaining, days_left,
+                             trials=trials, method=method, engine=engine)
 
 
 # ---------------------------------------------------------------------------
@@ -217,6 +403,8 @@ def score_from_thresholds(value, thresholds: dict, invert=False) -> int:
 
 def calculate_risk_scores(data: dict, metrics: dict) -> dict:
     """Calculate 4-category risk scores (0-100, higher=healthier)."""
+    from statistics import mean
+
     sprint = data.get("sprint", {})
     sprint_issues = sprint.get("issues", {})
     risks_input = data.get("risks", {})
@@ -318,7 +506,15 @@ def detect_risk_persistence(data: dict, current_risks: dict) -> dict:
 
 
 def analyze_dependency_chains(data: dict) -> dict:
-    """Analyze blocked issue chains for cascade risks."""
+    """Analyze blocked issue chains for cascade risks.
+
+    A "dependency_graph" computed from raw issue links (jira_deps.py, or
+    --links) is used as is; otherwise the hand-assembled chains are summarized.
+    """
+    graph = data.get("dependency_graph")
+    if graph:
+        return graph
+
     chains = data.get("dependency_chains", [])
     # Each chain: {"root": "PROJ-100", "chain": ["PROJ-101","PROJ-102"], "length": 3}
     if not chains:
@@ -481,8 +677,10 @@ def calculate_health_score(metrics: dict, risks: dict, trends: dict) -> tuple:
 # ---------------------------------------------------------------------------
 
 
-def get_template_path() -> Path:
+def get_template_path() -> "Path":
     """Locate the dashboard HTML template."""
+    from pathlib import Path
+
     script_dir = Path(__file__).parent
     template_path = script_dir.parent / "references" / "templates" / "dashboard_template.html"
     if not template_path.exists():
@@ -490,25 +688,173 @@ def get_template_path() -> Path:
     return template_path
 
 
-def generate_html(dashboard_data: dict, template_path: Path = None, offline: bool = False) -> str:
-    """Inject dashboard data JSON into HTML template."""
+DATA_PLACEHOLDER = "/*DATA_PLACEHOLDER*/"
+CHART_JS_TAG = '<script src="https://cdn.jsdelivr.net/npm/chart.js@4/dist/chart.umd.min.js"></script>'
+# Local Chart.js for --offline / --shared-chartjs; the first of --chartjs,
+# $JIRA_PACK_CHARTJS and the vendored default that exists is used
+CHARTJS_ENV = "JIRA_PACK_CHARTJS"
+CHARTJS_NAME = "chart.umd.min.js"
+CHARTJS_URL = "https://cdn.jsdelivr.net/npm/chart.js@4/dist/chart.umd.min.js"
+
+_template_cache: dict = {}
+_template_parts_cache: dict = {}
+_chartjs_cache: dict = {}
+
+
+def load_template(template_path: "Path") -> str:
+    """Read a template, cached per path and mtime for long-lived processes."""
+    import os
+
+    key = os.path.abspath(template_path)
+    mtime = os.stat(key).st_mtime_ns
+    cached = _template_cache.get(key)
+    if cached is None or cached[0] != mtime:
+        with open(key, "r", encoding="utf-8") as f:
+            cached = _template_cache[key] = (mtime, f.read())
+    return cached[1]
+
+
+def find_chartjs(path: str = None) -> "Path":
+    """The local Chart.js bundle: `path`, else $JIRA_PACK_CHARTJS, else assets/vendor/."""
+    import os
+    from pathlib import Path
+
+    chosen = path or os.environ.get(CHARTJS_ENV)
+    candidate = Path(chosen) if chosen else Path(__file__).parent.parent / "assets" / "vendor" / CHARTJS_NAME
+    if not candidate.is_file():
+        raise ValueError(f"Chart.js not found at {candidate}; offline dashboards need a local copy. "
+                         f"Download {CHARTJS_URL} there, or pass --chartjs PATH / set ${CHARTJS_ENV}")
+    return candidate
+
+
+def load_chartjs(path: "Path") -> str:
+    """Inline <script> element for a Chart.js file, read once per path and mtime."""
+    import os
+    import re
+
+    key = os.path.abspath(path)
+    mtime = os.stat(key).st_mtime_ns
+    cached = _chartjs_cache.get(key)
+    if cached is None or cached[0] != mtime:
+        with open(key, "r", encoding="utf-8") as f:
+            js = f.read()
+        # A literal "</script" would end the element early
+        js = re.sub(r"</(script)", r"<\\/\1", js, flags=re.IGNORECASE)
+        cached = _chartjs_cache[key] = (mtime, f"<script>/* {os.path.basename(key)} (inlined) */\n{js}\n</script>")
+    return cached[1]
+
+
+def write_shared_chartjs(out_dir: str, chartjs: str = None) -> str:
+    """Copy Chart.js to <out_dir>/chart.umd.min.js unless an identical copy is there; returns its path.
+
+    Dashboards written to the directory then reference the one file
+    instead of each inlining it.
+    """
+    import os
+
+    source = find_chartjs(chartjs)
+    target = os.path.join(out_dir, CHARTJS_NAME)
+    with open(source, "rb") as f:
+        content = f.read()
+    try:
+        with open(target, "rb") as f:
+            if f.read() == content:
+                return target
+    except FileNotFoundError:
+        pass
+    tmp = f"{target}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(content)
+    os.replace(tmp, target)
+    return target
+
+
+def load_template_parts(template_path: "Path", offline: bool = False, chartjs: str = None,
+                        chartjs_src: str = None) -> list:
+    """Template split around the data placeholder, with the Chart.js tag swapped as asked.
+
+    `offline` inlines the local Chart.js (see find_chartjs); `chartjs_src`
+    instead points the tag at that URL, e.g. a shared sidecar file. Cached
+    with the template and bundle, so rendering only writes the parts
+    around the data.
+    """
+    from html import escape
+
+    template = load_template(template_path)
+    script = None
+    if chartjs_src:
+        script = f'<script src="{escape(chartjs_src)}"></script>'
+    elif offline:
+        script = load_chartjs(find_chartjs(chartjs))
+    key = (template, script)
+    parts = _template_parts_cache.get(key)
+    if parts is None:
+        if script is not None:
+            template = template.replace(CHART_JS_TAG, script)
+        _template_parts_cache.clear()  # only the current version of a template is kept
+        parts = _template_parts_cache[key] = template.split(DATA_PLACEHOLDER)
+    return parts
+
+
+# Marks a template whose bootstrap can inflate gzip+base64 data (see the
+# bundled template); custom templates without it get plain JSON only.
+INFLATE_MARKER = "DecompressionStream"
+
+
+def encode_data(dashboard_data: dict, compress: bool = False) -> str:
+    """The data as a JavaScript expression for the placeholder.
+
+    Compact JSON, with "</" escaped so no string can close the <script>
+    element. `compress` instead gives a string literal of the gzipped JSON
+    in base64, which the template inflates in the browser; for large
+    epics/issues payloads that is several times smaller.
+    """
+    data_json = dumps(dashboard_data)
+    if not compress:
+        return data_json.replace("</", "<\\/")
+    import base64
+    import gzip
+
+    packed = gzip.compress(data_json.encode("utf-8"), compresslevel=6, mtime=0)
+    return '"' + base64.b64encode(packed).decode("ascii") + '"'
+
+
+def supports_compressed_data(template_path: "Path" = None) -> bool:
+    """True if the template's bootstrap inflates --compress-data payloads."""
+    parts = load_template_parts(template_path or get_template_path())
+    return len(parts) > 1 and INFLATE_MARKER in parts[-1]
+
+
+def _render_parts(dashboard_data: dict, template_path: "Path", offline: bool, compress: bool,
+                  chartjs: str, chartjs_src: str) -> tuple:
     if template_path is None:
         template_path = get_template_path()
+    parts = load_template_parts(template_path, offline, chartjs, chartjs_src)
+    if compress and INFLATE_MARKER not in parts[-1]:
+        raise ValueError(f"Template {template_path} cannot inflate compressed data; "
+                         f"use the bundled template or drop --compress-data")
+    return parts, encode_data(dashboard_data, compress)
 
-    template = template_path.read_text(encoding="utf-8")
-    data_json = json.dumps(dashboard_data, ensure_ascii=False, indent=2)
 
-    # Replace placeholder
-    html = template.replace("/*DATA_PLACEHOLDER*/", data_json)
+def generate_html(dashboard_data: dict, template_path: "Path" = None, offline: bool = False,
+                  compress: bool = False, chartjs: str = None, chartjs_src: str = None) -> str:
+    """Inject dashboard data JSON into HTML template."""
+    parts, data = _render_parts(dashboard_data, template_path, offline, compress, chartjs, chartjs_src)
+    return data.join(parts)
 
-    if offline:
-        # Inline Chart.js for offline use (placeholder - actual file would be embedded)
-        html = html.replace(
-            '<script src="https://cdn.jsdelivr.net/npm/chart.js@4/dist/chart.umd.min.js"></script>',
-            '<!-- Chart.js inlined for offline use -->\n<script>/* Chart.js would be inlined here */</script>',
-        )
 
-    return html
+def write_html(dashboard_data: dict, fp, template_path: "Path" = None, offline: bool = False,
+               compress: bool = False, chartjs: str = None, chartjs_src: str = None) -> int:
+    """Write the dashboard to the open text file `fp` part by part; returns characters written.
+
+    Same output as generate_html() without building the page as one string.
+    """
+    parts, data = _render_parts(dashboard_data, template_path, offline, compress, chartjs, chartjs_src)
+    written = fp.write(parts[0])
+    for part in parts[1:]:
+        written += fp.write(data)
+        written += fp.write(part)
+    return written
 
 
 # ---------------------------------------------------------------------------
@@ -516,37 +862,125 @@ def generate_html(dashboard_data: dict, template_path: Path = None, offline: boo
 # ---------------------------------------------------------------------------
 
 
-def build_dashboard(data: dict) -> dict:
-    """Full pipeline: raw data -> dashboard JSON ready for template injection."""
-    # Phase 1: Aggregate metrics
-    metrics = aggregate_metrics(data)
-
-    # Phase 2: Trend vectors
-    trends = calculate_trend_vectors(data)
-
-    # Phase 3: Delivery probability
-    delivery = calculate_delivery_probability(data)
-
-    # Phase 4: Risk scores
-    risks = calculate_risk_scores(data, metrics)
-
-    # Phase 5: Risk persistence
-    persistence = detect_risk_persistence(data, risks)
-
-    # Phase 6: Dependency chains
-    dependencies = analyze_dependency_chains(data)
-
-    # Phase 7: Compound risks
-    compounds = detect_compound_risks(risks, trends, data)
-
-    # Phase 8: Health score
-    health_score, health_level = calculate_health_score(metrics, risks, trends)
-
-    # Phase 9: Action recommendations
+# (name, data keys read, earlier phases read, run(inputs, results)) in
+# dependency order. A phase is handed only its declared keys, so the hash
+# of those keys plus its upstream outputs is a complete cache key.
+PHASES = [
+    ("metrics", ("sprint", "issues", "velocity"), (),
+     lambda d, r: aggregate_metrics(d)),
+    ("trends", ("velocity", "bug_trend", "scope_creep"), (),
+     lambda d, r: calculate_trend_vectors(d)),
+    ("delivery", ("sprint", "velocity"), (),
+     lambda d, r: calculate_delivery_probability(d)),
+    ("risks", ("sprint", "risks", "scope_creep", "resource", "bug_trend"), ("metrics",),
+     lambda d, r: calculate_risk_scores(d, r["metrics"])),
+    ("persistence", ("risk_history",), ("risks",),
+     lambda d, r: detect_risk_persistence(d, r["risks"])),
+    ("dependencies", ("dependency_graph", "dependency_chains"), (),
+     lambda d, r: analyze_dependency_chains(d)),
+    ("compounds", ("sprint",), ("risks", "trends"),
+     lambda d, r: detect_compound_risks(r["risks"], r["trends"], d)),
+    ("health", (), ("metrics", "risks", "trends"),
+     lambda d, r: list(calculate_health_score(r["metrics"], r["risks"], r["trends"]))),
+    ("actions", ("attention_items",), ("health", "risks", "persistence", "compounds"),
+     lambda d, r: generate_action_recommendations(r["health"][0], r["risks"], r["persistence"],
+                                                  r["compounds"], d.get("attention_items", []))),
+]
+PIPELINE_VERSION = "1"  # bump when a phase's output changes for the same inputs
+
+
+def run_phases(data: dict, cache=None, force: bool = False, report: dict = None) -> dict:
+    """Run PHASES over `data`; returns {phase name: output}.
+
+    With a cache (pack_cache.PackCache) each output is stored under the
+    hash of the phase's input slice and its upstream outputs, so a re-run
+    recomputes only the phases whose inputs changed. An upstream phase that
+    recomputes to the same output does not invalidate its dependents.
+    `force` recomputes (and re-stores) everything. `report`, if given, is
+    filled with "cached" or "computed" per phase.
+    """
+    import hashlib
+
+    results = {}
+    digests = {}
+    for name, reads, after, run in PHASES:
+        inputs = {k: data[k] for k in reads if k in data}
+        if cache is None:
+            with stage(name):
+                results[name] = run(inputs, results)
+            if report is not None:
+                report[name] = "computed"
+            continue
+
+        ident = dumps([inputs, [digests[p] for p in after]], sort_keys=True)
+        key = hashlib.sha256(ident.encode("utf-8")).hexdigest()
+        hit = None
+        if not force:
+            with stage(f"{name} (cache lookup)"):
+                hit = cache.get(name, key, {})
+        if hit is not None:
+            text = hit[0]
+            results[name] = loads(text)
+        else:
+            with stage(name):
+                results[name] = run(inputs, results)
+            text = dumps(results[name])
+            cache.put(name, key, {}, text)
+        digests[name] = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        if report is not None:
+            report[name] = "computed" if hit is None else "cached"
+    return results
+
+
+def open_pipeline_cache(cache_dir: str, max_mb: int = 64):
+    """PackCache for phase outputs in `cache_dir`."""
+    import os
+
+    from pack_cache import PackCache
+
+    return PackCache(os.path.expanduser(cache_dir), f"dashboard-{PIPELINE_VERSION}", max_mb * 1024 * 1024)
+
+
+def open_history(path: str, window: int = None):
+    """jira_history.HistoryStore at `path`."""
+    from jira_history import DEFAULT_WINDOW, HistoryStore
+
+    return HistoryStore(path, window=window or DEFAULT_WINDOW)
+
+
+def build_dashboard(data: dict, cache=None, force: bool = False, report: dict = None, history=None) -> dict:
+    """Full pipeline: raw data -> dashboard JSON ready for template injection.
+
+    `cache`, `force` and `report` are passed to run_phases(). With a
+    `history` store (jira_history.HistoryStore) the velocity, scope, bug
+    and risk series are recorded there and extended from earlier runs, and
+    this sprint's risk levels are recorded after the phases run.
+    """
+    from datetime import datetime
+
+    if not isinstance(data, dict):
+        raise ValueError(f"metrics data must be a JSON object, not {type(data).__name__}")
+    if not isinstance(data.get("project") or {}, dict):
+        raise ValueError(f"project must be an object, not {type(data['project']).__name__}")
+    if history is not None:
+        project_key = (data.get("project") or {}).get("key")
+        if not project_key:
+            raise ValueError("--history needs project.key in the data")
+        with stage("history"):
+            data = history.merge(project_key, data)
+    with stage("phases"):
+        phases = run_phases(data, cache, force, report)
+    if history is not None:
+        from jira_history import current_sprint
+
+        sprint_label = current_sprint(data)
+        if sprint_label:
+            history.record_risks(project_key, sprint_label, phases["risks"])
+    metrics = phases["metrics"]
+    health_score, health_level = phases["health"]
     attention_items = data.get("attention_items", [])
-    actions = generate_action_recommendations(health_score, risks, persistence, compounds, attention_items)
 
-    # Phase 10: Strategic insights (text summaries for the panel)
+    # Strategic insights (text summaries for the panel)
     strategic_insights = data.get("strategic_insights", [])  # Agent fills this via LLM reasoning
 
     # Assemble dashboard data
@@ -556,66 +990,446 @@ def build_dashboard(data: dict) -> dict:
         "date_range": data.get("date_range", ""),
         "sprint": data.get("sprint", {}),
         "health": {"score": health_score, "level": health_level},
-        "delivery_probability": delivery,
+        "delivery_probability": phases["delivery"],
         "kpi": {
             "completion_rate": round(metrics["overall_completion_rate"] * 100, 1),
             "sprint_completion_rate": round(metrics["sprint_completion_rate"] * 100, 1),
             "avg_velocity": metrics["avg_velocity"],
             "active_issues": metrics["active_issues"],
         },
-        "trends": trends,
-        "risks": risks,
-        "risk_persistence": persistence,
-        "dependencies": dependencies,
-        "compound_risks": compounds,
+        "trends": phases["trends"],
+        "risks": phases["risks"],
+        "risk_persistence": phases["persistence"],
+        "dependencies": phases["dependencies"],
+        "compound_risks": phases["compounds"],
         "issues": data.get("issues", {}),
         "velocity": data.get("velocity", {}),
         "epics": data.get("epics", []),
         "attention_items": attention_items,
-        "actions": actions,
+        "actions": phases["actions"],
         "strategic_insights": strategic_insights,
     }
 
     return dashboard
 
 
+# ---------------------------------------------------------------------------
+# Portfolio (many projects)
+# ---------------------------------------------------------------------------
+
+HEALTH_LABELS = {"healthy": "\u5065\u5eb7", "warning": "\u6ce8\u610f", "danger": "\u8b66\u544a"}  # same as the template
+PORTFOLIO_INDEX = "index.html"
+
+# Build options (template_path, offline, chartjs, shared_chartjs, compress,
+# cache_dir, cache_max_mb, force, history, history_window); set in each
+# pool worker by _init_worker
+_worker_options: dict = {}
+
+
+def find_portfolio_inputs(source: str, out_dir: str) -> list:
+    """(data_path, output_path) pairs for a portfolio run.
+
+    `source` is a directory of metrics *.json files, or a JSON manifest
+    listing paths or {"data": ..., "output": ...} objects (relative paths
+    resolve against the manifest). Outputs default to <out_dir>/<stem>.html.
+    """
+    import os
+
+    if os.path.isdir(source):
+        names = sorted(n for n in os.listdir(source) if n.endswith(".json"))
+        entries = [os.path.join(source, n) for n in names]
+        base = source
+    else:
+        entries = load_path(source)
+        if isinstance(entries, dict):
+            entries = entries.get("projects", [])
+        base = os.path.dirname(os.path.abspath(source))
+
+    pairs = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"data": entry}
+        data_path = os.path.join(base, entry["data"])
+        output = entry.get("output")
+        if output is None:
+            output = os.path.splitext(os.path.basename(data_path))[0] + ".html"
+        pairs.append((data_path, os.path.join(out_dir, output)))
+    return pairs
+
+
+def _chartjs_src(options: dict, output_path: str) -> str:
+    """Relative URL from a dashboard to the shared Chart.js file, if one is used."""
+    import os
+
+    shared = options.get("shared_chartjs")
+    if not shared:
+        return None
+    return os.path.relpath(shared, os.path.dirname(os.path.abspath(output_path))).replace(os.sep, "/")
+
+
+def _init_worker(options: dict) -> None:
+    """Pool initializer: keep the build options and read the template (and Chart.js) once per worker."""
+    _worker_options.update(options)
+    load_template_parts(options["template_path"], options.get("offline", False), options.get("chartjs"))
+
+
+def build_one(data_path: str, output_path: str, options: dict = None) -> dict:
+    """Build and write one project's dashboard; returns its portfolio summary row.
+
+    Any error is reported in the row ("error") rather than raised, so one
+    bad metrics file does not stop the rest of the portfolio. With a cache_dir
+    (or history) the phase cache (history store) is opened per project,
+    keeping each sqlite write short while other workers share the file.
+    """
+    import os
+
+    if options is None:
+        options = _worker_options
+    summary = {"data": data_path, "output": output_path, "error": None}
+    report = {}
+    try:
+        with stage("load", path=data_path):
+            data = load_path(data_path)
+        history = open_history(options["history"], options.get("history_window")) if options.get("history") else None
+        try:
+            if options.get("cache_dir"):
+                with open_pipeline_cache(options["cache_dir"], options.get("cache_max_mb", 64)) as cache:
+                    dashboard = build_dashboard(data, cache, options.get("force", False), report, history)
+            else:
+                dashboard = build_dashboard(data, history=history)
+        finally:
+            if history is not None:
+                history.close()
+        with stage("write_html"):
+            with open(output_path, "w", encoding="utf-8") as f:
+                write_html(dashboard, f, options["template_path"], options.get("offline", False),
+                           options.get("compress", False), options.get("chartjs"),
+                           _chartjs_src(options, output_path))
+        project = dashboard.get("project") or {}
+        stem = os.path.splitext(os.path.basename(data_path))[0]
+        row = {
+            "key": project.get("key") or stem,
+            "name": project.get("name", ""),
+            "health_score": dashboard["health"]["score"],
+            "health_level": dashboard["health"]["level"],
+            "delivery_expected": dashboard["delivery_probability"].get("expected"),
+            "immediate": len(dashboard["actions"]["immediate"]),
+            "this_week": len(dashboard["actions"]["this_week"]),
+            "monitor": len(dashboard["actions"]["monitor"]),
+            "phases_cached": sum(1 for state in report.values() if state == "cached"),
+        }
+    except Exception as e:
+        summary["error"] = f"{type(e).__name__}: {e}"
+        return summary
+
+    summary.update(row)
+    return summary
+
+
+def build_portfolio(pairs: list, options: dict = None, jobs: int = 1) -> list:
+    """Build every (data_path, output_path) dashboard; summaries in input order.
+
+    `options` holds template_path, offline, chartjs, shared_chartjs (path
+    of the Chart.js file the dashboards reference), compress, cache_dir,
+    cache_max_mb, force, history and history_window. With jobs > 1 the projects run across a
+    process pool whose workers each load and split the template (and read
+    Chart.js) once; jobs=1 runs inline.
+    """
+    options = dict(options or {})
+    if options.get("template_path") is None:
+        options["template_path"] = get_template_path()
+    if jobs <= 1 or len(pairs) <= 1:
+        load_template_parts(options["template_path"], options.get("offline", False), options.get("chartjs"))
+        return [build_one(d, o, options) for d, o in pairs]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    data_paths, output_paths = zip(*pairs)
+    chunksize = max(1, len(pairs) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(options,)) as pool:
+        return list(pool.map(build_one, data_paths, output_paths, chunksize=chunksize))
+
+
+def render_portfolio_index(summaries: list, index_dir: str = ".", generated_at: str = None) -> str:
+    """Roll-up page linking every dashboard, ranked by health score (worst first).
+
+    Links are relative to `index_dir`, where the page is written.
+    """
+    import os
+    from datetime import datetime
+    from html import escape
+
+    ok = sorted((s for s in summaries if not s["error"]), key=lambda s: (s["health_score"], s["key"]))
+    if generated_at is None:
+        generated_at = datetime.now().isoformat(timespec="seconds")
+    counts = {level: 0 for level in HEALTH_LABELS}
+    for s in ok:
+        counts[s["health_level"]] = counts.get(s["health_level"], 0) + 1
+
+    rows = []
+    for rank, s in enumerate(ok, 1):
+        delivery = "--" if s["delivery_expected"] is None else f"{s['delivery_expected']}%"
+        rows.append(
+            f'<tr class="{escape(s["health_level"])}"><td>{rank}</td>'
+            f'<td>{escape(str(s["key"]))} {escape(str(s["name"]))}</td>'
+            f'<td class="num">{s["health_score"]}</td>'
+            f'<td>{escape(HEALTH_LABELS.get(s["health_level"], s["health_level"]))}</td>'
+            f'<td class="num">{delivery}</td>'
+            f'<td class="num">{s["immediate"]}</td>'
+            f'<td><a href="{escape(os.path.relpath(s["output"], index_dir))}">\u958b\u555f</a></td></tr>'
+        )
+    failed = [s for s in summaries if s["error"]]
+    if failed:
+        items = "".join(f"<li>{escape(s['data'])}: {escape(s['error'])}</li>" for s in failed)
+        failed_html = f"<h2>\u672a\u80fd\u7522\u751f ({len(failed)})</h2><ul>{items}</ul>"
+    else:
+        failed_html = ""
+
+    summary_line = " / ".join(f"{HEALTH_LABELS[level]} {counts[level]}" for level in HEALTH_LABELS)
+    return f"""<!DOCTYPE html>
+<html lang="zh-Hant">
+<head>
+<meta charset="UTF-8">
+<title>\u5c08\u6848\u7d44\u5408\u7e3d\u89bd</title>
+<style>
+body {{ font-family: -apple-system, "Noto Sans TC", sans-serif; margin: 2rem; color: #1f2937; }}
+table {{ border-collapse: collapse; width: 100%; }}
+th, td {{ padding: .5rem .75rem; border-bottom: 1px solid #e5e7eb; text-align: left; }}
+td.num {{ text-align: right; font-variant-numeric: tabular-nums; }}
+tr.healthy td:nth-child(4) {{ color: #15803d; }}
+tr.warning td:nth-child(4) {{ color: #b45309; }}
+tr.danger td:nth-child(4) {{ color: #b91c1c; font-weight: 600; }}
+</style>
+</head>
+<body>
+<h1>\u5c08\u6848\u7d44\u5408\u7e3d\u89bd</h1>
+<p>{escape(generated_at)} \u00b7 {len(ok)} \u500b\u5c08\u6848 \u00b7 {summary_line}</p>
+<table>
+<thead><tr><th>\u6392\u540d</th><th>\u5c08\u6848</th><th>\u5065\u5eb7\u5206\u6578</th><th>\u72c0\u614b</th><th>\u4ea4\u4ed8\u6a5f\u7387</th><th>\u7acb\u5373\u884c\u52d5</th><th>\u5100\u8868\u677f</th></tr></thead>
+<tbody>
+{chr(10).join(rows)}
+</tbody>
+</table>
+{failed_html}
+</body>
+</html>
+"""
+
+
+def run_portfolio(source: str, out_dir: str, options: dict = None, jobs: int = 1) -> int:
+    """CLI body of --portfolio: build all dashboards plus the ranked index page.
+
+    A true `share_chartjs` option writes Chart.js into out_dir once for all
+    dashboards to reference (see write_shared_chartjs).
+    """
+    import os
+
+    pairs = find_portfolio_inputs(source, out_dir)
+    if not pairs:
+        sys.stderr.write(f"Error: no metrics files found in {source}\n")
+        return 1
+    os.makedirs(out_dir, exist_ok=True)
+    options = dict(options or {})
+    if options.pop("share_chartjs", False):
+        options["shared_chartjs"] = write_shared_chartjs(out_dir, options.get("chartjs"))
+    summaries = build_portfolio(pairs, options, jobs)
+
+    index_path = os.path.join(out_dir, PORTFOLIO_INDEX)
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write(render_portfolio_index(summaries, out_dir))
+
+    failed = [s for s in summaries if s["error"]]
+    for s in failed:
+        sys.stderr.write(f"Error: {s['data']}: {s['error']}\n")
+    built = len(summaries) - len(failed)
+    print(f"\u2705 Portfolio generated: {index_path}")
+    print(f"   Dashboards: {built} built, {len(failed)} failed")
+    if built:
+        worst = min((s for s in summaries if not s["error"]), key=lambda s: (s["health_score"], s["key"]))
+        print(f"   Lowest health: {worst['key']} ({worst['health_score']}, {worst['health_level']})")
+    if built and (options or {}).get("cache_dir"):
+        cached = sum(s["phases_cached"] for s in summaries if not s["error"])
+        print(f"   Phases: {cached} cached, {built * len(PHASES) - cached} computed")
+    return 1 if failed else 0
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
 
 
+def _print_cache_stats(args) -> int:
+    """Report entries, size and hit/miss counters for --cache-dir."""
+    if not args.cache_dir:
+        sys.stderr.write("Error: --cache-stats requires --cache-dir\n")
+        return 1
+    cache = open_pipeline_cache(args.cache_dir, args.cache_max_mb)
+    try:
+        stats = cache.stats()
+    finally:
+        cache.close()
+    lookups = stats["hits"] + stats["misses"]
+    rate = f" ({stats['hits'] / lookups:.0%} hit rate)" if lookups else ""
+    print(f"Cache: {args.cache_dir}")
+    print(f"  entries: {stats['entries']} ({stats['bytes'] / 1024:.1f} KB of {args.cache_max_mb} MB)")
+    print(f"  phase hits: {stats['hits']}, misses: {stats['misses']}{rate}")
+    return 0
+
+
 def main():
+    import argparse
+
+    from jira_profile import add_arguments as add_profile_arguments, session as profile_session
+
     parser = argparse.ArgumentParser(description="Generate executive dashboard HTML from Jira data")
     parser.add_argument("--data", type=str, help="Input JSON file path (or stdin if omitted)")
-    parser.add_argument("--output", type=str, required=True, help="Output HTML file path")
+    parser.add_argument("--output", type=str, help="Output HTML file path")
     parser.add_argument("--template", type=str, help="Custom template path (optional)")
-    parser.add_argument("--offline", action="store_true", help="Inline Chart.js for offline use")
+    parser.add_argument("--offline", action="store_true",
+                        help=f"Inline a local Chart.js so charts render without network "
+                             f"(--chartjs, ${CHARTJS_ENV} or assets/vendor/{CHARTJS_NAME})")
+    parser.add_argument("--chartjs", metavar="PATH", help="Local Chart.js file for --offline / --shared-chartjs")
+    parser.add_argument("--shared-chartjs", action="store_true",
+                        help=f"Write the local Chart.js once as {CHARTJS_NAME} beside the output(s) "
+                             f"and reference it instead of inlining it in every dashboard")
+    parser.add_argument("--compress-data", action="store_true",
+                        help="Embed the data gzipped and base64-encoded, inflated in the browser "
+                             "(smaller files for large dashboards)")
+    parser.add_argument("--export", metavar="EXPORT",
+                        help="Raw search export (.json envelope or .ndjson) to derive the counts from "
+                             "(jira_metrics.py); --data members override them")
+    parser.add_argument("--map", help="Field map JSON (normalize_fields format) locating sprint/epic_link/"
+                                      "epic_name/flagged in --export (default: the built-in map)")
+    parser.add_argument("--links", metavar="EXPORT",
+                        help="Search export (.json envelope or .ndjson) whose issue links feed the dependency analysis")
+    parser.add_argument("--portfolio", metavar="DIR_OR_MANIFEST",
+                        help="Build a dashboard per metrics file plus a ranked index.html")
+    parser.add_argument("--out-dir", default="dashboards", help="Portfolio output directory (default: dashboards)")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Portfolio worker processes (0 = all CPUs)")
+    parser.add_argument("--cache-dir", help="Reuse phase outputs whose inputs are unchanged since an earlier run")
+    parser.add_argument("--cache-max-mb", type=int, default=64, help="Size limit for --cache-dir (default: 64)")
+    parser.add_argument("--force", action="store_true", help="Recompute every phase, refreshing --cache-dir")
+    parser.add_argument("--cache-stats", action="store_true",
+                        help="Print entries, size and hit/miss counters for --cache-dir and exit")
+    parser.add_argument("--history", metavar="DB",
+                        help="Sprint history store (jira_history.py): record this run's series and risk levels "
+                             "and fill earlier sprints from it, so --data needs only the current sprint")
+    parser.add_argument("--history-window", type=int, default=6,
+                        help="Sprints/weeks of history fed to trends and forecasts (default: 6)")
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
+    if args.cache_stats:
+        return _print_cache_stats(args)
+    if not args.portfolio and not args.output:
+        parser.error("--output is required (or use --portfolio)")
+    if args.compress_data and args.template:
+        from pathlib import Path
+
+        if not supports_compressed_data(Path(args.template)):
+            parser.error(f"--compress-data needs a template that inflates the data "
+                         f"(see inflateDashboardData in the bundled template): {args.template}")
+    if args.offline or args.shared_chartjs or args.chartjs:
+        try:
+            find_chartjs(args.chartjs)
+        except ValueError as e:
+            parser.error(str(e))
+    with profile_session(args.profile, args.cprofile):
+        return _main(args)
+
+
+def _main(args) -> int:
+    """Body of main() after argument parsing (profiled as one session)."""
+    from pathlib import Path
+
+    if args.portfolio:
+        import os
+
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        options = {
+            "template_path": Path(args.template) if args.template else None,
+            "offline": args.offline,
+            "chartjs": args.chartjs,
+            "share_chartjs": args.shared_chartjs,
+            "compress": args.compress_data,
+            "cache_dir": args.cache_dir,
+            "cache_max_mb": args.cache_max_mb,
+            "force": args.force,
+            "history": args.history,
+            "history_window": args.history_window,
+        }
+        return run_portfolio(args.portfolio, args.out_dir, options, jobs)
+
     # Read input
-    if args.data:
-        with open(args.data, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    else:
-        data = json.load(sys.stdin)
+    with stage("load"):
+        if args.data:
+            data = load_path(args.data)
+        elif args.export:
+            data = {}
+        else:
+            data = load(sys.stdin)
 
-    # Build dashboard
-    dashboard_data = build_dashboard(data)
+    if args.export:
+        from jira_metrics import aggregate_export
+        from normalize_fields import load_field_map
 
-    # Generate HTML
-    template_path = Path(args.template) if args.template else None
-    html = generate_html(dashboard_data, template_path, offline=args.offline)
+        with stage("aggregate"):
+            with open(args.export, "r", encoding="utf-8") as f:
+                derived = aggregate_export(f, ndjson=args.export.endswith((".ndjson", ".jsonl")),
+                                           field_map=load_field_map(args.map))
+        derived.update(data)
+        data = derived
+
+    if args.links:
+        from jira_deps import analyze_export
+
+        with stage("links"):
+            with open(args.links, "r", encoding="utf-8") as f:
+                data.update(analyze_export(f, ndjson=args.links.endswith((".ndjson", ".jsonl"))))
 
-    # Write output
+    # Build dashboard
+    report = {}
+    history = open_history(args.history, args.history_window) if args.history else None
+    try:
+        with stage("build_dashboard"):
+            if args.cache_dir:
+                with open_pipeline_cache(args.cache_dir, args.cache_max_mb) as cache:
+                    dashboard_data = build_dashboard(data, cache, args.force, report, history)
+            else:
+                dashboard_data = build_dashboard(data, history=history)
+    except ValueError as e:
+        sys.stderr.write(f"Error: {e}\n")
+        return 1
+    finally:
+        if history is not None:
+            history.close()
+
+    # Write HTML
+    template_path = Path(args.template) if args.template else None
     output_path = Path(args.output)
-    output_path.write_text(html, encoding="utf-8")
+    chartjs_src = None
+    if args.shared_chartjs:
+        shared = write_shared_chartjs(str(output_path.parent), args.chartjs)
+        chartjs_src = _chartjs_src({"shared_chartjs": shared}, str(output_path))
+    with stage("write_html"):
+        with open(output_path, "w", encoding="utf-8") as f:
+            write_html(dashboard_data, f, template_path, offline=args.offline, compress=args.compress_data,
+                       chartjs=args.chartjs, chartjs_src=chartjs_src)
     print(f"\u2705 Dashboard generated: {output_path}")
     print(f"   Health: {dashboard_data['health']['score']} ({dashboard_data['health']['level']})")
     print(f"   Delivery probability: {dashboard_data['delivery_probability']['expected']}%")
     print(f"   Actions: {len(dashboard_data['actions']['immediate'])} immediate, "
           f"{len(dashboard_data['actions']['this_week'])} this week, "
           f"{len(dashboard_data['actions']['monitor'])} monitor")
+    if report:
+        computed = [name for name, state in report.items() if state == "computed"]
+        print(f"   Phases: {len(report) - len(computed)} cached, {len(computed)} computed"
+              + (f" ({', '.join(computed)})" if computed else ""))
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    from jira_pack import forward
+
+    rc = forward("dashboard", sys.argv[1:])
+    raise SystemExit(main() if rc is None else rc)
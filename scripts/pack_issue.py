@@ -4,6 +4,12 @@
 Usage:
     python pack_issue.py issue.json > issue_packed.md
     cat issue.json | python pack_issue.py > issue_packed.md
+    python pack_issue.py --batch issues/ search.json "raw/*.json" --out-dir packed/
+    python pack_issue.py --batch --ndjson --jobs 4 < export.ndjson > all_packed.md
+    python pack_issue.py issue.json --budget 800 > issue_packed.md
+    python pack_issue.py issue.json --cache-dir ~/.cache/jira-pack > issue_packed.md
+    python pack_issue.py --project search.json > issues_slim.ndjson
+    python pack_issue.py --fields-param
 
 Input: JSON from Jira (issue object)
 Output: compact markdown to paste into LLM
@@ -14,8 +20,25 @@ reducing token usage by 70-90% compared to raw JSON.
 
 import json
 import sys
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
+from jira_fields import (  # noqa: F401 (get_path re-exported)
+    compile_path, compile_projection, fields_param, format_date, get_path, truncate_text,
+)
+from jira_json import dumps, loads
+from jira_profile import add_arguments as add_profile_arguments, session as profile_session, stage
+from jira_stream import iter_issues
+
+BATCH_DELIMITER = "\n---\n\n"
+BATCH_SUFFIXES = (".json", ".ndjson", ".jsonl")
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+# Issues per task handed to a worker process; amortizes pickling overhead
+BATCH_CHUNK = 64
+# Part of every cache key; bump whenever the packed output changes
+PACK_VERSION = "3"
+
+# Every path the packer reads (lists along a path are traversed); drives
+# --project and --fields-param
 KEEP_FIELDS = [
     ("key", None),
     ("fields.summary", None),
@@ -25,59 +48,57 @@ KEEP_FIELDS = [
     ("fields.assignee.displayName", None),
     ("fields.reporter.displayName", None),
     ("fields.labels", []),
-    ("fields.components", []),
+    ("fields.components.name", []),
     ("fields.created", None),
     ("fields.updated", None),
     ("fields.description", ""),
     ("fields.resolution.name", None),
-    ("fields.fixVersions", []),
+    ("fields.fixVersions.name", []),
+    ("fields.comment.comments.author.displayName", None),
+    ("fields.comment.comments.created", None),
+    ("fields.comment.comments.body", ""),
 ]
+project_issue = compile_projection(path for path, _ in KEEP_FIELDS)
 
-
-def get_path(obj: Dict[str, Any], path: str, default: Any = None) -> Any:
-    """Safely navigate nested dictionary using dot notation."""
-    cur: Any = obj
-    for part in path.split("."):
-        if isinstance(cur, dict) and part in cur:
-            cur = cur[part]
-        else:
-            return default
-    return cur
-
-
-def format_date(date_str: Optional[str]) -> str:
-    """Format ISO date to readable format."""
-    if not date_str:
-        return ""
-    # Take just the date part: 2024-01-15T10:30:00.000+0000 -> 2024-01-15
-    return date_str[:10] if len(date_str) >= 10 else date_str
-
-
-def truncate_text(text: str, max_length: int = 4000) -> str:
-    """Truncate text with indication if truncated."""
-    if len(text) <= max_length:
-        return text
-    return text[:max_length - 20] + "\n\n...(truncated)"
+# Compiled accessors for the per-issue lookups in _meta_lines/_comment_parts
+_KEY = compile_path("key")
+_SUMMARY = compile_path("fields.summary")
+_STATUS = compile_path("fields.status.name")
+_ISSUETYPE = compile_path("fields.issuetype.name")
+_PRIORITY = compile_path("fields.priority.name")
+_ASSIGNEE = compile_path("fields.assignee.displayName")
+_REPORTER = compile_path("fields.reporter.displayName")
+_RESOLUTION = compile_path("fields.resolution.name")
+_CREATED = compile_path("fields.created")
+_UPDATED = compile_path("fields.updated")
+_LABELS = compile_path("fields.labels")
+_COMPONENTS = compile_path("fields.components")
+_FIX_VERSIONS = compile_path("fields.fixVersions")
+_DESCRIPTION = compile_path("fields.description")
+_COMMENTS = compile_path("fields.comment.comments")
+_COMMENT_AUTHOR = compile_path("author.displayName")
+_COMMENT_CREATED = compile_path("created")
+_COMMENT_BODY = compile_path("body")
 
 
-def pack_issue(raw: Dict[str, Any]) -> str:
-    """Convert raw Jira issue JSON to compact markdown."""
+def _meta_lines(raw: Dict[str, Any]) -> List[str]:
+    """Title and Meta section lines."""
     out = []
 
-    key = get_path(raw, "key", "(no-key)")
-    summary = get_path(raw, "fields.summary", "(no summary)")
+    key = _KEY(raw, "(no-key)")
+    summary = _SUMMARY(raw, "(no summary)")
     out.append(f"# {key} — {summary}")
     out.append("")
 
     # Meta section
-    status = get_path(raw, "fields.status.name", "")
-    itype = get_path(raw, "fields.issuetype.name", "")
-    prio = get_path(raw, "fields.priority.name", "")
-    assignee = get_path(raw, "fields.assignee.displayName", "")
-    reporter = get_path(raw, "fields.reporter.displayName", "")
-    resolution = get_path(raw, "fields.resolution.name", "")
-    created = format_date(get_path(raw, "fields.created", ""))
-    updated = format_date(get_path(raw, "fields.updated", ""))
+    status = _STATUS(raw, "")
+    itype = _ISSUETYPE(raw, "")
+    prio = _PRIORITY(raw, "")
+    assignee = _ASSIGNEE(raw, "")
+    reporter = _REPORTER(raw, "")
+    resolution = _RESOLUTION(raw, "")
+    created = format_date(_CREATED(raw, ""))
+    updated = format_date(_UPDATED(raw, ""))
 
     out.append("## Meta")
     out.append(f"- **Type**: {itype}")
@@ -95,12 +116,12 @@ def pack_issue(raw: Dict[str, Any]) -> str:
         out.append(f"- **Updated**: {updated}")
 
     # Labels
-    labels = get_path(raw, "fields.labels", []) or []
+    labels = _LABELS(raw, []) or []
     if labels:
         out.append(f"- **Labels**: {', '.join(labels)}")
 
     # Components
-    comps = get_path(raw, "fields.components", []) or []
+    comps = _COMPONENTS(raw, []) or []
     if comps:
         names = [c.get("name", "") for c in comps if isinstance(c, dict)]
         names = [n for n in names if n]
@@ -108,100 +129,853 @@ def pack_issue(raw: Dict[str, Any]) -> str:
             out.append(f"- **Components**: {', '.join(names)}")
 
     # Fix Versions
-    versions = get_path(raw, "fields.fixVersions", []) or []
+    versions = _FIX_VERSIONS(raw, []) or []
     if versions:
         names = [v.get("name", "") for v in versions if isinstance(v, dict)]
         names = [n for n in names if n]
         if names:
             out.append(f"- **Fix Versions**: {', '.join(names)}")
 
+    return out
+
+
+def _comment_parts(comment: Dict[str, Any]) -> Tuple[str, str]:
+    """Heading line and plain-text body of one comment."""
+    author = _COMMENT_AUTHOR(comment, "Unknown")
+    created = format_date(_COMMENT_CREATED(comment, ""))
+    body = _COMMENT_BODY(comment, "")
+    if isinstance(body, dict):
+        body = render_adf(body)
+    return f"\n**{author}** ({created}):", body
+
+
+def pack_issue(raw: Dict[str, Any], budget: Optional[int] = None,
+               count_tokens: Optional[Callable[[str], int]] = None) -> str:
+    """Convert raw Jira issue JSON to compact markdown.
+
+    With `budget`, output is sized to that many tokens instead of the fixed
+    character limits (see pack_issue_budget).
+    """
+    if budget is not None:
+        return pack_issue_budget(raw, budget, count_tokens)[0]
+
+    out = _meta_lines(raw)
+
     # Description
     out.append("")
     out.append("## Description")
-    desc = get_path(raw, "fields.description", "") or ""
+    desc = _DESCRIPTION(raw, "") or ""
 
     if isinstance(desc, dict):
         # Atlassian Document Format (ADF) - extract text content
-        out.append(_extract_adf_text(desc))
+        out.append(render_adf(desc))
     else:
         desc = desc.strip()
         out.append(truncate_text(desc))
 
     # Comments (if present)
-    comments = get_path(raw, "fields.comment.comments", [])
+    comments = _COMMENTS(raw, [])
     if comments:
         out.append("")
         out.append("## Recent Comments")
         # Show last 3 comments only
         for comment in comments[-3:]:
-            author = get_path(comment, "author.displayName", "Unknown")
-            created = format_date(get_path(comment, "created", ""))
-            body = get_path(comment, "body", "")
-            if isinstance(body, dict):
-                body = _extract_adf_text(body)
-            body = truncate_text(body, 500)
-            out.append(f"\n**{author}** ({created}):")
-            out.append(body)
+            heading, body = _comment_parts(comment)
+            out.append(heading)
+            out.append(truncate_text(body, 500))
 
     return "\n".join(out) + "\n"
 
 
-def _extract_adf_text(adf: Dict[str, Any], depth: int = 0) -> str:
-    """Extract plain text from Atlassian Document Format."""
-    if depth > 10:  # Prevent infinite recursion
+# ---------------------------------------------------------------------------
+# Token budget
+# ---------------------------------------------------------------------------
+
+# Share of the post-meta budget held back for comments when both compete
+COMMENT_SHARE = 0.3
+# Smallest slice worth spending on a truncated comment body
+MIN_SECTION_TOKENS = 16
+TOKEN_CACHE_SIZE = 8192
+TRUNCATION_MARKER = "\n\n...(truncated)"
+
+
+def estimate_tokens(text: str) -> int:
+    """Fast token estimate: ~4 characters per token, one per CJK character."""
+    if text.isascii():
+        return (len(text) + 3) // 4
+    wide = sum(1 for ch in text if ch >= "\u2e80")
+    return wide + (len(text) - wide + 3) // 4
+
+
+def _tiktoken_counter() -> Callable[[str], int]:
+    try:
+        import tiktoken
+    except ImportError:
+        raise ValueError("tokenizer 'tiktoken' requires the tiktoken package "
+                         "(pip install tiktoken); use --tokenizer estimate")
+    encoding = tiktoken.get_encoding("cl100k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+TOKENIZERS: Dict[str, Callable[[], Callable[[str], int]]] = {
+    "estimate": lambda: estimate_tokens,
+    "tiktoken": _tiktoken_counter,
+}
+_token_counters: Dict[str, Callable[[str], int]] = {}
+
+
+def get_token_counter(name: str = "estimate") -> Callable[[str], int]:
+    """Return the named token counter, memoized per string and per process.
+
+    Register other tokenizers by adding a factory to TOKENIZERS.
+    """
+    if name not in _token_counters:
+        if name not in TOKENIZERS:
+            raise ValueError(f"unknown tokenizer '{name}' (choose from {', '.join(TOKENIZERS)})")
+        import functools
+
+        _token_counters[name] = functools.lru_cache(maxsize=TOKEN_CACHE_SIZE)(TOKENIZERS[name]())
+    return _token_counters[name]
+
+
+def truncate_to_tokens(text: str, max_tokens: int,
+                       count_tokens: Callable[[str], int] = estimate_tokens) -> str:
+    """Longest prefix of `text` (plus truncation marker) within `max_tokens`."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if max_tokens < count_tokens(TRUNCATION_MARKER.strip()) + 1:
         return ""
+    # Binary search on character length: O(log n) counts
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens(text[:mid] + TRUNCATION_MARKER) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip() + TRUNCATION_MARKER if lo else ""
+
+
+def pack_issue_budget(raw: Dict[str, Any], budget: int,
+                      count_tokens: Optional[Callable[[str], int]] = None) -> Tuple[str, int]:
+    """Pack an issue into at most `budget` tokens; returns (markdown, tokens).
+
+    Sections are filled greedily by priority: title and meta are always
+    kept, then the description (holding back COMMENT_SHARE of what is left
+    when there are comments), then comments newest first, each truncated to
+    fit. The returned count is measured on the final output, and sections
+    are trimmed from the lowest priority up until it fits.
+    """
+    count = count_tokens or get_token_counter()
+
+    head = "\n".join(_meta_lines(raw) + ["", "## Description"]) + "\n"
+    remaining = budget - count(head)
+
+    desc = _DESCRIPTION(raw, "") or ""
+    desc = render_adf(desc) if isinstance(desc, dict) else desc.strip()
+
+    comments = _COMMENTS(raw, []) or []
+    parts = [_comment_parts(c) for c in reversed(comments) if isinstance(c, dict)]
+    comments_header = "\n## Recent Comments\n"
+    comments_cost = sum(count(h) + count(b) + 1 for h, b in parts) + count(comments_header) if parts else 0
+
+    reserve = min(comments_cost, int(max(remaining, 0) * COMMENT_SHARE))
+    desc = truncate_to_tokens(desc, remaining - reserve - count("\n"), count)
+    remaining -= count(desc + "\n")
+
+    chosen: List[Tuple[str, str]] = []
+    if parts and remaining >= count(comments_header) + MIN_SECTION_TOKENS:
+        remaining -= count(comments_header)
+        for heading, body in parts:
+            room = remaining - count(heading + "\n") - count("\n")
+            if room < MIN_SECTION_TOKENS:
+                break
+            body = truncate_to_tokens(body, room, count)
+            if not body:
+                break
+            chosen.append((heading, body))
+            remaining -= count(heading + "\n" + body + "\n")
+        chosen.reverse()  # chronological order, like the unbudgeted output
+
+    def render() -> str:
+        text = head + desc + "\n"
+        if chosen:
+            text += comments_header + "".join(f"{h}\n{b}\n" for h, b in chosen)
+        return text
+
+    text = render()
+    tokens = count(text)
+    # Tokenizers are not strictly additive; trim until the whole output fits
+    while tokens > budget and (chosen or desc):
+        if chosen:
+            chosen.pop(0)
+        else:
+            desc = truncate_to_tokens(desc, max(count(desc) - (tokens - budget), 0), count)
+        text = render()
+        tokens = count(text)
+    return text, tokens
+
+
+# ---------------------------------------------------------------------------
+# ADF rendering
+# ---------------------------------------------------------------------------
+
+# Inline marks rendered as markdown; applied in this order (innermost first)
+ADF_MARKS = {
+    "code": ("`", "`"),
+    "strong": ("**", "**"),
+    "em": ("*", "*"),
+    "strike": ("~~", "~~"),
+}
+
+# Operations pushed onto the render stack alongside nodes
+(_LIST, _END_ITEM, _END_HEADING,
+ _END_CELL, _END_ROW, _END_TABLE, _END_QUOTE) = range(7)
+
+
+def _render_text(node: Dict[str, Any]) -> str:
+    """Render a text node with its marks."""
+    text = node.get("text", "")
+    marks = node.get("marks")
+    if not marks or not text:
+        return text
+    href = None
+    kinds = set()
+    for mark in marks:
+        if isinstance(mark, dict):
+            kinds.add(mark.get("type"))
+            if mark.get("type") == "link":
+                href = (mark.get("attrs") or {}).get("href")
+    # Keep surrounding whitespace outside the markers so markdown stays valid
+    core = text.strip()
+    if not core:
+        return text
+    lead = text[:len(text) - len(text.lstrip())]
+    trail = text[len(text.rstrip()):]
+    for kind, (left, right) in ADF_MARKS.items():
+        if kind in kinds:
+            core = f"{left}{core}{right}"
+    if href:
+        core = f"[{core}]({href})"
+    return f"{lead}{core}{trail}"
+
+
+def _render_inline_node(node_type: str, attrs: Dict[str, Any]) -> str:
+    """Render leaf inline nodes that carry their content in attrs."""
+    if node_type == "mention":
+        text = attrs.get("text") or str(attrs.get("id") or "")
+        if not text:
+            return ""
+        return text if text.startswith("@") else f"@{text}"
+    if node_type == "emoji":
+        return attrs.get("text") or attrs.get("shortName", "")
+    if node_type in ("inlineCard", "blockCard", "embedCard"):
+        return attrs.get("url", "")
+    if node_type == "status":
+        return f"[{attrs.get('text', '')}]"
+    if node_type == "date":
+        from datetime import datetime, timezone
+
+        raw = attrs.get("timestamp", "")
+        try:
+            ts = int(raw) / 1000
+        except (TypeError, ValueError):
+            return ""
+        try:
+            return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+        except (OverflowError, OSError, ValueError):
+            return str(raw)  # outside the platform's date range
+    return ""
+
+
+_INLINE_LEAVES = frozenset(["mention", "emoji", "inlineCard", "blockCard", "embedCard", "status", "date"])
+
+
+def _strip_tail(out: List[str], start: int) -> None:
+    """Strip whitespace from both ends of out[start:] in place."""
+    _rstrip_tail(out, start)
+    for i in range(start, len(out)):
+        head = out[i].lstrip()
+        out[i] = head
+        if head:
+            break
+
+
+def _rstrip_tail(out: List[str], start: int) -> None:
+    """Strip trailing whitespace from out[start:] in place."""
+    while len(out) > start:
+        tail = out[-1].rstrip()
+        if tail:
+            out[-1] = tail
+            return
+        out.pop()
+
+
+def _collapse(out: List[str], start: int) -> str:
+    """Remove out[start:] and return it as one string."""
+    text = "".join(out[start:])
+    del out[start:]
+    return text
+
+
+def _inline_text(content: List[Any]) -> Optional[str]:
+    """Text of a run of inline nodes, or None if a block node is found."""
+    if len(content) == 1:
+        child = content[0]
+        if isinstance(child, dict) and child.get("type") == "text" and "marks" not in child:
+            return child.get("text", "")
+    parts = []
+    append = parts.append
+    for child in content:
+        if not isinstance(child, dict):
+            continue
+        child_type = child.get("type")
+        if child_type == "text":
+            append(_render_text(child) if "marks" in child else child.get("text", ""))
+        elif child_type == "hardBreak":
+            append("\n")
+        elif child_type in _INLINE_LEAVES:
+            append(_render_inline_node(child_type, child.get("attrs") or {}))
+        else:
+            return None
+    return "".join(parts)
+
+
+def _lead_text(node: Any) -> Tuple[Optional[str], Any]:
+    """(text of a leading inline paragraph or None, the remaining child nodes) of a container."""
+    parts = (node.get("content") or ()) if isinstance(node, dict) else ()
+    if parts:
+        first = parts[0]
+        if isinstance(first, dict) and first.get("type") == "paragraph":
+            text = _inline_text(first.get("content") or ())
+            if text is not None:
+                return text, parts[1:]
+    return None, parts
+
+
+_LIST_TYPES = frozenset(["bulletList", "orderedList"])
+
+
+def _list_order(node: Dict[str, Any]) -> Optional[int]:
+    """Number of an ordered list's first item; None for a bullet list."""
+    if node.get("type") == "orderedList":
+        return (node.get("attrs") or {}).get("order", 1)
+    return None
+
+
+def render_adf(adf: Dict[str, Any]) -> str:
+    """Render Atlassian Document Format to compact markdown-ish text.
+
+    Single pass over an explicit stack, writing into one shared buffer, so
+    nesting depth is unbounded. Runs of inline nodes (paragraphs, headings,
+    list items and table cells holding one paragraph) are written out
+    directly; only nodes holding further blocks go on the stack. Strings on
+    the stack are emitted verbatim; tuples are operations: _LIST resumes a
+    list at its next item, and the _END_* ones close a node that
+    post-processes its content from a recorded offset in the buffer.
+    """
+    out: List[str] = []
+    append = out.append
+    starts: List[int] = []    # buffer offsets of open headings/cells/quotes
+    tables: List[int] = []    # rows emitted so far per open table
+    list_depth = 0
+    stack: List[Any] = [adf]
+    pop = stack.pop
+    push = stack.append
+
+    while stack:
+        item = pop()
+        item_type = type(item)
+
+        if item_type is dict:
+            node_type = item.get("type")
+            content = item.get("content") or ()
 
-    result = []
-
-    if adf.get("type") == "text":
-        return adf.get("text", "")
-
-    content = adf.get("content", [])
-    for node in content:
-        if isinstance(node, dict):
-            node_type = node.get("type", "")
-
-            if node_type == "text":
-                result.append(node.get("text", ""))
-            elif node_type == "paragraph":
-                result.append(_extract_adf_text(node, depth + 1))
-                result.append("\n")
-            elif node_type == "bulletList":
-                for item in node.get("content", []):
-                    result.append("• " + _extract_adf_text(item, depth + 1).strip())
-                    result.append("\n")
-            elif node_type == "orderedList":
-                for i, item in enumerate(node.get("content", []), 1):
-                    result.append(f"{i}. " + _extract_adf_text(item, depth + 1).strip())
-                    result.append("\n")
+            if node_type == "paragraph":
+                # Paragraphs hold only inline nodes in valid ADF
+                text = _inline_text(content)
+                if text is not None:
+                    append(text + "\n")
+                    continue
+                push("\n")
+            elif node_type == "text":
+                append(_render_text(item) if "marks" in item else item.get("text", ""))
+                continue
             elif node_type == "heading":
-                level = node.get("attrs", {}).get("level", 1)
-                result.append("#" * level + " " + _extract_adf_text(node, depth + 1).strip())
-                result.append("\n")
+                prefix = "#" * (item.get("attrs") or {}).get("level", 1) + " "
+                text = _inline_text(content)
+                if text is not None:
+                    append(f"{prefix}{text.strip()}\n")
+                    continue
+                append(prefix)
+                starts.append(len(out))
+                push((_END_HEADING,))
+            elif node_type in _LIST_TYPES:
+                # Run as a _LIST op right away (below) rather than via the stack
+                item = (_LIST, content, 0, list_depth + 1, list_depth, _list_order(item))
+            elif node_type == "hardBreak":
+                append("\n")
+                continue
+            elif node_type == "rule":
+                # Not "---": that plus an empty paragraph would read as BATCH_DELIMITER
+                append("***\n")
+                continue
+            elif node_type in _INLINE_LEAVES:
+                append(_render_inline_node(node_type, item.get("attrs") or {}))
+                continue
             elif node_type == "codeBlock":
-                result.append("```\n")
-                result.append(_extract_adf_text(node, depth + 1))
-                result.append("\n```\n")
+                lang = (item.get("attrs") or {}).get("language") or ""
+                append(f"```{lang}\n")
+                push("\n```\n")
+            elif node_type == "table":
+                tables.append(0)
+                push((_END_TABLE,))
+            elif node_type == "tableRow":
+                if not tables:
+                    # A row outside any table renders as a one-row table of its own
+                    tables.append(0)
+                    push((_END_TABLE,))
+                starts.append(len(out))
+                push((_END_ROW,))
+            elif node_type == "tableCell" or node_type == "tableHeader":
+                text, rest = _lead_text(item)
+                if text is not None and not rest:
+                    append(" ".join(text.split()).replace("|", "\\|"))
+                    continue
+                starts.append(len(out))
+                push((_END_CELL,))
+            elif node_type == "blockquote" or node_type == "panel":
+                header = ""
+                if node_type == "panel":
+                    header = f"[{(item.get('attrs') or {}).get('panelType', 'info')}]"
+                starts.append(len(out))
+                push((_END_QUOTE, header))
+            elif node_type == "expand" or node_type == "nestedExpand":
+                title = (item.get("attrs") or {}).get("title")
+                if title:
+                    append(f"**{title}**\n")
+
+            if type(item) is dict:
+                stack.extend(reversed(content))
+                continue
+        elif item_type is str:
+            append(item)
+            continue
+        elif item_type is not tuple:
+            continue
+
+        op = item[0]
+        if op == _LIST:
+            # Items that are one inline paragraph are written directly, and
+            # a nested list following an item's paragraph is entered in
+            # place. Any other item with blocks stops the run: its blocks go
+            # on the stack, with this list's resume point beneath them.
+            _, items, index, depth, restore, order = item
+            count = len(items)
+            indent = "  " * (depth - 1)
+            bullet = f"{indent}• "
+            while index < count:
+                child = items[index]
+                index += 1
+                marker = bullet if order is None else f"{indent}{order + index - 1}. "
+                # _lead_text(child), inlined with the plain-text case of
+                # _inline_text: this loop runs for every list item
+                parts = (child.get("content") or ()) if isinstance(child, dict) else ()
+                text, lead = None, 0
+                if parts:
+                    first = parts[0]
+                    if isinstance(first, dict) and first.get("type") == "paragraph":
+                        inline = first.get("content") or ()
+                        only = inline[0] if len(inline) == 1 else None
+                        if type(only) is dict and only.get("type") == "text" and "marks" not in only:
+                            text = only.get("text", "")
+                        else:
+                            text = _inline_text(inline)
+                        if text is not None:
+                            lead = 1
+                blocks = len(parts) - lead
+                if not blocks:
+                    append(f"{marker}{(text or '').strip()}\n")
+                    continue
+                last = index == count
+                if lead and blocks == 1:
+                    nested = parts[1]
+                    nested_type = nested.get("type") if isinstance(nested, dict) else None
+                    if nested_type == "bulletList" or nested_type == "orderedList":
+                        append(f"{marker}{text.strip()}\n")
+                        if not last:
+                            push((_LIST, items, index, depth, restore, order))
+                            restore = depth
+                        items, index = nested.get("content") or (), 0
+                        count = len(items)
+                        order = None
+                        if nested_type == "orderedList":
+                            order = (nested.get("attrs") or {}).get("order", 1)
+                        indent = "  " * depth
+                        bullet = f"{indent}• "
+                        depth += 1
+                        continue
+                if not last:
+                    push((_LIST, items, index, depth, restore, order))
+                if text is None:
+                    append(marker)
+                    push((_END_ITEM, restore if last else depth - 1, len(out), True))
+                else:
+                    push((_END_ITEM, restore if last else depth - 1, len(out), False))
+                    append(f"{marker}{text.strip()}\n")
+                list_depth = depth
+                stack.extend(reversed(parts[lead:]))
+                break
             else:
-                # Generic handling for other node types
-                result.append(_extract_adf_text(node, depth + 1))
+                list_depth = restore
+        elif op == _END_ITEM:
+            # The leading paragraph, if any, was stripped when written
+            (_strip_tail if item[3] else _rstrip_tail)(out, item[2])
+            append("\n")
+            list_depth = item[1]
+        elif op == _END_HEADING:
+            _strip_tail(out, starts.pop())
+            append("\n")
+        elif op == _END_CELL:
+            cell = " ".join(_collapse(out, starts.pop()).split()).replace("|", "\\|")
+            append(cell)
+        elif op == _END_ROW:
+            start = starts.pop()
+            cells = out[start:]
+            del out[start:]
+            append("| " + " | ".join(cells) + " |\n")
+            if tables[-1] == 0:
+                append("|" + "---|" * len(cells) + "\n")
+            tables[-1] += 1
+        elif op == _END_TABLE:
+            tables.pop()
+        elif op == _END_QUOTE:
+            body = _collapse(out, starts.pop()).strip("\n")
+            header = item[1]
+            lines = ([header] if header else []) + body.split("\n")
+            append("".join(f"> {line}\n" for line in lines))
 
-    return "".join(result)
+    return "".join(out)
 
 
-def main() -> int:
-    """Main entry point."""
+# ---------------------------------------------------------------------------
+# Batch mode
+# ---------------------------------------------------------------------------
+
+
+def expand_batch_inputs(inputs: Iterable[str]) -> List[str]:
+    """Expand directories and glob patterns into a sorted, de-duplicated file list."""
+    import glob
+    from pathlib import Path
+
+    files: List[str] = []
+    seen = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            matches = sorted(str(p) for p in path.iterdir()
+                             if p.is_file() and p.suffix in BATCH_SUFFIXES)
+        elif path.exists():
+            matches = [item]
+        else:
+            matches = sorted(glob.glob(item))
+            if not matches:
+                raise FileNotFoundError(item)
+        for m in matches:
+            if m not in seen:
+                seen.add(m)
+                files.append(m)
+    return files
+
+
+def iter_batch_issues(inputs: List[str], ndjson: bool = False) -> Iterator[Dict[str, Any]]:
+    """Yield raw issues from files (or stdin when `inputs` is empty).
+
+    Each file may hold a single issue, a search envelope or NDJSON
+    (by --ndjson or a .ndjson/.jsonl suffix). Issues are read lazily.
+    """
+    if not inputs:
+        yield from iter_issues(sys.stdin, ndjson=ndjson)
+        return
+    for path in expand_batch_inputs(inputs):
+        with open(path, "r", encoding="utf-8") as f:
+            yield from iter_issues(f, ndjson=ndjson or path.endswith(NDJSON_SUFFIXES))
+
+
+PackResult = Tuple[str, Optional[str], Optional[str], Optional[int]]
+
+
+def _pack_one(raw: Dict[str, Any], budget: Optional[int] = None,
+              tokenizer: str = "estimate") -> PackResult:
+    """Pack one issue, returning (key, markdown, error, tokens)."""
+    key = str(_KEY(raw, "") or "")
+    try:
+        if budget is None:
+            return key, pack_issue(raw), None, None
+        output, tokens = pack_issue_budget(raw, budget, get_token_counter(tokenizer))
+        return key, output, None, tokens
+    except Exception as e:
+        return key, None, str(e), None
+
+
+def _pack_chunk(chunk: List[Dict[str, Any]], budget: Optional[int] = None,
+                tokenizer: str = "estimate") -> List[PackResult]:
+    """Worker entry point: pack a chunk of issues."""
+    return [_pack_one(raw, budget, tokenizer) for raw in chunk]
+
+
+def _cache_options(budget: Optional[int], tokenizer: str) -> Dict[str, Any]:
+    """Packing options that change the output, for the cache key."""
+    return {"budget": budget, "tokenizer": tokenizer} if budget is not None else {}
+
+
+def _identity(raw: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """(key, fields.updated) if the issue is cacheable."""
+    key, updated = _KEY(raw), _UPDATED(raw)
+    if isinstance(key, str) and isinstance(updated, str):
+        return key, updated
+    return None
+
+
+def _cached_result(cache: Any, ident: Optional[Tuple[str, str]],
+                   options: Dict[str, Any]) -> Optional[PackResult]:
+    hit = cache.get(*ident, options) if ident else None
+    if hit is None:
+        return None
+    return ident[0], hit[0], None, hit[1]
+
+
+def _store_result(cache: Any, ident: Optional[Tuple[str, str]], options: Dict[str, Any],
+                  result: PackResult) -> None:
+    if ident and result[2] is None:
+        cache.put(*ident, options, result[1], result[3])
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def pack_many(issues: Iterable[Dict[str, Any]], jobs: int = 1, budget: Optional[int] = None,
+              tokenizer: str = "estimate", cache: Any = None) -> Iterator[PackResult]:
+    """Pack issues in input order, optionally across a process pool.
+
+    With jobs > 1 at most 2 * jobs chunks are in flight, so a streamed
+    input is never materialized in full. With a `cache` (pack_cache.PackCache)
+    hits are served in this process and only misses reach the workers.
+    """
+    options = _cache_options(budget, tokenizer)
+    if jobs <= 1:
+        for raw in issues:
+            if cache is None:
+                yield _pack_one(raw, budget, tokenizer)
+                continue
+            ident = _identity(raw)
+            result = _cached_result(cache, ident, options)
+            if result is None:
+                result = _pack_one(raw, budget, tokenizer)
+                _store_result(cache, ident, options, result)
+            yield result
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    def collect(idents, results, future) -> Iterator[PackResult]:
+        packed = iter(future.result() if future is not None else ())
+        for ident, result in zip(idents, results):
+            if result is None:
+                result = next(packed)
+                if cache is not None:
+                    _store_result(cache, ident, options, result)
+            yield result
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending: deque = deque()
+        for chunk in _chunked(issues, BATCH_CHUNK):
+            if cache is None:
+                idents = results = [None] * len(chunk)
+                misses = chunk
+            else:
+                idents = [_identity(raw) for raw in chunk]
+                results = [_cached_result(cache, ident, options) for ident in idents]
+                misses = [raw for raw, result in zip(chunk, results) if result is None]
+            # Workers only need KEEP_FIELDS; projecting first shrinks what is pickled
+            misses = [project_issue(raw) for raw in misses]
+            future = pool.submit(_pack_chunk, misses, budget, tokenizer) if misses else None
+            pending.append((idents, results, future))
+            if len(pending) >= 2 * jobs:
+                yield from collect(*pending.popleft())
+        while pending:
+            yield from collect(*pending.popleft())
+
+
+def _safe_filename(key: str, index: int) -> str:
+    """Filesystem-safe name for a packed issue."""
+    import re
+
+    name = re.sub(r"[^A-Za-z0-9._-]+", "_", key).strip("._")
+    return f"{name or f'issue-{index}'}.md"
+
+
+def run_batch(args) -> int:
+    """Pack every input issue; write per-issue files or a delimited stream."""
+    from pathlib import Path
+
+    out_dir = Path(args.out_dir) if args.out_dir else None
+    if out_dir:
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    issues = iter_batch_issues(args.inputs, ndjson=args.ndjson)
+    # Names written so far, lowercased for case-insensitive filesystems
+    written = set()
+    packed = 0
+    failed = 0
+    total_tokens = 0
+    cache = _open_cache(args)
+    try:
+        results = pack_many(issues, args.jobs, args.budget, args.tokenizer, cache)
+        for index, (key, output, error, tokens) in enumerate(results, 1):
+            if error is not None:
+                failed += 1
+                sys.stderr.write(f"Error: {key or f'issue #{index}'} - {error}\n")
+                continue
+            if out_dir:
+                name = first = _safe_filename(key, index)
+                # Duplicate keys, or keys that sanitize alike, get -2, -3, ...
+                n = 2
+                while name.lower() in written:
+                    name = f"{first[:-3]}-{n}.md"
+                    n += 1
+                if name != first:
+                    sys.stderr.write(f"Warning: {key or f'issue #{index}'} written to {name}, "
+                                     f"{first} is taken\n")
+                written.add(name.lower())
+                (out_dir / name).write_text(output, encoding="utf-8")
+            else:
+                if packed:
+                    sys.stdout.write(args.delimiter)
+                sys.stdout.write(output)
+            packed += 1
+            total_tokens += tokens or 0
+        if cache is not None:
+            sys.stderr.write(f"Cache: {cache.hits} hits, {cache.misses} misses\n")
+    finally:
+        if cache is not None:
+            cache.close()
+
+    if out_dir:
+        sys.stderr.write(f"Packed {packed} issues into {out_dir}"
+                         + (f" ({failed} failed)" if failed else "") + "\n")
+    if args.budget is not None:
+        sys.stderr.write(f"Tokens: {total_tokens} across {packed} issues "
+                         f"(budget {args.budget} each, {args.tokenizer})\n")
+    return 1 if failed else 0
+
+
+def run_project(args) -> int:
+    """Write each input issue reduced to KEEP_FIELDS as one line of compact JSON."""
+    for raw in iter_batch_issues(args.inputs, ndjson=args.ndjson):
+        sys.stdout.write(dumps(project_issue(raw)) + "\n")
+    return 0
+
+
+def _open_cache(args) -> Any:
+    """PackCache for --cache-dir, or None (also when its index cannot be opened)."""
+    if not args.cache_dir:
+        return None
+    import os
+    import sqlite3
+
+    from pack_cache import PackCache
+
     try:
-        if len(sys.argv) > 1:
-            with open(sys.argv[1], "r", encoding="utf-8") as f:
-                raw = json.load(f)
+        return PackCache(os.path.expanduser(args.cache_dir), PACK_VERSION, args.cache_max_mb * 1024 * 1024)
+    except sqlite3.OperationalError as e:
+        sys.stderr.write(f"Warning: cache disabled - {e}\n")
+        return None
+
+
+def _pack_single(path: Optional[str], budget: Optional[int] = None,
+                 tokenizer: str = "estimate", cache: Any = None) -> int:
+    """Pack one issue from `path` (or stdin) to stdout.
+
+    With a cache, a hit is found by peeking key/updated from the raw text
+    and the issue is never parsed.
+    """
+    with stage("read"):
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
         else:
-            raw = json.load(sys.stdin)
+            text = sys.stdin.read()
 
-        output = pack_issue(raw)
-        sys.stdout.write(output)
-        return 0
+    options = _cache_options(budget, tokenizer)
+    result = None
+    if cache is not None:
+        from pack_cache import peek_identity
+
+        with stage("cache lookup"):
+            result = _cached_result(cache, peek_identity(text), options)
+    if result is None:
+        with stage("parse"):
+            raw = loads(text)
+        with stage("pack"):
+            if budget is not None:
+                output, tokens = pack_issue_budget(raw, budget, get_token_counter(tokenizer))
+            else:
+                output, tokens = pack_issue(raw), None
+        result = (str(_KEY(raw, "") or ""), output, None, tokens)
+        if cache is not None:
+            with stage("cache store"):
+                _store_result(cache, _identity(raw), options, result)
+
+    if budget is not None:
+        sys.stderr.write(f"Tokens: {result[3]}/{budget} ({tokenizer})\n")
+    with stage("write"):
+        sys.stdout.write(result[1])
+    return 0
 
+
+def _pack_single_cached(args) -> int:
+    """_pack_single with the --cache-dir cache opened around it."""
+    cache = _open_cache(args)
+    try:
+        return _pack_single(args.inputs[0] if args.inputs else None, args.budget, args.tokenizer, cache)
+    finally:
+        if cache is not None:
+            cache.close()
+
+
+def _print_cache_stats(args) -> int:
+    """Report entries, size and hit/miss counters for --cache-dir."""
+    cache = _open_cache(args)
+    if cache is None:
+        if not args.cache_dir:
+            sys.stderr.write("Error: --cache-stats requires --cache-dir\n")
+        return 1
+    try:
+        stats = cache.stats()
+    finally:
+        cache.close()
+    lookups = stats["hits"] + stats["misses"]
+    rate = f" ({stats['hits'] / lookups:.0%} hit rate)" if lookups else ""
+    print(f"Cache: {args.cache_dir}")
+    print(f"  entries: {stats['entries']} ({stats['bytes'] / 1024:.1f} KB of {args.cache_max_mb} MB)")
+    print(f"  hits: {stats['hits']}, misses: {stats['misses']}{rate}")
+    return 0
+
+
+def _run_reporting_errors(fn: Callable[..., int], *args: Any) -> int:
+    """Run fn(*args), reporting input errors on stderr with exit code 1."""
+    try:
+        return fn(*args)
     except json.JSONDecodeError as e:
         sys.stderr.write(f"Error: Invalid JSON input - {e}\n")
         return 1
@@ -213,5 +987,111 @@ def main() -> int:
         return 1
 
 
+def main() -> int:
+    """Main entry point."""
+    argv = sys.argv[1:]
+    # One file (or stdin) and no options is the common agent call: skip
+    # argparse, which on its own imports shutil, gettext and locale
+    if len(argv) <= 1 and not any(a.startswith("-") for a in argv):
+        with profile_session():
+            return _run_reporting_errors(_pack_single, argv[0] if argv else None)
+
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Pack Jira issue JSON into compact markdown"
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="Issue JSON file (reads from stdin if not provided); "
+             "with --batch: files, directories or glob patterns"
+    )
+    parser.add_argument(
+        "--batch", "-b",
+        action="store_true",
+        help="Pack every issue found in the inputs (single issues, search envelopes, NDJSON)"
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Treat inputs/stdin as NDJSON (one issue per line) in batch mode"
+    )
+    parser.add_argument(
+        "--out-dir", "-o",
+        help="Batch mode: write one <KEY>.md per issue into this directory "
+             "(a name already written gets -2, -3, ...)"
+    )
+    parser.add_argument(
+        "--delimiter",
+        default=BATCH_DELIMITER,
+        help="Batch mode: separator between documents on stdout (default: markdown rule)"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Batch mode: number of worker processes (default: 1)"
+    )
+    parser.add_argument(
+        "--budget",
+        type=int,
+        help="Token budget per issue; replaces the fixed character limits "
+             "and reports the packed token count on stderr"
+    )
+    parser.add_argument(
+        "--tokenizer",
+        default="estimate",
+        choices=sorted(TOKENIZERS),
+        help="Token counter used with --budget (default: estimate)"
+    )
+    parser.add_argument(
+        "--project",
+        action="store_true",
+        help="Instead of packing, write each issue reduced to the fields the packer "
+             "uses, one JSON object per line"
+    )
+    parser.add_argument(
+        "--fields-param",
+        action="store_true",
+        help="Print the fields= value for search_jira_issues that covers what the packer uses"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Reuse packed output for issues whose key and updated timestamp are unchanged"
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=256,
+        help="Cache size limit; least recently used entries are evicted (default: 256)"
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Print entries, size and hit/miss counters for --cache-dir and exit"
+    )
+    add_profile_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    if args.fields_param:
+        print(fields_param(path for path, _ in KEEP_FIELDS))
+        return 0
+    if args.cache_stats:
+        return _print_cache_stats(args)
+    if not (args.project or args.batch) and len(args.inputs) > 1:
+        parser.error("multiple inputs require --batch")
+    with profile_session(args.profile, args.cprofile):
+        if args.project:
+            return _run_reporting_errors(run_project, args)
+        if args.batch:
+            return _run_reporting_errors(run_batch, args)
+        return _run_reporting_errors(_pack_single_cached, args)
+
+
 if __name__ == "__main__":
-    raise SystemExit(main())
+    from jira_pack import forward
+
+    rc = forward("issue", sys.argv[1:])
+    raise SystemExit(main() if rc is None else rc)
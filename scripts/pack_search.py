@@ -4,40 +4,75 @@
 Usage:
     python pack_search.py search.json > search_packed.md
     cat search.json | python pack_search.py > search_packed.md
+    python pack_search.py export.json --stream --max 0 > report.md
+    python pack_search.py export.ndjson --ndjson --max 0 > report.md
+    python pack_search.py export.json --project --fields duedate > export_slim.json
+    python pack_search.py --fields-param --fields duedate
+    python pack_search.py export.ndjson --ndjson --group-by status,assignee,priority
+    python pack_search.py search.json --diff ~/.cache/jira-pack/sprint_poll.sqlite
 
 Expected input JSON shape: { "issues": [ ... ], "total": N, "maxResults": M }
+With --stream (envelope) or --ndjson (one issue per line) rows are written
+as they are parsed, so memory stays bounded by a single issue.
+--project writes the export back with each issue reduced to SEARCH_FIELDS
+(plus --fields), also in a single streaming pass. --group-by replaces the
+rows with per-dimension counts over the whole result set (top buckets,
+latest keys per bucket, and a cross table of the first two dimensions).
+--diff SNAPSHOT lists only what changed since the previous run against
+the same snapshot file.
 
 This script converts verbose Jira search results into a scannable table,
 reducing token usage significantly while preserving key information.
 """
 
+import heapq
 import json
 import sys
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jira_fields import compile_path, compile_projection, field_paths, fields_param, get_path
+from jira_fields import truncate_inline as truncate
+from jira_json import load, load_path
+from jira_profile import add_arguments as add_profile_arguments, session as profile_session, stage
+from jira_stream import iter_issues, write_projected
+
+# Compiled accessors for the per-row lookups
+_KEY = compile_path("key")
+_SUMMARY = compile_path("fields.summary")
+_STATUS = compile_path("fields.status.name")
+_ISSUETYPE = compile_path("fields.issuetype.name")
+_PRIORITY = compile_path("fields.priority.name")
+_ASSIGNEE = compile_path("fields.assignee.displayName")
+_LABELS = compile_path("fields.labels")
+_UPDATED = compile_path("fields.updated")
+
+# Every path the table and detailed formats read
+SEARCH_FIELDS = [
+    "key",
+    "fields.summary",
+    "fields.status.name",
+    "fields.issuetype.name",
+    "fields.priority.name",
+    "fields.assignee.displayName",
+    "fields.labels",
+    "fields.updated",
+]
+
+TABLE_HEADER = [
+    "| Key | Type | Status | Priority | Assignee | Summary |",
+    "|-----|------|--------|----------|----------|---------|",
+]
 
 
 def get(d: Dict[str, Any], path: str, default: Any = "") -> Any:
     """Safely navigate nested dictionary using dot notation."""
-    cur: Any = d
-    for p in path.split("."):
-        if isinstance(cur, dict) and p in cur:
-            cur = cur[p]
-        else:
-            return default
-    return cur
-
-
-def truncate(text: str, max_len: int = 80) -> str:
-    """Truncate text with ellipsis."""
-    text = str(text).replace("\n", " ").replace("|", "/").strip()
-    if len(text) > max_len:
-        return text[:max_len - 3] + "..."
-    return text
+    return get_path(d, path, default)
 
 
 def format_assignee(issue: Dict[str, Any]) -> str:
     """Format assignee display name or 'Unassigned'."""
-    assignee = get(issue, "fields.assignee.displayName")
+    assignee = _ASSIGNEE(issue, "")
     if not assignee:
         return "Unassigned"
     # Shorten long names
@@ -48,6 +83,45 @@ def format_assignee(issue: Dict[str, Any]) -> str:
     return assignee
 
 
+def table_cells(issue: Dict[str, Any]) -> List[str]:
+    """Key, type, status, priority, assignee and truncated summary of one issue."""
+    return [
+        _KEY(issue, ""),
+        _ISSUETYPE(issue, ""),
+        _STATUS(issue, ""),
+        _PRIORITY(issue, ""),
+        format_assignee(issue),
+        truncate(_SUMMARY(issue, ""), 50),
+    ]
+
+
+def format_table_row(issue: Dict[str, Any]) -> str:
+    """Format one issue as a markdown table row."""
+    return "| " + " | ".join(table_cells(issue)) + " |"
+
+
+def format_detailed_entry(issue: Dict[str, Any]) -> List[str]:
+    """Format one issue as a detailed list entry (trailing blank line included)."""
+    key = _KEY(issue, "")
+    summary = _SUMMARY(issue, "")
+    status = _STATUS(issue, "")
+    itype = _ISSUETYPE(issue, "")
+    prio = _PRIORITY(issue, "")
+    assignee = format_assignee(issue)
+    labels = _LABELS(issue, [])
+    updated = _UPDATED(issue, "")[:10]
+
+    lines = [
+        f"## {key}: {truncate(summary, 60)}",
+        f"- **Type**: {itype} | **Status**: {status} | **Priority**: {prio}",
+        f"- **Assignee**: {assignee} | **Updated**: {updated}",
+    ]
+    if labels:
+        lines.append(f"- **Labels**: {', '.join(labels[:5])}")
+    lines.append("")
+    return lines
+
+
 def pack_search_results(data: Dict[str, Any], max_issues: int = 50) -> str:
     """Convert Jira search results to compact markdown table."""
     issues: List[Dict[str, Any]] = data.get("issues", []) if isinstance(data, dict) else []
@@ -63,18 +137,10 @@ def pack_search_results(data: Dict[str, Any], max_issues: int = 50) -> str:
     lines.append("")
 
     # Table header
-    lines.append("| Key | Type | Status | Priority | Assignee | Summary |")
-    lines.append("|-----|------|--------|----------|----------|---------|")
+    lines.extend(TABLE_HEADER)
 
     for issue in issues[:max_issues]:
-        key = get(issue, "key")
-        itype = get(issue, "fields.issuetype.name")
-        status = get(issue, "fields.status.name")
-        prio = get(issue, "fields.priority.name")
-        assignee = format_assignee(issue)
-        summary = truncate(get(issue, "fields.summary"), 50)
-
-        lines.append(f"| {key} | {itype} | {status} | {prio} | {assignee} | {summary} |")
+        lines.append(format_table_row(issue))
 
     # Footer with pagination hint
     if total > len(issues[:max_issues]):
@@ -96,25 +162,338 @@ def pack_search_detailed(data: Dict[str, Any], max_issues: int = 20) -> str:
     lines.append("")
 
     for issue in issues[:max_issues]:
-        key = get(issue, "key")
-        summary = get(issue, "fields.summary")
-        status = get(issue, "fields.status.name")
-        itype = get(issue, "fields.issuetype.name")
-        prio = get(issue, "fields.priority.name")
-        assignee = format_assignee(issue)
-        labels = get(issue, "fields.labels", [])
-        updated = get(issue, "fields.updated", "")[:10]
-
-        lines.append(f"## {key}: {truncate(summary, 60)}")
-        lines.append(f"- **Type**: {itype} | **Status**: {status} | **Priority**: {prio}")
-        lines.append(f"- **Assignee**: {assignee} | **Updated**: {updated}")
-        if labels:
-            lines.append(f"- **Labels**: {', '.join(labels[:5])}")
-        lines.append("")
+        lines.extend(format_detailed_entry(issue))
 
     return "\n".join(lines) + "\n"
 
 
+def pack_search_stream(
+    issues: Iterable[Dict[str, Any]],
+    write: Callable[[str], Any],
+    max_issues: int = 50,
+    detailed: bool = False,
+    meta: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Write packed rows as issues arrive; returns the number of rows written.
+
+    Since the total is only known once the input is exhausted, the
+    "Showing N of M" summary goes in the footer instead of the header.
+    `max_issues <= 0` writes every issue. Issues past the limit are still
+    consumed so the footer count is exact.
+    """
+    meta = meta if meta is not None else {}
+
+    write("# Search Results\n\n")
+    if not detailed:
+        write("\n".join(TABLE_HEADER) + "\n")
+
+    shown = 0
+    seen = 0
+    for issue in issues:
+        seen += 1
+        if max_issues > 0 and shown >= max_issues:
+            continue
+        if detailed:
+            write("\n".join(format_detailed_entry(issue)) + "\n")
+        else:
+            write(format_table_row(issue) + "\n")
+        shown += 1
+
+    start_at = meta.get("startAt", 0)
+    total = meta.get("total", start_at + seen)
+    if not detailed:
+        write("\n")
+    write(f"Showing {shown} of {total} issues (starting at {start_at})\n")
+    remaining = total - start_at - shown
+    if remaining > 0:
+        write(f"\n*{remaining} more issues not shown. Use pagination or refine JQL.*\n")
+    return shown
+
+
+# ---------------------------------------------------------------------------
+# Snapshot diff
+# ---------------------------------------------------------------------------
+
+DIFF_HEADER = [
+    "| ± | Key | Type | Status | Priority | Assignee | Summary |",
+    "|---|-----|------|--------|----------|----------|---------|",
+]
+DIFF_BATCH = 1000
+_CELL_SEP = "\x1f"
+
+
+class SearchSnapshot:
+    """The previous poll's packed rows in a sqlite file, diffed against the current results.
+
+    Each issue is stored as (key, fields.updated, 8-byte digest, row cells)
+    in a table clustered on key. `load()` streams the current results into
+    a temporary table of the same shape. The diff then runs as key-ordered
+    joins between the two, and `save()` writes back only the rows that were
+    added, changed or removed. A poll's writes and output therefore scale
+    with churn, not with the size of the result set.
+    """
+
+    def __init__(self, path: str):
+        import os
+        import sqlite3
+
+        self.path = os.path.expanduser(path)
+        self.db = sqlite3.connect(self.path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS snapshot (key TEXT PRIMARY KEY, updated TEXT, digest BLOB, cells TEXT)"
+            " WITHOUT ROWID"
+        )
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self.db.execute(
+            "CREATE TEMP TABLE current (key TEXT PRIMARY KEY, updated TEXT, digest BLOB, cells TEXT, pos INTEGER)"
+            " WITHOUT ROWID"
+        )
+        self.meta = dict(self.db.execute("SELECT name, value FROM meta"))
+
+    def __enter__(self) -> "SearchSnapshot":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.db.close()
+
+    def load(self, issues: Iterable[Dict[str, Any]]) -> int:
+        """Stream the current results into the temporary table; returns the issue count."""
+        import hashlib
+
+        batch = []
+        count = 0
+        for issue in issues:
+            cells = _CELL_SEP.join(table_cells(issue)[1:])
+            digest = hashlib.blake2b(cells.encode("utf-8"), digest_size=8).digest()
+            batch.append((_KEY(issue, ""), _UPDATED(issue, "") or "", digest, cells, count))
+            count += 1
+            if len(batch) >= DIFF_BATCH:
+                self.db.executemany("INSERT OR REPLACE INTO current VALUES (?, ?, ?, ?, ?)", batch)
+                batch.clear()
+        self.db.executemany("INSERT OR REPLACE INTO current VALUES (?, ?, ?, ?, ?)", batch)
+        return count
+
+    def counts(self) -> Dict[str, int]:
+        """added / changed / removed / touched (updated, same row) / previous counts."""
+        def one(sql: str) -> int:
+            return self.db.execute(sql).fetchone()[0]
+
+        return {
+            "added": one("SELECT COUNT(*) FROM current c LEFT JOIN snapshot s USING (key) WHERE s.key IS NULL"),
+            "changed": one("SELECT COUNT(*) FROM current c JOIN snapshot s USING (key) WHERE s.digest != c.digest"),
+            "removed": one("SELECT COUNT(*) FROM snapshot s LEFT JOIN current c USING (key) WHERE c.key IS NULL"),
+            "touched": one("SELECT COUNT(*) FROM current c JOIN snapshot s USING (key)"
+                           " WHERE s.digest = c.digest AND s.updated != c.updated"),
+            "previous": one("SELECT COUNT(*) FROM snapshot"),
+        }
+
+    def changes(self, limit: int = 0) -> Iterator[Tuple[str, str, Optional[List[str]], Optional[List[str]]]]:
+        """(kind, key, old cells, new cells): added and changed in result order, then removed by key."""
+        limit_sql = f" LIMIT {int(limit)}" if limit > 0 else ""
+        rows = self.db.execute(
+            "SELECT CASE WHEN s.key IS NULL THEN '+' ELSE '~' END, c.key, s.cells, c.cells FROM current c"
+            " LEFT JOIN snapshot s USING (key) WHERE s.key IS NULL OR s.digest != c.digest ORDER BY c.pos" + limit_sql
+        )
+        shown = 0
+        for kind, key, old, new in rows:
+            shown += 1
+            yield kind, key, old.split(_CELL_SEP) if old is not None else None, new.split(_CELL_SEP)
+        if limit > 0 and shown >= limit:
+            return
+        rest = f" LIMIT {int(limit) - shown}" if limit > 0 else ""
+        for key, old in self.db.execute(
+            "SELECT s.key, s.cells FROM snapshot s LEFT JOIN current c USING (key) WHERE c.key IS NULL"
+            " ORDER BY s.key" + rest
+        ):
+            yield "−", key, old.split(_CELL_SEP), None
+
+    def save(self, meta: Dict[str, Any]) -> None:
+        """Make the current results the snapshot, writing only rows that differ."""
+        from datetime import datetime
+
+        with self.db:
+            self.db.execute("DELETE FROM snapshot WHERE key NOT IN (SELECT key FROM current)")
+            self.db.execute(
+                "INSERT OR REPLACE INTO snapshot SELECT c.key, c.updated, c.digest, c.cells FROM current c"
+                " LEFT JOIN snapshot s USING (key) WHERE s.key IS NULL OR s.digest != c.digest OR s.updated != c.updated"
+            )
+            values = {"taken": datetime.now().isoformat(timespec="seconds"), "total": meta.get("total")}
+            self.db.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                                [(name, None if value is None else str(value)) for name, value in values.items()])
+
+
+def format_diff_row(kind: str, key: str, old: Optional[List[str]], new: Optional[List[str]]) -> str:
+    """One diff table row; a changed cell reads "old → new" (summaries are only marked changed)."""
+    if old is None or new is None:
+        cells = new if new is not None else old
+    else:
+        cells = [n if o == n else f"{o} → {n}" for o, n in zip(old[:-1], new[:-1])]
+        cells.append(new[-1] if old[-1] == new[-1] else f"{new[-1]} *(was: {truncate(old[-1], 30)})*")
+    return f"| {kind} | {key} | " + " | ".join(cells) + " |"
+
+
+def pack_search_diff(issues: Iterable[Dict[str, Any]], snapshot_path: str, max_rows: int = 50,
+                     meta: Optional[Dict[str, Any]] = None) -> str:
+    """Markdown of the issues added, changed or removed since the snapshot at `snapshot_path`, which is then updated."""
+    meta = meta if meta is not None else {}
+    with SearchSnapshot(snapshot_path) as snapshot:
+        with stage("load"):
+            count = snapshot.load(issues)
+        with stage("diff"):
+            counts = snapshot.counts()
+            changes = list(snapshot.changes(max_rows))
+        lines = ["# Search Changes", ""]
+        taken = snapshot.meta.get("taken")
+        if taken is None:
+            lines.append(f"No previous snapshot; recorded {count:,} issues.")
+        else:
+            lines.append(f"{count:,} issues now, {counts['previous']:,} at {taken}: {counts['added']:,} added, "
+                         f"{counts['changed']:,} changed, {counts['removed']:,} removed"
+                         + (f" ({counts['touched']:,} more updated without a change in these columns)"
+                            if counts["touched"] else ""))
+        total = meta.get("total")
+        if total is not None and total > count:
+            lines.append(f"*Only {count:,} of {total:,} matches were read: issues on other pages count as removed.*")
+        if changes:
+            lines.append("")
+            lines.extend(DIFF_HEADER)
+            lines.extend(format_diff_row(*change) for change in changes)
+            hidden = counts["added"] + counts["changed"] + counts["removed"] - len(changes)
+            if hidden > 0:
+                lines += ["", f"*{hidden:,} more changes not shown (--max 0 lists all).*"]
+        elif taken is not None:
+            lines += ["", "No changes."]
+        with stage("save"):
+            snapshot.save(meta)
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Group-by summary
+# ---------------------------------------------------------------------------
+
+NO_VALUE = "(none)"
+
+
+def _labels(issue: Dict[str, Any]) -> List[str]:
+    return _LABELS(issue, None) or [NO_VALUE]
+
+
+# --group-by dimension -> values of one issue (labels can give several)
+GROUP_DIMENSIONS: Dict[str, Callable[[Dict[str, Any]], List[str]]] = {
+    "status": lambda issue: [_STATUS(issue, "") or NO_VALUE],
+    "assignee": lambda issue: [format_assignee(issue)],
+    "priority": lambda issue: [_PRIORITY(issue, "") or NO_VALUE],
+    "issuetype": lambda issue: [_ISSUETYPE(issue, "") or NO_VALUE],
+    "label": _labels,
+}
+PIVOT_COLUMNS = 6  # second-dimension values shown in the cross table; the rest go to "other"
+
+
+def parse_dimensions(spec: str) -> List[str]:
+    """--group-by value ("status, assignee") as a list of dimension names."""
+    return [d.strip() for d in spec.split(",") if d.strip()]
+
+
+class SearchGroups:
+    """Counts of a result set per --group-by dimension, built one issue at a time.
+
+    Memory is O(buckets * top_keys): each bucket keeps its count and the
+    `top_keys` most recently updated issue keys. With two or more
+    dimensions the first two are also counted as pairs for a cross table.
+    """
+
+    def __init__(self, dimensions: List[str], top_keys: int = 3):
+        unknown = [d for d in dimensions if d not in GROUP_DIMENSIONS]
+        if unknown or not dimensions:
+            raise ValueError(f"--group-by takes {','.join(GROUP_DIMENSIONS)} (got {','.join(unknown) or 'nothing'})")
+        self.dimensions = dimensions
+        self.top_keys = top_keys
+        self.issues = 0
+        self.counts = {d: Counter() for d in dimensions}
+        self.latest: Dict[str, Dict[str, list]] = {d: {} for d in dimensions}  # min-heaps of (updated, key)
+        self.pairs: Counter = Counter()
+
+    def add(self, issue: Dict[str, Any]) -> None:
+        self.issues += 1
+        key = _KEY(issue, "")
+        updated = _UPDATED(issue, "") or ""
+        values = {}
+        for d in self.dimensions:
+            values[d] = GROUP_DIMENSIONS[d](issue)
+            counts = self.counts[d]
+            latest = self.latest[d]
+            for value in values[d]:
+                counts[value] += 1
+                if self.top_keys > 0:
+                    heap = latest.setdefault(value, [])
+                    if len(heap) < self.top_keys:
+                        heapq.heappush(heap, (updated, key))
+                    elif updated > heap[0][0]:
+                        heapq.heapreplace(heap, (updated, key))
+        if len(self.dimensions) > 1:
+            first, second = self.dimensions[:2]
+            for a in values[first]:
+                for b in values[second]:
+                    self.pairs[a, b] += 1
+
+    def _examples(self, dimension: str, value: str) -> str:
+        return ", ".join(key for _, key in sorted(self.latest[dimension].get(value, ()), reverse=True))
+
+    def render(self, rows: int = 10, total: Optional[int] = None) -> str:
+        """Markdown: one table per dimension (top `rows` buckets), then the cross table."""
+        lines = ["# Search Summary", ""]
+        counted = f"{self.issues:,} issues"
+        if total is not None and total > self.issues:
+            counted = f"{self.issues:,} of {total:,} issues (this page; fetch all pages to count everything)"
+        lines.append(f"{counted} grouped by {', '.join(self.dimensions)}")
+        share = self.issues or 1
+        for d in self.dimensions:
+            counts = self.counts[d]
+            lines += ["", f"## {d}", "",
+                      f"| {d} | issues | % |" + (" latest |" if self.top_keys > 0 else ""),
+                      "|---|---|---|" + ("---|" if self.top_keys > 0 else "")]
+            top = counts.most_common(rows)
+            for value, n in top:
+                row = f"| {truncate(value, 40)} | {n:,} | {n / share:.0%} |"
+                lines.append(row + (f" {self._examples(d, value)} |" if self.top_keys > 0 else ""))
+            if len(counts) > len(top):
+                rest = sum(counts.values()) - sum(n for _, n in top)
+                lines.append(f"| ({len(counts) - len(top)} more) | {rest:,} | {rest / share:.0%} |"
+                             + (" |" if self.top_keys > 0 else ""))
+            if d == "label":
+                lines += ["", "*An issue with several labels counts once per label.*"]
+        if len(self.dimensions) > 1:
+            lines += self._pivot(rows)
+        return "\n".join(lines) + "\n"
+
+    def _pivot(self, rows: int) -> List[str]:
+        first, second = self.dimensions[:2]
+        columns = [value for value, _ in self.counts[second].most_common(PIVOT_COLUMNS)]
+        other = len(self.counts[second]) > len(columns)
+        header = [truncate(c, 20) for c in columns] + (["other"] if other else [])
+        lines = ["", f"## {first} × {second}", "",
+                 f"| {first} \\ {second} | " + " | ".join(header) + " |",
+                 "|---|" + "---|" * len(header)]
+        shown = set(columns)
+        for value, _ in self.counts[first].most_common(rows):
+            cells = [self.pairs.get((value, c), 0) for c in columns]
+            if other:
+                cells.append(sum(n for (a, b), n in self.pairs.items() if a == value and b not in shown))
+            lines.append(f"| {truncate(value, 40)} | " + " | ".join(f"{n:,}" if n else "·" for n in cells) + " |")
+        return lines
+
+
+def pack_search_groups(issues: Iterable[Dict[str, Any]], dimensions: List[str], top_keys: int = 3,
+                       rows: int = 10, meta: Optional[Dict[str, Any]] = None) -> str:
+    """Summarize `issues` as count tables per dimension in one pass (see SearchGroups)."""
+    groups = SearchGroups(dimensions, top_keys)
+    for issue in issues:
+        groups.add(issue)
+    return groups.render(rows, (meta or {}).get("total"))
+
+
 def main() -> int:
     """Main entry point."""
     import argparse
@@ -136,26 +515,72 @@ def main() -> int:
         "--max", "-m",
         type=int,
         default=50,
-        help="Maximum number of issues to include (default: 50)"
+        help="Maximum number of issues to include (default: 50; 0 = all in streaming mode)"
     )
+    parser.add_argument(
+        "--stream", "-s",
+        action="store_true",
+        help="Parse the search envelope incrementally and write rows as they are read"
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Input is NDJSON (one issue per line); implies --stream"
+    )
+    parser.add_argument(
+        "--fields",
+        default="",
+        help="Comma-separated extra fields to keep with --project/--fields-param "
+             "(e.g. duedate,customfield_10001,fields.parent.key)"
+    )
+    parser.add_argument(
+        "--project",
+        action="store_true",
+        help="Instead of packing, write the export back keeping only the fields used here plus --fields"
+    )
+    parser.add_argument(
+        "--fields-param",
+        action="store_true",
+        help="Print the fields= value for search_jira_issues that covers the same fields"
+    )
+    parser.add_argument(
+        "--group-by",
+        metavar="DIMS",
+        help="Instead of rows, count every issue per dimension in one streaming pass: "
+             f"comma-separated {','.join(GROUP_DIMENSIONS)} (the first two also as a cross table)"
+    )
+    parser.add_argument(
+        "--top-keys",
+        type=int,
+        default=3,
+        help="With --group-by: most recently updated keys listed per bucket (default: 3)"
+    )
+    parser.add_argument(
+        "--group-rows",
+        type=int,
+        default=10,
+        help="With --group-by: buckets per table, the rest summed in one row (default: 10)"
+    )
+    parser.add_argument(
+        "--diff",
+        metavar="SNAPSHOT",
+        help="Emit only issues added, changed (old → new cells) or removed since the last run "
+             "with this snapshot file, then update it; --max caps the rows (0 = all)"
+    )
+    add_profile_arguments(parser)
 
     args = parser.parse_args()
+    if args.diff and (args.group_by or args.project):
+        parser.error(f"--diff cannot be combined with {'--group-by' if args.group_by else '--project'}")
 
-    try:
-        if args.file:
-            with open(args.file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        else:
-            data = json.load(sys.stdin)
-
-        if args.detailed:
-            output = pack_search_detailed(data, args.max)
-        else:
-            output = pack_search_results(data, args.max)
-
-        sys.stdout.write(output)
+    paths = SEARCH_FIELDS + field_paths(args.fields.split(","))
+    if args.fields_param:
+        print(fields_param(paths))
         return 0
 
+    try:
+        with profile_session(args.profile, args.cprofile):
+            return _main(args, paths)
     except json.JSONDecodeError as e:
         sys.stderr.write(f"Error: Invalid JSON input - {e}\n")
         return 1
@@ -167,5 +592,85 @@ def main() -> int:
         return 1
 
 
+def _main(args, paths: List[str]) -> int:
+    """Body of main() after argument parsing; errors propagate to main's handlers."""
+    if args.project:
+        return _main_project(args, paths)
+    if args.group_by:
+        return _main_groups(args)
+    if args.diff:
+        return _main_diff(args)
+    if args.stream or args.ndjson:
+        return _main_stream(args)
+
+    with stage("load"):
+        data = load_path(args.file) if args.file else load(sys.stdin)
+
+    with stage("pack"):
+        if args.detailed:
+            output = pack_search_detailed(data, args.max)
+        else:
+            output = pack_search_results(data, args.max)
+
+    with stage("write"):
+        sys.stdout.write(output)
+    return 0
+
+
+def _main_stream(args) -> int:
+    """Streaming branch of main(); errors propagate to main's handlers."""
+    meta: Dict[str, Any] = {}
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            issues = iter_issues(f, ndjson=args.ndjson, meta=meta)
+            pack_search_stream(issues, sys.stdout.write, args.max, args.detailed, meta)
+    else:
+        issues = iter_issues(sys.stdin, ndjson=args.ndjson, meta=meta)
+        pack_search_stream(issues, sys.stdout.write, args.max, args.detailed, meta)
+    return 0
+
+
+def _main_groups(args) -> int:
+    """--group-by branch of main(); always streams, whatever the input shape."""
+    dimensions = parse_dimensions(args.group_by)
+    meta: Dict[str, Any] = {}
+    with stage("group"):
+        if args.file:
+            with open(args.file, "r", encoding="utf-8") as f:
+                output = pack_search_groups(iter_issues(f, ndjson=args.ndjson, meta=meta), dimensions,
+                                            args.top_keys, args.group_rows, meta)
+        else:
+            output = pack_search_groups(iter_issues(sys.stdin, ndjson=args.ndjson, meta=meta), dimensions,
+                                        args.top_keys, args.group_rows, meta)
+    sys.stdout.write(output)
+    return 0
+
+
+def _main_diff(args) -> int:
+    """--diff branch of main(); streams the input into the snapshot comparison."""
+    meta: Dict[str, Any] = {}
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            output = pack_search_diff(iter_issues(f, ndjson=args.ndjson, meta=meta), args.diff, args.max, meta)
+    else:
+        output = pack_search_diff(iter_issues(sys.stdin, ndjson=args.ndjson, meta=meta), args.diff, args.max, meta)
+    sys.stdout.write(output)
+    return 0
+
+
+def _main_project(args, paths: List[str]) -> int:
+    """--project branch of main(); errors propagate to main's handlers."""
+    project = compile_projection(paths)
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            write_projected(f, sys.stdout.write, project, ndjson=args.ndjson)
+    else:
+        write_projected(sys.stdin, sys.stdout.write, project, ndjson=args.ndjson)
+    return 0
+
+
 if __name__ == "__main__":
-    raise SystemExit(main())
+    from jira_pack import forward
+
+    rc = forward("search", sys.argv[1:])
+    raise SystemExit(main() if rc is None else rc)